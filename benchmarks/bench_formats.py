@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare output encodings on a synthetic 10k-row account_txlist payload.
+
+Usage:
+    python -m benchmarks.bench_formats [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools import utils
+
+
+def synthetic_txlist(rows: int):
+    """Build ``rows`` records shaped like Etherscan's txlist result."""
+    records = []
+    for i in range(rows):
+        records.append({
+            "blockNumber": str(17000000 + i // 3),
+            "timeStamp": str(1680000000 + i * 4),
+            "hash": f"0x{i:064x}",
+            "nonce": str(i),
+            "blockHash": f"0x{i // 3:064x}",
+            "transactionIndex": str(i % 150),
+            "from": f"0x{i % 97:040x}",
+            "to": f"0x{i % 89:040x}",
+            "value": str(i * 10 ** 15),
+            "gas": "21000",
+            "gasPrice": "30000000000",
+            "isError": "0",
+            "txreceipt_status": "1",
+            "input": "0xa9059cbb" + "00" * 64 if i % 2 else "0x",
+            "contractAddress": "",
+            "cumulativeGasUsed": str(21000 * (i % 150 + 1)),
+            "gasUsed": "21000",
+            "confirmations": str(1000000 - i),
+            "methodId": "0xa9059cbb" if i % 2 else "0x",
+            "functionName": "transfer(address _to, uint256 _value)" if i % 2 else "",
+        })
+    return records
+
+
+def measure(records, output_format: str, repeat: int):
+    """Return (bytes, best CPU seconds) for encoding ``records``."""
+    best = float("inf")
+    encoded = ""
+    for _ in range(repeat):
+        started = time.process_time()
+        encoded = utils.format_response(records, output_format)
+        best = min(best, time.process_time() - started)
+    return len(encoded.encode()), best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = synthetic_txlist(args.rows)
+    # The stdlib pretty printer is the baseline: it is what api_call used to emit
+    backends = [("json", None)]
+    if utils.orjson is not None:
+        backends.append(("orjson", utils.orjson))
+
+    baseline = None
+    print(f"{'backend':<8} {'format':<8} {'bytes':>12} {'ratio':>7} {'cpu ms':>9} {'speedup':>8}")
+    for backend_name, backend in backends:
+        saved, utils.orjson = utils.orjson, backend
+        try:
+            for output_format in ("pretty", "json", "table"):
+                size, cpu = measure(records, output_format, args.repeat)
+                if baseline is None:
+                    baseline = (size, cpu)
+                print(
+                    f"{backend_name:<8} {output_format:<8} {size:>12,} {size / baseline[0]:>7.2f} "
+                    f"{cpu * 1000:>9.1f} {baseline[1] / cpu:>7.1f}x"
+                )
+        finally:
+            utils.orjson = saved
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Drive the MCP tools against a local Etherscan stand-in at several concurrency levels.
+
+``inprocess`` calls the tools on a server object in this process, with the
+mock mounted as the HTTP transport. ``stdio`` serves the mock over HTTP and
+talks to the server in a subprocess through the MCP stdio transport, as a
+client would. Each level runs ``--requests`` calls from ``concurrency``
+closed-loop workers and reports throughput, latency percentiles, upstream
+requests and peak memory. Results can be saved and compared with a baseline.
+
+Usage:
+    python -m benchmarks.bench_server [--mode inprocess|stdio|both] [--scenario mixed]
+        [--concurrency 1,8,32] [--requests 200] [--save out.json] [--compare base.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import mock_etherscan
+from benchmarks.stdio_server import peak_rss_mb
+
+ToolCall = Tuple[str, Dict[str, Any]]
+Caller = Callable[[str, Dict[str, Any]], Awaitable[bool]]
+
+# Arguments are unique per call (through ``n``) so the response cache only
+# helps where real traffic would also repeat itself
+SCENARIOS: Dict[str, Callable[[int], ToolCall]] = {
+    "balance": lambda n: ("account_balance", {"address": f"0x{n:040x}"}),
+    "txlist": lambda n: ("account_txlist", {"address": f"0x{n:040x}", "offset": "10000"}),
+    "txlist_fields": lambda n: (
+        "account_txlist", {"address": f"0x{n:040x}", "offset": "10000", "fields": "hash,from,to,value"}
+    ),
+    "txlist_table": lambda n: ("account_txlist", {"address": f"0x{n:040x}", "offset": "10000", "output_format": "table"}),
+    "sourcecode": lambda n: ("contract_getsourcecode", {"address": f"0x{n:040x}"}),
+    "logs": lambda n: ("logs_getLogsByAddress", {"address": f"0x{n:040x}", "fromBlock": "0", "toBlock": str(n)}),
+    "eth_call": lambda n: ("proxy_eth_call", {"to": f"0x{n:040x}", "data": "0x18160ddd", "tag": hex(n)}),
+}
+MIXED = ("balance", "balance", "eth_call", "eth_call", "logs", "sourcecode")
+
+
+def mixed(n: int) -> ToolCall:
+    """Mostly cheap lookups with an occasional large payload."""
+    return SCENARIOS[MIXED[n % len(MIXED)]](n)
+
+
+SCENARIOS["mixed"] = mixed
+
+_sequence = itertools.count(1)
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(percent / 100.0 * len(ordered)) - 1))]
+
+
+async def run_level(call: Caller, scenario: str, concurrency: int, requests: int) -> Dict[str, Any]:
+    """Issue ``requests`` calls from ``concurrency`` workers and summarize them."""
+    make_call = SCENARIOS[scenario]
+    remaining = iter(range(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            tool, arguments = make_call(next(_sequence))
+            started = time.perf_counter()
+            if not await call(tool, arguments):
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def configure_server_env(args: argparse.Namespace) -> Dict[str, str]:
+    """Return the environment both modes run the server with."""
+    env = {
+        "ETHERSCAN_API_KEY": os.environ.get("ETHERSCAN_API_KEY", "bench"),
+        "ETHERSCAN_RATE_LIMIT": str(args.server_rate_limit),
+    }
+    if args.no_cache:
+        env["ETHERSCAN_CACHE_MAX_ENTRIES"] = "0"
+    return env
+
+
+async def bench_inprocess(args: argparse.Namespace, mock: mock_etherscan.MockEtherscan) -> List[Dict[str, Any]]:
+    import httpx
+
+    os.environ.update(configure_server_env(args))
+    from src.server import create_server
+    from src.tools import utils
+
+    utils._http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=mock),
+        timeout=utils.HTTP_TIMEOUT,
+        limits=utils.HTTP_LIMITS,
+    )
+    server = create_server()
+
+    async def call(tool: str, arguments: Dict[str, Any]) -> bool:
+        try:
+            await server.call_tool(tool, arguments)
+        except Exception:
+            return False
+        return True
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            upstream = mock.requests
+            if args.tracemalloc:
+                tracemalloc.start()
+            result = await run_level(call, args.scenario, concurrency, args.requests)
+            if args.tracemalloc:
+                result["py_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                tracemalloc.stop()
+            result.update(mode="inprocess", upstream=mock.requests - upstream, peak_rss_mb=round(peak_rss_mb(), 1))
+            results.append(result)
+    finally:
+        await utils.close_http_client()
+    return results
+
+
+async def bench_stdio(args: argparse.Namespace, mock: mock_etherscan.MockEtherscan) -> List[Dict[str, Any]]:
+    import uvicorn
+    from mcp import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    http = uvicorn.Server(uvicorn.Config(mock, host="127.0.0.1", port=args.port, log_level="warning"))
+    serving = asyncio.create_task(http.serve())
+    while not http.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.01)
+
+    env = dict(os.environ)
+    env.update(configure_server_env(args))
+    env["ETHERSCAN_API_URL"] = f"http://127.0.0.1:{args.port}/v2/api"
+    parameters = StdioServerParameters(
+        command=sys.executable, args=["-m", "benchmarks.stdio_server"], env=env, cwd=ROOT
+    )
+    results = []
+    try:
+        async with stdio_client(parameters, errlog=subprocess.DEVNULL) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                async def call(tool: str, arguments: Dict[str, Any]) -> bool:
+                    try:
+                        result = await session.call_tool(tool, arguments)
+                    except Exception:
+                        return False
+                    return not result.isError
+
+                for concurrency in args.concurrency:
+                    upstream = mock.requests
+                    result = await run_level(call, args.scenario, concurrency, args.requests)
+                    rusage = await session.read_resource("bench://rusage")
+                    result.update(
+                        mode="stdio",
+                        upstream=mock.requests - upstream,
+                        peak_rss_mb=json.loads(rusage.contents[0].text)["peak_rss_mb"],
+                    )
+                    results.append(result)
+    finally:
+        http.should_exit = True
+        await serving
+    return results
+
+
+def result_key(result: Dict[str, Any]) -> Tuple[str, str, int]:
+    return result["mode"], result["scenario"], result["concurrency"]
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Optional[List[Dict[str, Any]]] = None) -> None:
+    previous = {result_key(result): result for result in baseline or []}
+    header = (
+        f"{'mode':<10} {'scenario':<11} {'conc':>5} {'req':>6} {'err':>5} {'upstream':>9} "
+        f"{'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'rss MiB':>8}"
+    )
+    if previous:
+        header += f" {'req/s Δ':>9} {'p99 Δ':>8} {'rss Δ':>8}"
+    print(header)
+    for result in results:
+        line = (
+            f"{result['mode']:<10} {result['scenario']:<11} {result['concurrency']:>5} {result['requests']:>6} "
+            f"{result['errors']:>5} {result['upstream']:>9} {result['rps']:>9.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p99_ms']:>9.1f} {result['peak_rss_mb']:>8.1f}"
+        )
+        before = previous.get(result_key(result))
+        if before is not None:
+            line += (
+                f" {_change(result['rps'], before['rps']):>9} {_change(result['p99_ms'], before['p99_ms']):>8}"
+                f" {_change(result['peak_rss_mb'], before['peak_rss_mb']):>8}"
+            )
+        print(line)
+
+
+def _change(now: float, before: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(now - before) / before * 100:+.0f}%"
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("inprocess", "stdio", "both"), default="inprocess")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=lambda value: [int(level) for level in value.split(",")], default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="tool calls per concurrency level")
+    parser.add_argument("--server-rate-limit", type=int, default=10000, help="ETHERSCAN_RATE_LIMIT of the server")
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report peak Python allocations (slower)")
+    parser.add_argument("--port", type=int, default=8545, help="port the mock listens on in stdio mode")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="show changes against results saved earlier")
+    mock_etherscan.add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results: List[Dict[str, Any]] = []
+    if args.mode in ("inprocess", "both"):
+        results += asyncio.run(bench_inprocess(args, mock_etherscan.from_arguments(args)))
+    if args.mode in ("stdio", "both"):
+        results += asyncio.run(bench_stdio(args, mock_etherscan.from_arguments(args)))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)["results"]
+    print_results(results, baseline)
+
+    if args.save:
+        report = {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "arguments": {name: value for name, value in vars(args).items() if name not in ("save", "compare")},
+            "results": results,
+        }
+        with open(args.save, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
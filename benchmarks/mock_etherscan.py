@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Etherscan v2 API with configurable latency and faults.
+
+The app is a plain ASGI callable: the benchmarks mount it in-process through
+``httpx.ASGITransport``, or serve it over HTTP with uvicorn so that a server
+started as a subprocess can reach it.
+
+Usage:
+    python -m benchmarks.mock_etherscan [--port 8545] [--latency-ms 50] [--rate-limit 5]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_formats import synthetic_txlist
+
+
+# Etherscan refuses pages beyond this many records (page * offset)
+RESULT_WINDOW = 10000
+HEAD_BLOCK = 21000000
+
+RATE_LIMIT_MESSAGE = "Max calls per sec rate limit reached ({limit}/sec)"
+HTML_ERROR_PAGE = b"<html><head><title>502 Bad Gateway</title></head><body>cloudflare</body></html>"
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def _ok(result: Any) -> Dict[str, Any]:
+    return {"status": "1", "message": "OK", "result": result}
+
+
+def _notok(result: Any, message: str = "NOTOK") -> Dict[str, Any]:
+    return {"status": "0", "message": message, "result": result}
+
+
+def _address_number(address: str) -> int:
+    try:
+        return int(address, 16)
+    except ValueError:
+        return sum(address.encode())
+
+
+class MockEtherscan:
+    """
+    ASGI app answering ``/v2/api`` requests with synthetic data.
+
+    Every request sleeps ``latency_ms`` plus up to ``jitter_ms``; a fraction
+    ``tail_ratio`` of requests sleeps ``tail_ms`` instead, to model a slow
+    tail. ``rate_limit`` caps calls per second and API key the way Etherscan
+    does (a status "0" answer, not an HTTP error). ``error_rate`` is the
+    share of requests that fail with a 503, a 429 or an HTML gateway page.
+    With ``compress``, bodies are gzip-encoded for clients that accept it.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        tail_ms: float = 0.0,
+        tail_ratio: float = 0.0,
+        rate_limit: int = 0,
+        error_rate: float = 0.0,
+        txlist_rows: int = RESULT_WINDOW,
+        source_kb: int = 512,
+        compress: bool = False,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tail_ms = tail_ms
+        self.tail_ratio = tail_ratio
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.source_kb = source_kb
+        self.compress = compress
+        self.random = random.Random(seed)
+        self.history = synthetic_txlist(txlist_rows)
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self.injected_errors = 0
+        self.bytes_sent = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        params = dict(parse_qsl(scope.get("query_string", b"").decode()))
+        status, headers, body = await self.respond(scope.get("path", ""), params)
+        accepted = dict(scope.get("headers", [])).get(b"accept-encoding", b"")
+        if self.compress and b"gzip" in accepted:
+            body = gzip.compress(body, compresslevel=1)
+            headers = dict(headers, **{"content-encoding": "gzip"})
+        self.bytes_sent += len(body)
+        header_list = [(name.encode(), value.encode()) for name, value in headers.items()]
+        header_list.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": header_list})
+        await send({"type": "http.response.body", "body": body})
+
+    async def respond(self, path: str, params: Dict[str, str]) -> Response:
+        """Return ``(status, headers, body)`` for one request."""
+        self.requests += 1
+        await asyncio.sleep(self._latency())
+        if not path.rstrip("/").endswith("/v2/api"):
+            return 404, {"content-type": "text/plain"}, b"Not Found"
+
+        fault = self._fault()
+        if fault is not None:
+            return fault
+        if self._rate_limited(params.get("apikey", "")):
+            self.rate_limited += 1
+            return self._json(_notok(RATE_LIMIT_MESSAGE.format(limit=self.rate_limit)))
+        return self._json(self.handle(params))
+
+    def _latency(self) -> float:
+        if self.tail_ratio and self.random.random() < self.tail_ratio:
+            return self.tail_ms / 1000.0
+        return (self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000.0
+
+    def _fault(self) -> Optional[Response]:
+        if not self.error_rate or self.random.random() >= self.error_rate:
+            return None
+        self.injected_errors += 1
+        kind = self.random.choice(("503", "429", "html"))
+        if kind == "503":
+            return 503, {"content-type": "text/plain"}, b"Service Unavailable"
+        if kind == "429":
+            return 429, {"content-type": "text/plain", "retry-after": "0"}, b"Too Many Requests"
+        return 200, {"content-type": "text/html"}, HTML_ERROR_PAGE
+
+    def _rate_limited(self, apikey: str) -> bool:
+        if not self.rate_limit:
+            return False
+        second = int(time.monotonic())
+        window, count = self._windows.get(apikey, (second, 0))
+        if window != second:
+            window, count = second, 0
+        self._windows[apikey] = (window, count + 1)
+        return count >= self.rate_limit
+
+    @staticmethod
+    def _json(data: Dict[str, Any]) -> Response:
+        return 200, {"content-type": "application/json"}, json.dumps(data, separators=(",", ":")).encode()
+
+    def handle(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Answer a well-formed request according to its module and action."""
+        action = (params.get("module"), params.get("action"))
+        handler = getattr(self, f"_{action[0]}_{action[1]}", None)
+        if handler is None:
+            return _ok("0")
+        return handler(params)
+
+    def _account_balance(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return _ok(str(_address_number(params.get("address", "")) * 10 ** 9))
+
+    def _account_balancemulti(self, params: Dict[str, str]) -> Dict[str, Any]:
+        addresses = [address for address in params.get("address", "").split(",") if address]
+        return _ok([
+            {"account": address, "balance": str(_address_number(address) * 10 ** 9)}
+            for address in addresses
+        ])
+
+    def _account_txlist(self, params: Dict[str, str]) -> Dict[str, Any]:
+        startblock = int(params.get("startblock", 0) or 0)
+        endblock = int(params.get("endblock", 99999999) or 99999999)
+        page = int(params.get("page", 1) or 1)
+        offset = int(params.get("offset", 0) or 0)
+        if offset and page * offset > RESULT_WINDOW:
+            return _notok("Result window is too large, PageNo x Offset size must be less than or equal to 10000")
+        rows = [
+            row for row in self.history
+            if startblock <= int(row["blockNumber"]) <= endblock
+        ]
+        if params.get("sort") == "desc":
+            rows.reverse()
+        if offset:
+            rows = rows[(page - 1) * offset:page * offset]
+        else:
+            rows = rows[:RESULT_WINDOW]
+        if not rows:
+            return _notok([], "No transactions found")
+        return _ok(rows)
+
+    _account_txlistinternal = _account_txlist
+    _account_tokentx = _account_txlist
+
+    def _account_tokenbalance(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return _ok(str(_address_number(params.get("address", "")) % 10 ** 24))
+
+    def _contract_getabi(self, params: Dict[str, str]) -> Dict[str, Any]:
+        abi = [{
+            "type": "function", "name": "transfer", "stateMutability": "nonpayable",
+            "inputs": [{"name": "_to", "type": "address"}, {"name": "_value", "type": "uint256"}],
+            "outputs": [{"name": "", "type": "bool"}],
+        }]
+        return _ok(json.dumps(abi))
+
+    def _contract_getsourcecode(self, params: Dict[str, str]) -> Dict[str, Any]:
+        line = "    function transfer(address to, uint256 value) external returns (bool) { return true; }\n"
+        source = line * (self.source_kb * 1024 // len(line) + 1)
+        return _ok([{
+            "SourceCode": source,
+            "ABI": self._contract_getabi(params)["result"],
+            "ContractName": "Token",
+            "CompilerVersion": "v0.8.24+commit.e11b9ed9",
+            "OptimizationUsed": "1",
+            "Runs": "200",
+            "ConstructorArguments": "",
+            "EVMVersion": "Default",
+            "Library": "",
+            "LicenseType": "MIT",
+            "Proxy": "0",
+            "Implementation": "",
+            "SwarmSource": "",
+        }])
+
+    def _stats_ethprice(self, params: Dict[str, str]) -> Dict[str, Any]:
+        now = str(int(time.time()))
+        return _ok({"ethbtc": "0.05", "ethbtc_timestamp": now, "ethusd": "3000.00", "ethusd_timestamp": now})
+
+    def _gastracker_gasoracle(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return _ok({
+            "LastBlock": str(HEAD_BLOCK), "SafeGasPrice": "10", "ProposeGasPrice": "12",
+            "FastGasPrice": "15", "suggestBaseFee": "9.5", "gasUsedRatio": "0.5,0.4,0.6",
+        })
+
+    def _logs_getLogs(self, params: Dict[str, str]) -> Dict[str, Any]:
+        address = params.get("address", f"0x{0:040x}")
+        logs = [
+            {
+                "address": address,
+                "topics": [
+                    "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef",
+                    f"0x{i % 97:064x}",
+                    f"0x{i % 89:064x}",
+                ],
+                "data": f"0x{i * 10 ** 15:064x}",
+                "blockNumber": hex(17000000 + i // 3),
+                "timeStamp": hex(1680000000 + i * 4),
+                "gasPrice": hex(30000000000),
+                "gasUsed": hex(50000),
+                "logIndex": hex(i % 50),
+                "transactionHash": f"0x{i:064x}",
+                "transactionIndex": hex(i % 150),
+            }
+            for i in range(1000)
+        ]
+        return _ok(logs)
+
+    @staticmethod
+    def _rpc(result: Any) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+    def _proxy_eth_blockNumber(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return self._rpc(hex(HEAD_BLOCK))
+
+    def _proxy_eth_call(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return self._rpc(f"0x{_address_number(params.get('to', '')) % 10 ** 24:064x}")
+
+    def _proxy_eth_getBlockByNumber(self, params: Dict[str, str]) -> Dict[str, Any]:
+        tag = params.get("tag", "latest")
+        number = HEAD_BLOCK if not tag.startswith("0x") else int(tag, 16)
+        return self._rpc({
+            "number": hex(number),
+            "hash": f"0x{number:064x}",
+            "parentHash": f"0x{number - 1:064x}",
+            "timestamp": hex(1438269973 + number * 12),
+            "gasUsed": hex(15000000),
+            "transactions": [f"0x{number * 1000 + i:064x}" for i in range(150)],
+        })
+
+    def stats(self) -> Dict[str, int]:
+        """Return request, fault and byte counters."""
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "injected_errors": self.injected_errors,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options shaping the mock's behaviour to ``parser``."""
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--tail-ms", type=float, default=1000.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=int, default=0, help="calls per second and key, 0 for none")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--txlist-rows", type=int, default=RESULT_WINDOW)
+    parser.add_argument("--source-kb", type=int, default=512)
+    parser.add_argument("--gzip", action="store_true", help="gzip response bodies")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def from_arguments(args: argparse.Namespace) -> MockEtherscan:
+    """Build a mock from options added by ``add_arguments``."""
+    return MockEtherscan(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tail_ms=args.tail_ms,
+        tail_ratio=args.tail_ratio,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        txlist_rows=args.txlist_rows,
+        source_kb=args.source_kb,
+        compress=args.gzip,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(f"Serving on http://{args.host}:{args.port}/v2/api", file=sys.stderr)
+    uvicorn.run(from_arguments(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
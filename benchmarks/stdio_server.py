@@ -0,0 +1,36 @@
+"""The MCP server as launched by ``bench_server --mode stdio``.
+
+It is the regular server (pointed at the mock through ``ETHERSCAN_API_URL``)
+plus a ``bench://rusage`` resource reporting the peak memory of the process.
+"""
+
+import json
+import os
+import resource
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server import create_server
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main() -> None:
+    server = create_server()
+
+    @server.resource("bench://rusage", mime_type="application/json")
+    def rusage() -> str:
+        """Peak memory of the server process."""
+        return json.dumps({"peak_rss_mb": round(peak_rss_mb(), 1)})
+
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 
 import asyncio
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from mcp.server.fastmcp import FastMCP
 
 # Import all tool modules
@@ -14,13 +16,37 @@ from .tools.gas import register_gas_tools
 from .tools.stats import register_stats_tools
 from .tools.logs import register_logs_tools
 from .tools.rpc import register_rpc_tools
+from .tools.indexer import register_indexer_tools
+from .tools.cache import get_response_cache
+from .tools.keypool import load_api_keys
+from .tools.metrics import InstrumentedFastMCP, get_metrics, register_metrics_resources
+from .tools.utils import close_http_client, get_http_client
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Own the shared HTTP client and background jobs for the lifetime of the server."""
+    get_http_client()
+    background = []
+    persistent = get_response_cache().persistent
+    if persistent is not None:
+        background.append(asyncio.create_task(persistent.run_maintenance()))
+    metrics_file = os.getenv("ETHERSCAN_METRICS_FILE")
+    if metrics_file:
+        background.append(asyncio.create_task(get_metrics().dump_periodically(metrics_file)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await close_http_client()
 
 
 def create_server() -> FastMCP:
     """Create and configure the FastMCP server with all tools."""
     
     # Create FastMCP server instance
-    server = FastMCP("Etherscan MCP Python Server")
+    server = InstrumentedFastMCP("Etherscan MCP Python Server", lifespan=server_lifespan)
     
     # Register all tool categories
     register_account_tools(server)
@@ -32,6 +58,8 @@ def create_server() -> FastMCP:
     register_stats_tools(server)
     register_logs_tools(server)
     register_rpc_tools(server)
+    register_indexer_tools(server)
+    register_metrics_resources(server)
     
     return server
 
@@ -39,7 +67,7 @@ def create_server() -> FastMCP:
 def main():
     """Main function to run the MCP server."""
     # Check for API key
-    if not os.getenv("ETHERSCAN_API_KEY"):
+    if not load_api_keys():
         import sys
         print("Warning: ETHERSCAN_API_KEY environment variable not set", file=sys.stderr, flush=True)
     
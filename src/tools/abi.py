@@ -0,0 +1,398 @@
+"""ABI-driven decoding of event logs and transaction calldata."""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import UNVERIFIED_SOURCE_TTL
+from .keccak import keccak256
+from .utils import EtherscanAPIError, make_api_request
+
+
+# Contract ABIs fetched at most per decode call; the rest use the shared tables
+DEFAULT_MAX_ABI_FETCHES = 25
+# Batches larger than this are decoded on a worker thread
+DECODE_OFFLOAD_THRESHOLD = 2000
+
+_ARRAY_SUFFIX = re.compile(r"^(.*)\[(\d*)\]$")
+
+
+def canonical_type(param: Dict[str, Any]) -> str:
+    """Return the canonical signature type of an ABI parameter, expanding tuples."""
+    kind = param["type"]
+    if kind.startswith("tuple"):
+        inner = ",".join(canonical_type(component) for component in param.get("components", []))
+        return f"({inner}){kind[len('tuple'):]}"
+    return kind
+
+
+def signature(entry: Dict[str, Any]) -> str:
+    """Return the canonical ``name(type,...)`` signature of an ABI function or event."""
+    types = ",".join(canonical_type(param) for param in entry.get("inputs", []))
+    return f"{entry.get('name', '')}({types})"
+
+
+def _element(param: Dict[str, Any], kind: str) -> Dict[str, Any]:
+    element = dict(param)
+    element["type"] = kind
+    return element
+
+
+def _is_dynamic(param: Dict[str, Any]) -> bool:
+    kind = param["type"]
+    match = _ARRAY_SUFFIX.match(kind)
+    if match:
+        inner, size = match.groups()
+        return size == "" or _is_dynamic(_element(param, inner))
+    if kind in ("bytes", "string"):
+        return True
+    if kind == "tuple":
+        return any(_is_dynamic(component) for component in param.get("components", []))
+    return False
+
+
+def _head_size(param: Dict[str, Any]) -> int:
+    """Bytes a parameter occupies in the head of its enclosing tuple."""
+    if _is_dynamic(param):
+        return 32
+    kind = param["type"]
+    match = _ARRAY_SUFFIX.match(kind)
+    if match:
+        inner, size = match.groups()
+        return int(size) * _head_size(_element(param, inner))
+    if kind == "tuple":
+        return sum(_head_size(component) for component in param.get("components", []))
+    return 32
+
+
+def _word(data: bytes, offset: int) -> int:
+    if offset + 32 > len(data):
+        raise ValueError("ABI data too short")
+    return int.from_bytes(data[offset:offset + 32], "big")
+
+
+def _decode_static_word(kind: str, data: bytes, offset: int) -> Any:
+    value = _word(data, offset)
+    if kind.startswith("uint"):
+        return str(value)
+    if kind.startswith("int"):
+        bits = int(kind[3:] or 256)
+        if value >= 1 << 255:
+            value -= 1 << 256
+        if not -(1 << (bits - 1)) <= value < 1 << (bits - 1):
+            raise ValueError(f"{kind} out of range")
+        return str(value)
+    if kind == "address":
+        return "0x" + data[offset + 12:offset + 32].hex()
+    if kind == "bool":
+        return bool(value)
+    if kind.startswith("bytes"):
+        return "0x" + data[offset:offset + int(kind[5:])].hex()
+    if kind == "function":
+        return "0x" + data[offset:offset + 24].hex()
+    raise ValueError(f"Unsupported ABI type {kind}")
+
+
+def _decode_tuple(components: List[Dict[str, Any]], data: bytes, base: int) -> List[Any]:
+    values = []
+    head = base
+    for component in components:
+        if _is_dynamic(component):
+            values.append(_decode_value(component, data, base + _word(data, head), base))
+        else:
+            values.append(_decode_value(component, data, head, base))
+        head += _head_size(component)
+    return values
+
+
+def _named(components: List[Dict[str, Any]], values: List[Any]) -> Any:
+    if components and all(component.get("name") for component in components):
+        return {component["name"]: value for component, value in zip(components, values)}
+    return values
+
+
+def _decode_value(param: Dict[str, Any], data: bytes, offset: int, base: int) -> Any:
+    kind = param["type"]
+    match = _ARRAY_SUFFIX.match(kind)
+    if match:
+        inner, size = match.groups()
+        element = _element(param, inner)
+        if size == "":
+            count = _word(data, offset)
+            if count > len(data):
+                raise ValueError("ABI array length out of range")
+            offset += 32
+        else:
+            count = int(size)
+        return _decode_tuple([element] * count, data, offset)
+    if kind == "tuple":
+        components = param.get("components", [])
+        return _named(components, _decode_tuple(components, data, offset))
+    if kind in ("bytes", "string"):
+        length = _word(data, offset)
+        raw = data[offset + 32:offset + 32 + length]
+        if len(raw) != length:
+            raise ValueError("ABI data too short")
+        return raw.decode("utf-8", errors="replace") if kind == "string" else "0x" + raw.hex()
+    return _decode_static_word(kind, data, offset)
+
+
+def decode_parameters(params: List[Dict[str, Any]], data: bytes) -> List[Any]:
+    """Decode ABI-encoded ``data`` against a list of ABI parameter descriptions."""
+    return _decode_tuple(params, data, 0)
+
+
+def _hex_bytes(value: str) -> bytes:
+    value = value[2:] if value.startswith("0x") else value
+    return bytes.fromhex(value)
+
+
+def _arg_names(inputs: List[Dict[str, Any]]) -> List[str]:
+    return [param.get("name") or f"arg{i}" for i, param in enumerate(inputs)]
+
+
+class FunctionDecoder:
+    """Decodes calldata of one ABI function."""
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.name = entry.get("name", "")
+        self.signature = signature(entry)
+        self.selector = "0x" + keccak256(self.signature.encode()).hex()[:8]
+        self.inputs = entry.get("inputs", [])
+        self.names = _arg_names(self.inputs)
+
+    def decode(self, calldata: bytes) -> Dict[str, Any]:
+        values = _decode_tuple(self.inputs, calldata[4:], 0)
+        return {"function": self.signature, "args": dict(zip(self.names, values))}
+
+
+class EventDecoder:
+    """Decodes topics and data of one ABI event."""
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.name = entry.get("name", "")
+        self.signature = signature(entry)
+        self.topic0 = "0x" + keccak256(self.signature.encode()).hex()
+        self.inputs = entry.get("inputs", [])
+        self.names = _arg_names(self.inputs)
+        self.indexed = [param for param in self.inputs if param.get("indexed")]
+        self.unindexed = [param for param in self.inputs if not param.get("indexed")]
+
+    @property
+    def topic_count(self) -> int:
+        return 1 + len(self.indexed)
+
+    def decode(self, topics: List[str], data: bytes) -> Dict[str, Any]:
+        indexed_values = []
+        for param, topic in zip(self.indexed, topics[1:]):
+            if _is_dynamic(param) or param["type"].startswith("tuple") or "[" in param["type"]:
+                # Reference types are indexed by their hash, which is all the topic holds
+                indexed_values.append(topic)
+            else:
+                indexed_values.append(_decode_static_word(param["type"], _hex_bytes(topic), 0))
+        unindexed_values = iter(_decode_tuple(self.unindexed, data, 0))
+        indexed_iter = iter(indexed_values)
+        args = {}
+        for name, param in zip(self.names, self.inputs):
+            args[name] = next(indexed_iter) if param.get("indexed") else next(unindexed_values)
+        return {"event": self.signature, "args": args}
+
+
+class ContractDecoder:
+    """Selector and topic0 lookup tables built once from a contract ABI."""
+
+    def __init__(self, abi: List[Dict[str, Any]]):
+        self.functions: Dict[str, FunctionDecoder] = {}
+        self.events: Dict[Tuple[str, int], EventDecoder] = {}
+        for entry in abi:
+            try:
+                if entry.get("type") == "function":
+                    function = FunctionDecoder(entry)
+                    self.functions[function.selector] = function
+                elif entry.get("type") == "event" and not entry.get("anonymous"):
+                    event = EventDecoder(entry)
+                    self.events[(event.topic0, event.topic_count)] = event
+            except (KeyError, ValueError):
+                continue
+
+
+def _decode_input(functions: List[Dict[str, FunctionDecoder]], calldata: str) -> Optional[Dict[str, Any]]:
+    selector = calldata[:10].lower()
+    for table in functions:
+        function = table.get(selector)
+        if function is None:
+            continue
+        try:
+            return function.decode(_hex_bytes(calldata))
+        except (ValueError, OverflowError):
+            continue
+    return None
+
+
+def _decode_log(events: List[Dict[Tuple[str, int], EventDecoder]], log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    topics = [topic for topic in log.get("topics") or [] if topic]
+    if not topics:
+        return None
+    key = (topics[0].lower(), len(topics))
+    for table in events:
+        event = table.get(key)
+        if event is None:
+            continue
+        try:
+            return event.decode(topics, _hex_bytes(log.get("data") or "0x"))
+        except (ValueError, OverflowError):
+            continue
+    return None
+
+
+class AbiRegistry:
+    """
+    Contract decoders keyed by chain and address, built from ``getabi`` results.
+
+    ABIs come through the regular request path, so they share the response
+    cache (and its persistent store). Every decoder also feeds chain-wide
+    selector and topic0 tables, which decode calls and events on contracts
+    whose own ABI is unavailable (unverified contracts, proxies, tokens
+    emitting standard events).
+    """
+
+    def __init__(self, max_fetches: int = DEFAULT_MAX_ABI_FETCHES):
+        self.max_fetches = max_fetches
+        self._decoders: Dict[Tuple[str, str], ContractDecoder] = {}
+        self._missing: Dict[Tuple[str, str], float] = {}
+        self._functions: Dict[str, Dict[str, FunctionDecoder]] = {}
+        self._events: Dict[str, Dict[Tuple[str, int], EventDecoder]] = {}
+
+    @classmethod
+    def from_env(cls) -> "AbiRegistry":
+        """Build a registry from ``ETHERSCAN_DECODE_MAX_ABIS``."""
+        return cls(int(os.getenv("ETHERSCAN_DECODE_MAX_ABIS", DEFAULT_MAX_ABI_FETCHES)))
+
+    def add(self, address: str, abi: List[Dict[str, Any]], chainid: str = "1") -> ContractDecoder:
+        """Build and register the decoder of a contract from its ABI."""
+        decoder = ContractDecoder(abi)
+        self._decoders[(chainid, address.lower())] = decoder
+        self._functions.setdefault(chainid, {}).update(decoder.functions)
+        self._events.setdefault(chainid, {}).update(decoder.events)
+        return decoder
+
+    def known(self, address: str, chainid: str) -> bool:
+        key = (chainid, address.lower())
+        if key in self._decoders:
+            return True
+        missing_since = self._missing.get(key)
+        return missing_since is not None and time.monotonic() - missing_since < UNVERIFIED_SOURCE_TTL
+
+    async def load(self, address: str, chainid: str = "1") -> Optional[ContractDecoder]:
+        """Return the decoder of ``address``, fetching its ABI if needed."""
+        key = (chainid, address.lower())
+        if self.known(address, chainid):
+            return self._decoders.get(key)
+        try:
+            data = await make_api_request({
+                "module": "contract",
+                "action": "getabi",
+                "address": address,
+                "chainid": chainid,
+            })
+            abi = json.loads(data.get("result") or "[]")
+        except (EtherscanAPIError, ValueError):
+            # Unverified contracts are retried once the negative entry expires
+            self._missing[key] = time.monotonic()
+            return None
+        if not isinstance(abi, list):
+            self._missing[key] = time.monotonic()
+            return None
+        return self.add(address, abi, chainid)
+
+    async def _load_many(self, addresses: List[str], chainid: str) -> None:
+        # Most frequent contracts first, so the fetch budget covers most rows
+        wanted = [
+            address
+            for address, _ in Counter(addresses).most_common()
+            if not self.known(address, chainid)
+        ][:self.max_fetches]
+        await asyncio.gather(*(self.load(address, chainid) for address in wanted))
+
+    def _tables(self, address: str, chainid: str, attribute: str, shared: Dict[str, Any]) -> List[Any]:
+        decoder = self._decoders.get((chainid, address.lower()))
+        tables = [getattr(decoder, attribute)] if decoder is not None else []
+        tables.append(shared.get(chainid, {}))
+        return tables
+
+    async def _run_batch(self, func: Callable[[], List[Dict[str, Any]]], size: int) -> List[Dict[str, Any]]:
+        if size < DECODE_OFFLOAD_THRESHOLD:
+            return func()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func)
+
+    async def decode_logs(self, logs: List[Any], chainid: str = "1") -> List[Any]:
+        """
+        Return copies of ``logs`` with a ``decoded`` field where an event matches.
+
+        The ABIs of all emitting contracts are loaded concurrently up front,
+        then every log is decoded with a table lookup on (topic0, topic count).
+        """
+        chainid = str(chainid)
+        addresses = [log["address"] for log in logs if isinstance(log, dict) and log.get("address")]
+        await self._load_many(addresses, chainid)
+
+        def decode_all() -> List[Any]:
+            decoded = []
+            for log in logs:
+                if not isinstance(log, dict):
+                    decoded.append(log)
+                    continue
+                tables = self._tables(log.get("address", ""), chainid, "events", self._events)
+                decoded.append(dict(log, decoded=_decode_log(tables, log)))
+            return decoded
+
+        return await self._run_batch(decode_all, len(logs))
+
+    async def decode_transactions(self, transactions: List[Any], chainid: str = "1") -> List[Any]:
+        """Return copies of ``transactions`` with a ``decoded`` field for their ``input``."""
+        chainid = str(chainid)
+
+        def calldata(row: Any) -> str:
+            return str(row.get("input") or "") if isinstance(row, dict) else ""
+
+        addresses = [row["to"] for row in transactions if len(calldata(row)) >= 10 and row.get("to")]
+        await self._load_many(addresses, chainid)
+
+        def decode_all() -> List[Any]:
+            decoded = []
+            for row in transactions:
+                data = calldata(row)
+                if len(data) < 10 or not row.get("to"):
+                    decoded.append(row)
+                    continue
+                tables = self._tables(row["to"], chainid, "functions", self._functions)
+                decoded.append(dict(row, decoded=_decode_input(tables, data)))
+            return decoded
+
+        return await self._run_batch(decode_all, len(transactions))
+
+
+_abi_registry: Optional[AbiRegistry] = None
+
+
+def get_abi_registry() -> AbiRegistry:
+    """Return the process-wide ABI registry, configured from the environment."""
+    global _abi_registry
+    if _abi_registry is None:
+        _abi_registry = AbiRegistry.from_env()
+    return _abi_registry
+
+
+async def decode_logs(logs: List[Any], chainid: str = "1") -> List[Any]:
+    """Decode event logs with the process-wide ABI registry."""
+    return await get_abi_registry().decode_logs(logs, chainid)
+
+
+async def decode_transactions(transactions: List[Any], chainid: str = "1") -> List[Any]:
+    """Decode transaction calldata with the process-wide ABI registry."""
+    return await get_abi_registry().decode_transactions(transactions, chainid)
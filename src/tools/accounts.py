@@ -1,55 +1,59 @@
 """Account-related tools for Etherscan API."""
 
+from functools import partial
 from typing import Optional
 from mcp.server.fastmcp import FastMCP
-from .utils import api_call
+from .abi import decode_transactions
+from .batching import fetch_balances, get_balance_batcher, split_addresses
+from .filters import RowFilter
+from .pagination import fetch_all_records
+from .utils import api_call, format_response, render_result
 
 
 def register_account_tools(server: FastMCP) -> None:
     """Register all account-related tools with the server."""
     
     @server.tool()
-    def account_balance(address: str, chainid: str = "1") -> str:
+    async def account_balance(address: str, chainid: str = "1") -> str:
         """Returns the Ether balance of a given address.
         
         Args:
             address: The string representing the address to check for balance
             chainid: The chain id, default is 1
         """
-        params = {
-            "module": "account",
-            "action": "balance",
-            "address": address,
-            "chainid": chainid
-        }
-        return api_call(params)
+        # Concurrent lookups on the same chain are batched into balancemulti calls
+        return format_response(await get_balance_batcher().balance(address, chainid))
     
     @server.tool()
-    def account_balancemulti(address: str, chainid: str = "1") -> str:
+    async def account_balancemulti(address: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Get Ether Balance for Multiple Addresses in a Single Call.
         
         Args:
             address: The strings representing the addresses to check for balance, separated by `,`
-                    up to **20 addresses** per call
+                    any number of addresses, fetched in parallel chunks of 20
             chainid: The chain id, default is 1
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
-        params = {
-            "module": "account",
-            "action": "balancemulti",
-            "address": address,
-            "chainid": chainid
-        }
-        return api_call(params)
+        return format_response(await fetch_balances(split_addresses(address), chainid), output_format)
     
     @server.tool()
-    def account_txlist(
+    async def account_txlist(
         address: str,
         startblock: str = "0",
         endblock: str = "99999999",
         page: str = "1",
         offset: str = "10",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        fetch_all: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        min_value: Optional[str] = None,
+        max_value: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        method_id: Optional[str] = None,
+        is_error: Optional[str] = None,
+        decode: bool = False
     ) -> str:
         """Returns the list of 'Normal' Transactions By Address.
         
@@ -61,6 +65,15 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of transactions displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            fetch_all: When true, ignore `page`/`offset` and return every matching record, paging automatically past the 10,000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            min_value: Only return records whose `value` is at least this amount (in wei, or token units for token transfers)
+            max_value: Only return records whose `value` is at most this amount (in wei, or token units for token transfers)
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            method_id: Only return transactions calling this 4-byte method id, eg. `0xa9059cbb`
+            is_error: Only return records with this `isError` flag, `0` for successful or `1` for failed
+            decode: When true, add a `decoded` field with the called function signature and named arguments, using the called contract's verified ABI
         """
         params = {
             "module": "account",
@@ -73,17 +86,35 @@ def register_account_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        row_filter = RowFilter(
+            fields=fields,
+            min_value=min_value,
+            max_value=max_value,
+            counterparty=counterparty,
+            method_id=method_id,
+            is_error=is_error,
+        )
+        decoder = partial(decode_transactions, chainid=chainid) if decode else None
+        if fetch_all:
+            return await render_result(await fetch_all_records(params), output_format, row_filter, decoder)
+        return await api_call(params, output_format, row_filter, decoder)
     
     @server.tool()
-    def account_txlistinternal(
+    async def account_txlistinternal(
         address: str,
         startblock: str = "0",
         endblock: str = "99999999",
         page: str = "1",
         offset: str = "10",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        fetch_all: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        min_value: Optional[str] = None,
+        max_value: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        is_error: Optional[str] = None
     ) -> str:
         """Returns the list of 'Internal' Transactions by Address.
         
@@ -95,6 +126,13 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of transactions displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            fetch_all: When true, ignore `page`/`offset` and return every matching record, paging automatically past the 10,000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            min_value: Only return records whose `value` is at least this amount (in wei, or token units for token transfers)
+            max_value: Only return records whose `value` is at most this amount (in wei, or token units for token transfers)
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            is_error: Only return records with this `isError` flag, `0` for successful or `1` for failed
         """
         params = {
             "module": "account",
@@ -107,15 +145,25 @@ def register_account_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        row_filter = RowFilter(
+            fields=fields,
+            min_value=min_value,
+            max_value=max_value,
+            counterparty=counterparty,
+            is_error=is_error,
+        )
+        if fetch_all:
+            return format_response(row_filter.apply(await fetch_all_records(params)), output_format)
+        return await api_call(params, output_format, row_filter)
     
     @server.tool()
-    def account_txlistinternal_byhash(txhash: str, chainid: str = "1") -> str:
+    async def account_txlistinternal_byhash(txhash: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the list of 'Internal' Transactions by Transaction Hash.
         
         Args:
             txhash: The string representing the transaction hash to get internal txs for
             chainid: The chain id, default is 1
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "account",
@@ -123,16 +171,22 @@ def register_account_tools(server: FastMCP) -> None:
             "txhash": txhash,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def account_txlistinternal_byblock(
+    async def account_txlistinternal_byblock(
         startblock: str,
         endblock: str,
         page: str = "1",
         offset: str = "10",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        min_value: Optional[str] = None,
+        max_value: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        is_error: Optional[str] = None
     ) -> str:
         """Returns the list of 'Internal' Transactions by Block Range.
         
@@ -143,6 +197,12 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of transactions displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            min_value: Only return records whose `value` is at least this amount (in wei, or token units for token transfers)
+            max_value: Only return records whose `value` is at most this amount (in wei, or token units for token transfers)
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            is_error: Only return records with this `isError` flag, `0` for successful or `1` for failed
         """
         params = {
             "module": "account",
@@ -154,10 +214,17 @@ def register_account_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        row_filter = RowFilter(
+            fields=fields,
+            min_value=min_value,
+            max_value=max_value,
+            counterparty=counterparty,
+            is_error=is_error,
+        )
+        return await api_call(params, output_format, row_filter)
     
     @server.tool()
-    def account_tokentx(
+    async def account_tokentx(
         address: str,
         contractaddress: Optional[str] = None,
         startblock: str = "0",
@@ -165,7 +232,14 @@ def register_account_tools(server: FastMCP) -> None:
         page: str = "1",
         offset: str = "10",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        fetch_all: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        min_value: Optional[str] = None,
+        max_value: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        method_id: Optional[str] = None
     ) -> str:
         """Returns the list of ERC20 Token Transfer Events by Address.
         
@@ -178,6 +252,13 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of transactions displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            fetch_all: When true, ignore `page`/`offset` and return every matching record, paging automatically past the 10,000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            min_value: Only return records whose `value` is at least this amount (in wei, or token units for token transfers)
+            max_value: Only return records whose `value` is at most this amount (in wei, or token units for token transfers)
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            method_id: Only return transactions calling this 4-byte method id, eg. `0xa9059cbb`
         """
         params = {
             "module": "account",
@@ -192,10 +273,19 @@ def register_account_tools(server: FastMCP) -> None:
         }
         if contractaddress:
             params["contractaddress"] = contractaddress
-        return api_call(params)
+        row_filter = RowFilter(
+            fields=fields,
+            min_value=min_value,
+            max_value=max_value,
+            counterparty=counterparty,
+            method_id=method_id,
+        )
+        if fetch_all:
+            return format_response(row_filter.apply(await fetch_all_records(params)), output_format)
+        return await api_call(params, output_format, row_filter)
     
     @server.tool()
-    def account_tokennfttx(
+    async def account_tokennfttx(
         address: str,
         contractaddress: Optional[str] = None,
         startblock: str = "0",
@@ -203,7 +293,12 @@ def register_account_tools(server: FastMCP) -> None:
         page: str = "1",
         offset: str = "10",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        fetch_all: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        method_id: Optional[str] = None
     ) -> str:
         """Returns the list of ERC721 Token Transfer Events by Address.
         
@@ -216,6 +311,11 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of transactions displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            fetch_all: When true, ignore `page`/`offset` and return every matching record, paging automatically past the 10,000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            method_id: Only return transactions calling this 4-byte method id, eg. `0xa9059cbb`
         """
         params = {
             "module": "account",
@@ -230,10 +330,13 @@ def register_account_tools(server: FastMCP) -> None:
         }
         if contractaddress:
             params["contractaddress"] = contractaddress
-        return api_call(params)
+        row_filter = RowFilter(fields=fields, counterparty=counterparty, method_id=method_id)
+        if fetch_all:
+            return format_response(row_filter.apply(await fetch_all_records(params)), output_format)
+        return await api_call(params, output_format, row_filter)
     
     @server.tool()
-    def account_token1155tx(
+    async def account_token1155tx(
         address: str,
         contractaddress: Optional[str] = None,
         startblock: str = "0",
@@ -241,7 +344,12 @@ def register_account_tools(server: FastMCP) -> None:
         page: str = "1",
         offset: str = "10",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        fetch_all: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        method_id: Optional[str] = None
     ) -> str:
         """Returns the list of ERC1155 Token Transfer Events by Address.
         
@@ -254,6 +362,11 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of transactions displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            fetch_all: When true, ignore `page`/`offset` and return every matching record, paging automatically past the 10,000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            method_id: Only return transactions calling this 4-byte method id, eg. `0xa9059cbb`
         """
         params = {
             "module": "account",
@@ -268,10 +381,13 @@ def register_account_tools(server: FastMCP) -> None:
         }
         if contractaddress:
             params["contractaddress"] = contractaddress
-        return api_call(params)
+        row_filter = RowFilter(fields=fields, counterparty=counterparty, method_id=method_id)
+        if fetch_all:
+            return format_response(row_filter.apply(await fetch_all_records(params)), output_format)
+        return await api_call(params, output_format, row_filter)
     
     @server.tool()
-    def account_fundedby(address: str, chainid: str = "1") -> str:
+    async def account_fundedby(address: str, chainid: str = "1") -> str:
         """Returns the address that funded an address, and its relative age.
         
         Args:
@@ -284,15 +400,16 @@ def register_account_tools(server: FastMCP) -> None:
             "address": address,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def account_getminedblocks(
+    async def account_getminedblocks(
         address: str,
         blocktype: str = "blocks",
         page: str = "1",
         offset: str = "10",
-        chainid: str = "1"
+        chainid: str = "1",
+        output_format: Optional[str] = None
     ) -> str:
         """Returns the list of blocks validated by an address.
         
@@ -302,6 +419,7 @@ def register_account_tools(server: FastMCP) -> None:
             page: The integer page number, if pagination is enabled
             offset: The number of blocks displayed per page
             chainid: The chain id, default is 1
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "account",
@@ -312,17 +430,19 @@ def register_account_tools(server: FastMCP) -> None:
             "offset": offset,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def account_txsBeaconWithdrawal(
+    async def account_txsBeaconWithdrawal(
         address: str,
         startblock: str = "0",
         endblock: str = "99999999",
         page: str = "1",
         offset: str = "100",
         sort: str = "asc",
-        chainid: str = "1"
+        chainid: str = "1",
+        fetch_all: bool = False,
+        output_format: Optional[str] = None
     ) -> str:
         """Returns the beacon chain withdrawals made to an address.
         
@@ -334,6 +454,8 @@ def register_account_tools(server: FastMCP) -> None:
             offset: The number of withdrawals displayed per page
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: The chain id, default is 1
+            fetch_all: When true, ignore `page`/`offset` and return every matching record, paging automatically past the 10,000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "account",
@@ -346,4 +468,6 @@ def register_account_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        if fetch_all:
+            return format_response(await fetch_all_records(params), output_format)
+        return await api_call(params, output_format)
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""Micro-batching of single-address lookups into multi-address requests."""
+
+import asyncio
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, TypeVar
+
+from .cache import get_response_cache, normalize_params
+from .multicall import Multicaller, encoded_size, get_multicaller
+from .utils import CircuitOpenError, EtherscanAPIError, TransientAPIError, gather_or_cancel, make_api_request
+
+
+# account/balancemulti accepts at most this many addresses per request
+BALANCEMULTI_LIMIT = 20
+
+ADDRESS_PATTERN = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+# How long to wait for more account_balance calls before sending a batch
+DEFAULT_BATCH_WINDOW_MS = 5.0
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    """Split ``items`` into consecutive chunks of at most ``size`` elements."""
+    return [items[index:index + size] for index in range(0, len(items), size)]
+
+
+def split_addresses(addresses: str) -> List[str]:
+    """Split a comma-separated address list, dropping blanks."""
+    return [address.strip() for address in addresses.split(",") if address.strip()]
+
+
+async def _fetch_balance_chunk(addresses: Sequence[str], chainid: str) -> Dict[str, str]:
+    if len(addresses) == 1:
+        data = await make_api_request({
+            "module": "account",
+            "action": "balance",
+            "address": addresses[0],
+            "chainid": chainid,
+        })
+        return {addresses[0].lower(): data.get("result")}
+
+    data = await make_api_request({
+        "module": "account",
+        "action": "balancemulti",
+        "address": ",".join(addresses),
+        "chainid": chainid,
+    })
+    result = data.get("result")
+    if not isinstance(result, list):
+        raise EtherscanAPIError(f"Unexpected balancemulti result: {result}")
+    return {str(entry.get("account", "")).lower(): entry.get("balance") for entry in result}
+
+
+async def fetch_balances(addresses: Sequence[str], chainid: str = "1") -> List[Dict[str, Any]]:
+    """
+    Fetch Ether balances for any number of addresses.
+
+    Addresses are sent in balancemulti chunks of 20 that run concurrently;
+    the first failing chunk cancels the rest.
+
+    Returns:
+        ``[{"account": ..., "balance": ...}]`` in the order given
+    """
+    chunks = chunked(list(addresses), BALANCEMULTI_LIMIT)
+    results = await gather_or_cancel(*(_fetch_balance_chunk(chunk, chainid) for chunk in chunks))
+    balances: Dict[str, str] = {}
+    for result in results:
+        balances.update(result)
+    return [{"account": address, "balance": balances.get(address.lower())} for address in addresses]
+
+
+class BalanceBatcher:
+    """
+    Collect concurrent single-address balance lookups into balancemulti calls.
+
+    Lookups for the same chain that arrive within ``window`` seconds of each
+    other share one upstream request (up to 20 addresses per request).
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._pending: Dict[str, Dict[str, List["asyncio.Future[Any]"]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        # The event loop only keeps weak references to tasks
+        self._dispatching: Set["asyncio.Future[None]"] = set()
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls) -> "BalanceBatcher":
+        """Build a batcher using ``ETHERSCAN_BATCH_WINDOW_MS``."""
+        window_ms = float(os.getenv("ETHERSCAN_BATCH_WINDOW_MS", DEFAULT_BATCH_WINDOW_MS))
+        return cls(window_ms / 1000.0)
+
+    async def balance(self, address: str, chainid: str = "1") -> Any:
+        """
+        Return the balance of ``address``, batched with concurrent callers.
+
+        A malformed address is rejected here, before it can fail the
+        balancemulti request it would share with other callers.
+        """
+        if not ADDRESS_PATTERN.match(address):
+            raise EtherscanAPIError(f"Invalid address {address!r}")
+        if self.window <= 0:
+            return (await fetch_balances([address], chainid))[0]["balance"]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(chainid, {})
+        pending.setdefault(address.lower(), []).append(future)
+
+        if len(pending) >= BALANCEMULTI_LIMIT:
+            self._flush(chainid)
+        elif chainid not in self._timers:
+            self._timers[chainid] = loop.call_later(self.window, self._flush, chainid)
+        return await future
+
+    def _flush(self, chainid: str) -> None:
+        timer = self._timers.pop(chainid, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(chainid, None)
+        if pending:
+            self.batches += 1
+            task = asyncio.ensure_future(self._dispatch(chainid, pending))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, chainid: str, pending: Dict[str, List["asyncio.Future[Any]"]]) -> None:
+        error: Optional[BaseException] = None
+        balances: Dict[str, Any] = {}
+        try:
+            for entry in await fetch_balances(list(pending), chainid):
+                balances[entry["account"]] = entry["balance"]
+        except Exception as e:
+            error = e
+        for address, futures in pending.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(balances.get(address))
+
+
+_balance_batcher: Optional[BalanceBatcher] = None
+
+
+def get_balance_batcher() -> BalanceBatcher:
+    """Return the process-wide balance batcher, configured from the environment."""
+    global _balance_batcher
+    if _balance_batcher is None:
+        _balance_batcher = BalanceBatcher.from_env()
+    return _balance_batcher
+
+
+# contract/getcontractcreation accepts at most this many addresses per request
+CONTRACT_CREATION_LIMIT = 5
+
+
+def _creation_params(addresses: Sequence[str], chainid: str) -> Dict[str, Any]:
+    return {
+        "module": "contract",
+        "action": "getcontractcreation",
+        "contractaddresses": ",".join(addresses),
+        "chainid": chainid,
+    }
+
+
+async def fetch_contract_creations(addresses: Sequence[str], chainid: str = "1") -> List[Dict[str, Any]]:
+    """
+    Fetch creator and creation tx for any number of contracts.
+
+    Each address is looked up in the response cache on its own first;
+    the rest are requested in chunks of 5 that run concurrently, and every
+    returned record is cached per address since it never changes.
+
+    Returns:
+        Creation records in input order; addresses that are not contracts
+        are omitted
+    """
+    cache = get_response_cache()
+    wanted = list(dict.fromkeys(address.lower() for address in addresses))
+
+    records: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for address in wanted:
+        params = _creation_params([address], chainid)
+        cached = await cache.lookup(normalize_params(params), params)
+        if cached and cached.get("result"):
+            records[address] = cached["result"][0]
+        else:
+            missing.append(address)
+
+    chunks = chunked(missing, CONTRACT_CREATION_LIMIT)
+    responses = await gather_or_cancel(
+        *(make_api_request(_creation_params(chunk, chainid)) for chunk in chunks)
+    )
+    for data in responses:
+        for record in data.get("result") or []:
+            address = str(record.get("contractAddress", "")).lower()
+            records[address] = record
+            await cache.remember(
+                _creation_params([address], chainid),
+                {"status": "1", "message": "OK", "result": [record]},
+            )
+
+    return [records[address] for address in wanted if address in records]
+
+
+# balanceOf(address)
+BALANCE_OF_SELECTOR = "70a08231"
+TOKEN_BALANCE_METHODS = ("auto", "multicall", "tokenbalance")
+# tokenbalance errors meaning the token has no balance to report for the holder
+NO_BALANCE_ERROR = re.compile(r"contract|no data|execution reverted", re.IGNORECASE)
+
+
+def _balance_of_call(holder: str) -> str:
+    return BALANCE_OF_SELECTOR + "0" * 24 + holder[2:].lower()
+
+
+def plan_token_balances(cells: int, multicaller: Multicaller) -> str:
+    """Pick the method that needs fewer upstream requests for ``cells`` balances."""
+    per_request = min(multicaller.max_calls, multicaller.max_bytes // encoded_size(_balance_of_call("0x" + "0" * 40)))
+    multicall_requests = -(-cells // max(1, per_request))
+    return "multicall" if multicall_requests < cells else "tokenbalance"
+
+
+async def _fetch_token_balance(token: str, holder: str, chainid: str) -> Optional[str]:
+    try:
+        data = await make_api_request({
+            "module": "account",
+            "action": "tokenbalance",
+            "contractaddress": token,
+            "address": holder,
+            "tag": "latest",
+            "chainid": chainid,
+        })
+    except (TransientAPIError, CircuitOpenError):
+        raise
+    except EtherscanAPIError as e:
+        # Only a token that cannot answer is left blank; key, quota and other failures surface
+        if NO_BALANCE_ERROR.search(str(e)):
+            return None
+        raise
+    return data.get("result")
+
+
+async def fetch_token_balances(
+    holders: Sequence[str],
+    tokens: Sequence[str],
+    chainid: str = "1",
+    method: str = "auto",
+) -> Dict[str, Any]:
+    """
+    Fetch the ERC-20 balance of every holder for every token.
+
+    ``auto`` reads through Multicall3 ``balanceOf`` whenever that takes fewer
+    requests than one ``tokenbalance`` call per pair. Pairs whose
+    ``balanceOf`` reverts or returns nothing are retried with ``tokenbalance``.
+    Addresses are lowercased, so checksummed duplicates are fetched once.
+
+    Returns:
+        ``{"columns": ["holder", <token>...], "rows": [[holder, <balance>...]]}``
+        with raw balances as decimal strings, None where the token cannot
+        report one
+
+    Raises:
+        EtherscanAPIError: If a lookup fails for any other reason (bad key,
+            open circuit, exhausted retries)
+    """
+    method = method.lower()
+    if method not in TOKEN_BALANCE_METHODS:
+        raise EtherscanAPIError(f"Unknown method {method!r}, expected one of {', '.join(TOKEN_BALANCE_METHODS)}")
+    # Checksummed and lowercase spellings of an address are the same address
+    holders = list(dict.fromkeys(address.lower() for address in holders))
+    tokens = list(dict.fromkeys(address.lower() for address in tokens))
+    for address in holders + tokens:
+        if not ADDRESS_PATTERN.match(address):
+            raise EtherscanAPIError(f"Invalid address {address!r}")
+    pairs = [(token, holder) for holder in holders for token in tokens]
+
+    multicaller = get_multicaller()
+    if method == "auto":
+        method = plan_token_balances(len(pairs), multicaller)
+
+    balances: List[Optional[str]] = [None] * len(pairs)
+    retry = list(range(len(pairs)))
+    if method == "multicall" and pairs:
+        calls = [(token, _balance_of_call(holder)) for token, holder in pairs]
+        results = await multicaller.call(calls, "latest", chainid)
+        retry = []
+        for index, result in enumerate(results):
+            data = result["returnData"]
+            if result["success"] and len(data) >= 66:
+                balances[index] = str(int(data[2:66], 16))
+            else:
+                retry.append(index)
+
+    fetched = await gather_or_cancel(*(_fetch_token_balance(*pairs[index], chainid) for index in retry))
+    for index, balance in zip(retry, fetched):
+        balances[index] = balance
+
+    width = len(tokens)
+    return {
+        "columns": ["holder", *tokens],
+        "rows": [
+            [holder, *balances[row * width:(row + 1) * width]]
+            for row, holder in enumerate(holders)
+        ],
+    }
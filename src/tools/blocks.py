@@ -1,14 +1,20 @@
 """Block-related tools for Etherscan API."""
 
+from typing import Optional
+
 from mcp.server.fastmcp import FastMCP
-from .utils import api_call
+from .blocktime import get_block_time_index
+from .utils import EtherscanAPIError, add_response_observer, api_call, format_response
 
 
 def register_block_tools(server: FastMCP) -> None:
     """Register all block-related tools with the server."""
     
+    # Every block and transaction seen on the request path feeds the timestamp index
+    add_response_observer(get_block_time_index().observe)
+    
     @server.tool()
-    def block_getblockreward(blockno: str, chainid: str = "1") -> str:
+    async def block_getblockreward(blockno: str, chainid: str = "1") -> str:
         """Returns the block reward and 'Uncle' block rewards.
         
         Args:
@@ -21,10 +27,10 @@ def register_block_tools(server: FastMCP) -> None:
             "blockno": blockno,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def block_getblockcountdown(blockno: str, chainid: str = "1") -> str:
+    async def block_getblockcountdown(blockno: str, chainid: str = "1") -> str:
         """Returns the estimated time remaining, in seconds, until a certain block is mined.
         
         Args:
@@ -37,10 +43,10 @@ def register_block_tools(server: FastMCP) -> None:
             "blockno": blockno,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def block_getblocknobytime(timestamp: str, closest: str, chainid: str = "1") -> str:
+    async def block_getblocknobytime(timestamp: str, closest: str, chainid: str = "1") -> str:
         """Returns the block number that was mined at a certain timestamp.
         
         Args:
@@ -48,17 +54,41 @@ def register_block_tools(server: FastMCP) -> None:
             closest: The closest available block to the provided timestamp, either `before` or `after`
             chainid: The chain id, default is 1
         """
-        params = {
-            "module": "block",
-            "action": "getblocknobytime",
-            "timestamp": timestamp,
-            "closest": closest,
-            "chainid": chainid
-        }
-        return api_call(params)
+        try:
+            value = int(timestamp)
+        except ValueError:
+            raise EtherscanAPIError(f"Invalid timestamp: {timestamp}")
+        block = await get_block_time_index().resolve(value, closest, chainid)
+        return format_response(str(block))
+    
+    @server.tool()
+    async def block_getblocknobytime_batch(
+        timestamps: str,
+        closest: str = "before",
+        chainid: str = "1",
+        output_format: Optional[str] = None
+    ) -> str:
+        """Returns the block numbers that were mined at several timestamps.
+        
+        Args:
+            timestamps: The Unix timestamps in **seconds**, separated by `,`
+            closest: The closest available block to each timestamp, either `before` or `after`
+            chainid: The chain id, default is 1
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+        """
+        try:
+            values = [int(value) for value in timestamps.split(",") if value.strip()]
+        except ValueError:
+            raise EtherscanAPIError(f"Invalid timestamps: {timestamps}")
+        blocks = await get_block_time_index().resolve_many(values, closest, chainid)
+        result = [
+            {"timestamp": str(value), "blockNumber": str(block)}
+            for value, block in zip(values, blocks)
+        ]
+        return format_response(result, output_format)
     
     @server.tool()
-    def block_getblocktxnscount(blockno: str, chainid: str = "1") -> str:
+    async def block_getblocktxnscount(blockno: str, chainid: str = "1") -> str:
         """Returns the number of transactions in a specified block.
         
         Args:
@@ -71,4 +101,4 @@ def register_block_tools(server: FastMCP) -> None:
             "blockno": blockno,
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params)
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""Local block-number/timestamp index for resolving blocks by time."""
+
+import asyncio
+import os
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import FINALITY_AGE, get_response_cache
+from .utils import EtherscanAPIError, make_api_request
+
+
+# Search locally only when the known bracket is at most this many blocks wide
+DEFAULT_MAX_BRACKET = 32
+# Block header probes allowed before falling back to getblocknobytime
+DEFAULT_MAX_PROBES = 2
+# Finalized timestamp answers remembered, least recently used evicted first
+DEFAULT_MAX_ANSWERS = 10000
+
+# Persistent cache key prefix of pinned eth_getBlockByNumber responses
+BLOCK_KEY_PREFIX = "action=eth_getBlockByNumber&"
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    value = str(value)
+    try:
+        return int(value, 16) if value.startswith("0x") else int(value)
+    except ValueError:
+        return None
+
+
+class ChainTimeline:
+    """Known (block, timestamp) pairs for one chain, kept sorted by block."""
+
+    def __init__(self):
+        self.blocks: List[int] = []
+        self.times: List[int] = []
+
+    def add(self, block: int, timestamp: int) -> None:
+        index = bisect_left(self.blocks, block)
+        if index < len(self.blocks) and self.blocks[index] == block:
+            self.times[index] = timestamp
+            return
+        self.blocks.insert(index, block)
+        self.times.insert(index, timestamp)
+
+    def timestamp_of(self, block: int) -> int:
+        return self.times[bisect_left(self.blocks, block)]
+
+    def bracket(self, timestamp: int, closest: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Return the known blocks surrounding the answer for ``timestamp``.
+
+        For ``before`` the answer is the last block with ts <= timestamp, so
+        the bracket is (last known with ts <= t, first known with ts > t).
+        For ``after`` it is (last known with ts < t, first known with ts >= t).
+        Timestamps never decrease with block number, so both lists share one order.
+        """
+        if closest == "before":
+            index = bisect_right(self.times, timestamp)
+        else:
+            index = bisect_left(self.times, timestamp)
+        low = self.blocks[index - 1] if index > 0 else None
+        high = self.blocks[index] if index < len(self.blocks) else None
+        return low, high
+
+
+class BlockTimeIndex:
+    """
+    Answer getblocknobytime locally from known block timestamps.
+
+    The index is fed from every block and list row that passes through the
+    request path (and from blocks in the persistent cache). When the known
+    blocks around a timestamp are adjacent, the answer is exact and costs
+    nothing. When they are close, a few interpolated block header probes
+    narrow the bracket; otherwise the question goes upstream once and the
+    answer is remembered.
+    """
+
+    def __init__(
+        self,
+        max_bracket: int = DEFAULT_MAX_BRACKET,
+        max_probes: int = DEFAULT_MAX_PROBES,
+        max_answers: int = DEFAULT_MAX_ANSWERS,
+    ):
+        self.max_bracket = max_bracket
+        self.max_probes = max_probes
+        self.max_answers = max_answers
+        self._chains: Dict[str, ChainTimeline] = {}
+        self._answers: "OrderedDict[Tuple[str, int, str], int]" = OrderedDict()
+        self._warmed = False
+        self.local_hits = 0
+        self.upstream = 0
+
+    @classmethod
+    def from_env(cls) -> "BlockTimeIndex":
+        """Build an index from ``ETHERSCAN_BLOCKTIME_MAX_BRACKET``/``_MAX_PROBES``/``_MAX_ANSWERS``."""
+        max_bracket = int(os.getenv("ETHERSCAN_BLOCKTIME_MAX_BRACKET", DEFAULT_MAX_BRACKET))
+        max_probes = int(os.getenv("ETHERSCAN_BLOCKTIME_MAX_PROBES", DEFAULT_MAX_PROBES))
+        max_answers = int(os.getenv("ETHERSCAN_BLOCKTIME_MAX_ANSWERS", DEFAULT_MAX_ANSWERS))
+        return cls(max_bracket, max_probes, max_answers)
+
+    def timeline(self, chainid: str) -> ChainTimeline:
+        chain = self._chains.get(chainid)
+        if chain is None:
+            chain = self._chains[chainid] = ChainTimeline()
+        return chain
+
+    def add(self, chainid: str, block: Optional[int], timestamp: Optional[int]) -> None:
+        """Record that ``block`` was mined at ``timestamp``."""
+        if block is not None and timestamp is not None:
+            self.timeline(str(chainid)).add(block, timestamp)
+
+    def observe(self, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Learn block timestamps from any response that carries them."""
+        chainid = str(params.get("chainid", "1"))
+        result = data.get("result")
+        if isinstance(result, dict):
+            self.add(
+                chainid,
+                _to_int(result.get("number") or result.get("blockNumber")),
+                _to_int(result.get("timestamp") or result.get("timeStamp")),
+            )
+        elif isinstance(result, list):
+            for row in result:
+                if isinstance(row, dict) and "timeStamp" in row and "blockNumber" in row:
+                    self.add(chainid, _to_int(row["blockNumber"]), _to_int(row["timeStamp"]))
+
+    async def warm(self) -> None:
+        """Load timestamps of blocks kept in the persistent cache, once."""
+        if self._warmed:
+            return
+        self._warmed = True
+        persistent = get_response_cache().persistent
+        if persistent is None:
+            return
+        for key, data in await persistent.scan(BLOCK_KEY_PREFIX):
+            # Block responses do not carry their chain id, but their cache key does
+            params = dict(part.split("=", 1) for part in key.split("&") if "=" in part)
+            if isinstance(data, dict):
+                self.observe(params, data)
+
+    async def _block_timestamp(self, block: int, chainid: str) -> int:
+        data = await make_api_request({
+            "module": "proxy",
+            "action": "eth_getBlockByNumber",
+            "tag": hex(block),
+            "boolean": "false",
+            "chainid": chainid,
+        })
+        result = data.get("result")
+        timestamp = _to_int(result.get("timestamp")) if isinstance(result, dict) else None
+        if timestamp is None:
+            raise EtherscanAPIError(f"Block {block} has no timestamp")
+        self.add(chainid, block, timestamp)
+        return timestamp
+
+    def _local_answer(self, chain: ChainTimeline, timestamp: int, closest: str) -> Optional[int]:
+        low, high = chain.bracket(timestamp, closest)
+        if low is not None and high is not None and high - low == 1:
+            return low if closest == "before" else high
+        return None
+
+    async def resolve(self, timestamp: int, closest: str = "before", chainid: str = "1") -> int:
+        """Return the block number mined at or around ``timestamp``."""
+        closest = closest.lower()
+        if closest not in ("before", "after"):
+            raise EtherscanAPIError("closest must be either `before` or `after`")
+        chainid = str(chainid)
+        memo_key = (chainid, timestamp, closest)
+        if memo_key in self._answers:
+            self._answers.move_to_end(memo_key)
+            self.local_hits += 1
+            return self._answers[memo_key]
+
+        await self.warm()
+        chain = self.timeline(chainid)
+        answer = self._local_answer(chain, timestamp, closest)
+
+        probes = 0
+        while answer is None and probes < self.max_probes:
+            low, high = chain.bracket(timestamp, closest)
+            if low is None or high is None or high - low > self.max_bracket:
+                break
+            # Interpolate between the bracket ends, then tighten with the probe
+            low_ts, high_ts = chain.timestamp_of(low), chain.timestamp_of(high)
+            span = max(1, high_ts - low_ts)
+            guess = low + (high - low) * (timestamp - low_ts) // span
+            guess = min(max(guess, low + 1), high - 1)
+            await self._block_timestamp(guess, chainid)
+            probes += 1
+            answer = self._local_answer(chain, timestamp, closest)
+
+        if answer is not None:
+            self.local_hits += 1
+        else:
+            self.upstream += 1
+            data = await make_api_request({
+                "module": "block",
+                "action": "getblocknobytime",
+                "timestamp": str(timestamp),
+                "closest": closest,
+                "chainid": chainid,
+            })
+            answer = _to_int(data.get("result"))
+            if answer is None:
+                raise EtherscanAPIError(f"Unexpected getblocknobytime result: {data.get('result')}")
+        if time.time() - timestamp > FINALITY_AGE:
+            # Answers near the head can still move as new blocks arrive
+            self._remember(memo_key, answer)
+        return answer
+
+    def _remember(self, memo_key: Tuple[str, int, str], answer: int) -> None:
+        if self.max_answers <= 0:
+            return
+        self._answers[memo_key] = answer
+        self._answers.move_to_end(memo_key)
+        while len(self._answers) > self.max_answers:
+            self._answers.popitem(last=False)
+
+    async def resolve_many(self, timestamps: List[int], closest: str = "before", chainid: str = "1") -> List[int]:
+        """Resolve several timestamps concurrently."""
+        return list(await asyncio.gather(*(self.resolve(ts, closest, chainid) for ts in timestamps)))
+
+
+_block_time_index: Optional[BlockTimeIndex] = None
+
+
+def get_block_time_index() -> BlockTimeIndex:
+    """Return the process-wide block timestamp index, configured from the environment."""
+    global _block_time_index
+    if _block_time_index is None:
+        _block_time_index = BlockTimeIndex.from_env()
+    return _block_time_index
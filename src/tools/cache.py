@@ -0,0 +1,338 @@
+"""Finality-aware in-process cache for Etherscan API responses."""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .diskcache import PersistentCache
+from .rawjson import RawJSON, materialize
+
+
+# Time-to-live (seconds) for entries that never change once written
+PINNED = float("inf")
+
+# Results that are only valid for a few seconds
+VOLATILE_TTL: Dict[Tuple[str, str], float] = {
+    ("proxy", "eth_blockNumber"): 2.0,
+    ("proxy", "eth_gasPrice"): 5.0,
+    ("gastracker", "gasoracle"): 5.0,
+    ("gastracker", "gasestimate"): 10.0,
+    ("stats", "ethprice"): 10.0,
+    ("stats", "ethsupply"): 60.0,
+    ("stats", "ethsupply2"): 60.0,
+    ("stats", "nodecount"): 60.0,
+    ("block", "getblockcountdown"): 5.0,
+}
+
+# Results that never change, regardless of chain head
+IMMUTABLE_ACTIONS = {
+    ("contract", "getabi"),
+    ("contract", "getcontractcreation"),
+}
+
+# Results pinned to a block: immutable once that block is final
+BLOCK_SCOPED_ACTIONS = {
+    ("proxy", "eth_getBlockByNumber"),
+    ("proxy", "eth_getBlockTransactionCountByNumber"),
+    ("proxy", "eth_getTransactionByHash"),
+    ("proxy", "eth_getTransactionByBlockNumberAndIndex"),
+    ("proxy", "eth_getTransactionReceipt"),
+    ("proxy", "eth_getUncleByBlockNumberAndIndex"),
+    ("proxy", "eth_call"),
+    ("proxy", "eth_getCode"),
+    ("proxy", "eth_getStorageAt"),
+    ("block", "getblockreward"),
+    ("block", "getblocktxnscount"),
+}
+
+DEFAULT_TTL = 15.0
+UNFINALIZED_TTL = 12.0
+UNVERIFIED_SOURCE_TTL = 300.0
+
+# Blocks this far below the observed head are treated as final
+DEFAULT_FINALITY_DEPTH = 64
+# Blocks older than this (by their own timestamp) are treated as final
+FINALITY_AGE = 3600.0
+
+DEFAULT_MAX_ENTRIES = 10000
+# Estimated size of all cached results together
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# No single result may take more than this share of the byte budget
+MAX_ENTRY_SHARE = 8
+
+# Block tags whose block moves with the chain; never a final block number
+MOVING_TAGS = {"latest", "pending", "safe", "finalized"}
+
+# How long past expiry an entry may still be served while its upstream is down
+DEFAULT_MAX_STALE = 3600.0
+
+
+def normalize_params(params: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Normalize request parameters into a hashable cache key.
+
+    Drops unset values and the API key, stringifies everything and lowercases
+    hex values so that checksummed and lowercase addresses share an entry.
+    """
+    items = []
+    for key, value in params.items():
+        if value is None or key == "apikey":
+            continue
+        value = str(value).strip()
+        if value[:2].lower() == "0x":
+            value = value.lower()
+        items.append((key, value))
+    return tuple(sorted(items))
+
+
+def _has_verified_source(result: Any) -> bool:
+    if isinstance(result, RawJSON):
+        # Judged on the text so that a large source is not parsed just to pick a TTL
+        return '"SourceCode":"' in result.text and '"SourceCode":""' not in result.text
+    return isinstance(result, list) and any(item.get("SourceCode") for item in result)
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory a cached result takes, by the length of its JSON text."""
+    if isinstance(value, dict) and isinstance(value.get("result"), RawJSON):
+        return len(value["result"].text)
+    return len(json.dumps(value, default=str))
+
+
+def _parse_block(value: Any) -> Optional[int]:
+    """Parse a decimal or hex block number, returning None for tags like ``latest``."""
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    try:
+        if value.startswith("0x"):
+            return int(value, 16)
+        return int(value)
+    except ValueError:
+        return None
+
+
+class CacheEntry:
+    """A cached response, its estimated size and the moment it stops being fresh."""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int = 0):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    LRU cache of upstream responses with a per-action TTL policy.
+
+    Immutable results (ABIs, finalized blocks and receipts, ...) are pinned,
+    volatile ones (gas oracle, head block, price) expire within seconds.
+    Finality is judged against the highest block observed per chain.
+    Entries are bounded both in number and in estimated bytes; a result
+    larger than an eighth of the byte budget is not kept in memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        finality_depth: int = DEFAULT_FINALITY_DEPTH,
+        persistent: Optional[PersistentCache] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.finality_depth = finality_depth
+        self.persistent = persistent
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[Tuple[str, str], ...], CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._heads: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Build a cache from ``ETHERSCAN_CACHE_MAX_ENTRIES``/``ETHERSCAN_CACHE_MAX_MB``/``ETHERSCAN_FINALITY_DEPTH``."""
+        max_entries = int(os.getenv("ETHERSCAN_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        max_bytes = int(float(os.getenv("ETHERSCAN_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024)
+        finality_depth = int(os.getenv("ETHERSCAN_FINALITY_DEPTH", DEFAULT_FINALITY_DEPTH))
+        return cls(max_entries, finality_depth, PersistentCache.from_env(), max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Tuple[Tuple[str, str], ...]) -> Optional[Any]:
+        """Return the fresh cached value for ``key``, or None."""
+        entry = self._entries.get(key)
+        if entry is None or not entry.fresh:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def get_stale(self, key: Tuple[Tuple[str, str], ...], max_stale: float = DEFAULT_MAX_STALE) -> Optional[Any]:
+        """Return the cached value for ``key`` even if expired up to ``max_stale`` seconds ago."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.expires_at > max_stale:
+            return None
+        self.stale_hits += 1
+        return entry.value
+
+    def set(self, key: Tuple[Tuple[str, str], ...], value: Any, ttl: float, size: Optional[int] = None) -> None:
+        """
+        Store ``value`` for ``ttl`` seconds (``PINNED`` never expires).
+
+        ``size`` is the length of the response body, when known; otherwise
+        it is estimated from ``value``.
+        """
+        if not self.enabled or ttl <= 0:
+            return
+        if size is None:
+            size = estimate_size(value)
+        self._discard(key)
+        if size > self.max_bytes // MAX_ENTRY_SHARE:
+            return
+        self._entries[key] = CacheEntry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._bytes -= self._entries.popitem(last=False)[1].size
+
+    def _discard(self, key: Tuple[Tuple[str, str], ...]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def store(self, params: Dict[str, Any], data: Dict[str, Any], size: Optional[int] = None) -> float:
+        """
+        Cache a successful response according to the TTL policy.
+
+        Returns:
+            The TTL that was applied (0 when the response was not cached)
+        """
+        self.observe(params, data)
+        ttl = self.ttl_for(params, data)
+        self.set(normalize_params(params), data, ttl, size)
+        return ttl
+
+    async def lookup(self, key: Tuple[Tuple[str, str], ...], params: Dict[str, Any]) -> Optional[Any]:
+        """Return a cached value from memory, falling back to the persistent store."""
+        value = self.get(key)
+        if value is not None or self.persistent is None or not self.may_pin(params):
+            return value
+        value = await self.persistent.get(key)
+        if value is not None:
+            self.set(key, value, PINNED)
+        return value
+
+    async def remember(self, params: Dict[str, Any], data: Dict[str, Any], size: Optional[int] = None) -> float:
+        """Cache a response in memory and persist it when it is immutable."""
+        ttl = self.store(params, data, size)
+        if ttl == PINNED and self.persistent is not None:
+            await self.persistent.set(normalize_params(params), materialize(data))
+        return ttl
+
+    @staticmethod
+    def may_pin(params: Dict[str, Any]) -> bool:
+        """Return True if responses to ``params`` can ever be pinned."""
+        action = (params.get("module"), params.get("action"))
+        return (
+            action in IMMUTABLE_ACTIONS
+            or action in BLOCK_SCOPED_ACTIONS
+            or action == ("contract", "getsourcecode")
+            or action == ("block", "getblocknobytime")
+        )
+
+    def observe(self, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Track the chain head from responses that reveal it."""
+        chainid = str(params.get("chainid", "1"))
+        result = data.get("result")
+        block = None
+        if params.get("action") == "eth_blockNumber":
+            block = _parse_block(result)
+        elif isinstance(result, dict):
+            block = _parse_block(result.get("number") or result.get("blockNumber"))
+        if block is not None and block > self._heads.get(chainid, -1):
+            self._heads[chainid] = block
+
+    def head(self, chainid: str) -> Optional[int]:
+        """Return the highest block observed on ``chainid``."""
+        return self._heads.get(str(chainid))
+
+    def is_final(self, chainid: str, block: int, timestamp: Optional[int] = None) -> bool:
+        """Return True if ``block`` is deep enough (or old enough) to be final."""
+        if timestamp is not None and time.time() - timestamp > FINALITY_AGE:
+            return True
+        head = self.head(chainid)
+        return head is not None and block <= head - self.finality_depth
+
+    def ttl_for(self, params: Dict[str, Any], data: Dict[str, Any]) -> float:
+        """Return how long a response may be served from cache."""
+        action = (params.get("module"), params.get("action"))
+        result = data.get("result")
+
+        if action in VOLATILE_TTL:
+            return VOLATILE_TTL[action]
+        if action in IMMUTABLE_ACTIONS:
+            # An empty answer (e.g. not yet deployed) may still change
+            return PINNED if result else DEFAULT_TTL
+        if action == ("contract", "getsourcecode"):
+            return PINNED if _has_verified_source(result) else UNVERIFIED_SOURCE_TTL
+        if action in BLOCK_SCOPED_ACTIONS:
+            return self._block_scoped_ttl(params, result)
+        if action == ("block", "getblocknobytime"):
+            timestamp = _parse_block(params.get("timestamp"))
+            old_enough = timestamp is not None and time.time() - timestamp > FINALITY_AGE
+            return PINNED if old_enough else UNFINALIZED_TTL
+        return DEFAULT_TTL
+
+    def _block_scoped_ttl(self, params: Dict[str, Any], result: Any) -> float:
+        if result is None:
+            # Pending transaction or block not yet produced
+            return 0.0
+        tag = str(params.get("tag") or "").strip().lower()
+        if tag in MOVING_TAGS:
+            # The block behind the tag changes with the chain, even if it is final now
+            return UNFINALIZED_TTL
+        block = _parse_block(params.get("tag") or params.get("blockno"))
+        timestamp = None
+        if isinstance(result, dict):
+            if block is None:
+                block = _parse_block(result.get("blockNumber") or result.get("number"))
+            timestamp = _parse_block(result.get("timestamp") or result.get("timeStamp"))
+        if block is None:
+            return UNFINALIZED_TTL
+        chainid = str(params.get("chainid", "1"))
+        return PINNED if self.is_final(chainid, block, timestamp) else UNFINALIZED_TTL
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the current entry count and size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, configured from the environment."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache.from_env()
+    return _response_cache
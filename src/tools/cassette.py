@@ -0,0 +1,201 @@
+"""Record and replay of upstream HTTP exchanges for offline, repeatable runs."""
+
+import asyncio
+import base64
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, List, Optional
+
+import httpx
+
+from .cache import normalize_params
+from .diskcache import serialize_key
+
+
+RECORD = "record"
+REPLAY = "replay"
+# Replay what was recorded, record everything else
+AUTO = "auto"
+CASSETTE_MODES = (AUTO, RECORD, REPLAY)
+
+# Response headers worth keeping; the body is stored decoded, so no encodings
+KEPT_HEADERS = ("content-type", "retry-after")
+
+
+class CassetteMissError(httpx.RequestError):
+    """Raised in replay mode for a request that was never recorded."""
+    pass
+
+
+def cassette_key(params: Dict[str, Any]) -> str:
+    """Return the key a request is recorded under; the API key is not part of it."""
+    return serialize_key(normalize_params(params))
+
+
+class Cassette:
+    """
+    File of recorded upstream responses, one JSON object per line.
+
+    Responses are looked up by their normalized request parameters. A request
+    recorded several times (eg. the head block polled repeatedly) replays
+    its answers in the order they were recorded and then keeps repeating the
+    last one, so a replayed run sees the same sequence as the recorded run.
+    Paths ending in ``.gz`` are gzip-compressed. Recording starts a new file.
+    New interactions go through one writer kept open until ``aclose``, so a
+    session's lines share a single gzip stream.
+    """
+
+    def __init__(self, path: str, mode: str = AUTO):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {', '.join(CASSETTE_MODES)}")
+        self.path = os.path.expanduser(path)
+        self.mode = mode
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        # One writer thread keeps lines whole and in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="etherscan-cassette")
+        self._writer: Optional[IO[str]] = None
+        self.replayed = 0
+        self.recorded = 0
+        if mode == RECORD:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        else:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Build a cassette from ``ETHERSCAN_CASSETTE``/``ETHERSCAN_CASSETTE_MODE``; None when unset."""
+        path = os.getenv("ETHERSCAN_CASSETTE")
+        if not path:
+            return None
+        return cls(path, os.getenv("ETHERSCAN_CASSETTE_MODE", AUTO).lower())
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with self._open("r") as handle:
+            try:
+                for line in handle:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._interactions.setdefault(interaction["key"], []).append(interaction)
+            except EOFError:
+                # A session that was not closed leaves its gzip stream unterminated
+                pass
+
+    def _append(self, interaction: Dict[str, Any]) -> None:
+        if self._writer is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._writer = self._open("a")
+        self._writer.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+        # Flushed per line so that what was recorded survives a crash
+        self._writer.flush()
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def can_replay(self, params: Dict[str, Any]) -> bool:
+        """Return True if a request for ``params`` will be answered from the cassette."""
+        return self.mode != RECORD and cassette_key(params) in self._interactions
+
+    def play(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the next recorded interaction for ``key``, or None."""
+        interactions = self._interactions.get(key)
+        if not interactions:
+            return None
+        index = self._cursors.get(key, 0)
+        self._cursors[key] = min(index + 1, len(interactions) - 1)
+        self.replayed += 1
+        return interactions[index]
+
+    async def record(self, key: str, response: httpx.Response, content: bytes) -> Dict[str, Any]:
+        """Store a response under ``key`` and return the stored interaction."""
+        interaction: Dict[str, Any] = {
+            "key": key,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+        }
+        try:
+            interaction["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_b64"] = base64.b64encode(content).decode("ascii")
+        self._interactions.setdefault(key, []).append(interaction)
+        self._cursors[key] = len(self._interactions[key]) - 1
+        self.recorded += 1
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._append, interaction)
+        return interaction
+
+    async def aclose(self) -> None:
+        """Close the writer, ending the file (and its gzip stream)."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "requests": len(self._interactions),
+            "replayed": self.replayed,
+            "recorded": self.recorded,
+        }
+
+
+def _response(interaction: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+    if "body_b64" in interaction:
+        content = base64.b64decode(interaction["body_b64"])
+    else:
+        content = interaction["body"].encode("utf-8")
+    return httpx.Response(interaction["status"], headers=interaction["headers"], content=content, request=request)
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering from a ``Cassette`` and recording what it forwards."""
+
+    def __init__(self, cassette: Cassette, transport: httpx.AsyncBaseTransport):
+        self.cassette = cassette
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = cassette_key(dict(request.url.params))
+        if self.cassette.mode != RECORD:
+            interaction = self.cassette.play(key)
+            if interaction is not None:
+                return _response(interaction, request)
+            if self.cassette.mode == REPLAY:
+                raise CassetteMissError(f"No recorded response for {key}", request=request)
+
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        return _response(await self.cassette.record(key, response, content), request)
+
+    async def aclose(self) -> None:
+        await self.cassette.aclose()
+        await self.transport.aclose()
+
+
+_cassette: Optional[Cassette] = None
+_cassette_loaded = False
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Return the process-wide cassette configured from the environment, if any."""
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        _cassette = Cassette.from_env()
+        _cassette_loaded = True
+    return _cassette
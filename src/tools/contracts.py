@@ -1,14 +1,16 @@
 """Contract-related tools for Etherscan API."""
 
+from typing import Optional
 from mcp.server.fastmcp import FastMCP
-from .utils import api_call
+from .batching import fetch_contract_creations, split_addresses
+from .utils import api_call, format_response
 
 
 def register_contract_tools(server: FastMCP) -> None:
     """Register all contract-related tools with the server."""
     
     @server.tool()
-    def contract_getabi(address: str, chainid: str = "1") -> str:
+    async def contract_getabi(address: str, chainid: str = "1") -> str:
         """Returns the Contract Application Binary Interface (ABI) of a verified smart contract.
         
         Args:
@@ -21,10 +23,10 @@ def register_contract_tools(server: FastMCP) -> None:
             "address": address,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def contract_getsourcecode(address: str, chainid: str = "1") -> str:
+    async def contract_getsourcecode(address: str, chainid: str = "1") -> str:
         """Returns the Contract Source Code for Verified Contract Source Codes.
         
         Args:
@@ -37,26 +39,22 @@ def register_contract_tools(server: FastMCP) -> None:
             "address": address,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def contract_getcontractcreation(contractaddresses: str, chainid: str = "1") -> str:
+    async def contract_getcontractcreation(contractaddresses: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the Contract Creator and Creation Tx Hash.
         
         Args:
-            contractaddresses: The contract address to check for contract creator and creation tx hash, up to 5 at a time
+            contractaddresses: The contract addresses to check for contract creator and creation tx hash, separated by `,`
+                    any number of addresses, fetched in parallel chunks of 5
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
-        params = {
-            "module": "contract",
-            "action": "getcontractcreation",
-            "contractaddresses": contractaddresses,
-            "chainid": chainid
-        }
-        return api_call(params)
+        return format_response(await fetch_contract_creations(split_addresses(contractaddresses), chainid), output_format)
     
     @server.tool()
-    def contract_checkverifystatus(guid: str, chainid: str = "1") -> str:
+    async def contract_checkverifystatus(guid: str, chainid: str = "1") -> str:
         """Returns the success or error status of a contract verification request.
         
         Args:
@@ -69,4 +67,4 @@ def register_contract_tools(server: FastMCP) -> None:
             "guid": guid,
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params)
\ No newline at end of file
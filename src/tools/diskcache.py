@@ -0,0 +1,176 @@
+"""Persistent SQLite store for immutable Etherscan responses."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+
+DEFAULT_MAX_MB = 512.0
+DEFAULT_MAINTENANCE_INTERVAL = 300.0
+
+# Evict down to this fraction of the cap so we do not thrash at the limit
+EVICTION_TARGET = 0.9
+
+# Only refresh the access time of an entry this often to keep reads read-only
+TOUCH_INTERVAL = 3600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def serialize_key(key: Tuple[Tuple[str, str], ...]) -> str:
+    """Turn a normalized parameter tuple into a stable text key."""
+    return "&".join(f"{name}={value}" for name, value in key)
+
+
+class PersistentCache:
+    """
+    SQLite-backed cache shared by every server process on the host.
+
+    The database runs in WAL mode so concurrent readers never block each
+    other. All SQLite work happens on a single worker thread to keep the
+    event loop free. Values are stored zlib-compressed; ``maintain`` evicts
+    least-recently used rows once the store exceeds its size cap.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="etherscan-diskcache")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["PersistentCache"]:
+        """Build a store from ``ETHERSCAN_CACHE_DB``; returns None when unset."""
+        path = os.getenv("ETHERSCAN_CACHE_DB")
+        if not path:
+            return None
+        max_mb = float(os.getenv("ETHERSCAN_CACHE_DB_MAX_MB", DEFAULT_MAX_MB))
+        return cls(path, int(max_mb * 1024 * 1024))
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            # auto_vacuum must be chosen before the first table is created
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, accessed FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, accessed = row
+        now = time.time()
+        if now - accessed > TOUCH_INTERVAL:
+            with conn:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(value))
+
+    def _set(self, key: str, value: Any) -> None:
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+
+    def _scan(self, prefix: str, limit: int) -> List[Tuple[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT key, value FROM responses WHERE key >= ? AND key < ? LIMIT ?",
+            (prefix, prefix + "\uffff", limit),
+        )
+        return [(key, json.loads(zlib.decompress(value))) for key, value in rows]
+
+    def _maintain(self) -> int:
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            target = total - int(self.max_bytes * EVICTION_TARGET)
+            freed = 0
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed ASC"):
+                if freed >= target:
+                    break
+                victims.append((key,))
+                freed += size
+            with conn:
+                conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            evicted = len(victims)
+        conn.execute("PRAGMA incremental_vacuum")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return evicted
+
+    async def get(self, key: Tuple[Tuple[str, str], ...]) -> Optional[Any]:
+        """Return the stored value for ``key``, or None."""
+        try:
+            return await self._run(self._get, serialize_key(key))
+        except (sqlite3.Error, ValueError, zlib.error):
+            return None
+
+    async def set(self, key: Tuple[Tuple[str, str], ...], value: Any) -> None:
+        """Persist ``value`` under ``key``; storage errors are ignored."""
+        try:
+            await self._run(self._set, serialize_key(key), value)
+        except sqlite3.Error:
+            pass
+
+    async def scan(self, prefix: str, limit: int = 10000) -> List[Tuple[str, Any]]:
+        """Return up to ``limit`` stored ``(key, value)`` pairs whose key starts with ``prefix``."""
+        try:
+            return await self._run(self._scan, prefix, limit)
+        except (sqlite3.Error, ValueError, zlib.error):
+            return []
+
+    async def maintain(self) -> int:
+        """
+        Enforce the size cap and reclaim free pages.
+
+        Returns:
+            Number of entries evicted
+        """
+        try:
+            return await self._run(self._maintain)
+        except sqlite3.Error:
+            return 0
+
+    async def run_maintenance(self, interval: float = DEFAULT_MAINTENANCE_INTERVAL) -> None:
+        """Run ``maintain`` forever, every ``interval`` seconds."""
+        while True:
+            await self.maintain()
+            await asyncio.sleep(interval)
+
+    def close(self) -> None:
+        """Close the database connection and stop the worker thread."""
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._executor.submit(_close).result()
+        self._executor.shutdown(wait=True)
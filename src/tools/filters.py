@@ -0,0 +1,109 @@
+"""Server-side field projection and row filtering for list results."""
+
+from typing import Any, List, Optional, Sequence
+
+
+def _split(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(str(value), 0) if str(value).startswith("0x") else int(str(value))
+    except ValueError:
+        return None
+
+
+def _bound(name: str, value: Optional[str]) -> Optional[int]:
+    if value is None or str(value).strip() == "":
+        return None
+    bound = _to_int(str(value).strip())
+    if bound is None:
+        raise ValueError(f"{name} must be an integer amount in wei, got {value!r}")
+    return bound
+
+
+class RowFilter:
+    """
+    Predicates and a field projection applied to list results before serialization.
+
+    Every predicate that is set must match for a row to be kept. Rows that
+    are not objects, and results that are not lists, pass through untouched.
+    A ``min_value``/``max_value`` that is not an integer raises ValueError.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[str] = None,
+        min_value: Optional[str] = None,
+        max_value: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        method_id: Optional[str] = None,
+        is_error: Optional[str] = None,
+    ):
+        self.fields = _split(fields)
+        self.min_value = _bound("min_value", min_value)
+        self.max_value = _bound("max_value", max_value)
+        self.counterparties = {address.lower() for address in _split(counterparty)}
+        self.method_id = method_id.lower() if method_id else None
+        self.is_error = str(is_error) if is_error is not None and is_error != "" else None
+
+    @property
+    def active(self) -> bool:
+        """True if the filter would change any result."""
+        return bool(
+            self.fields
+            or self.min_value is not None
+            or self.max_value is not None
+            or self.counterparties
+            or self.method_id
+            or self.is_error is not None
+        )
+
+    def matches(self, row: Any) -> bool:
+        """Return True if ``row`` satisfies every configured predicate."""
+        if not isinstance(row, dict):
+            return True
+        if self.min_value is not None or self.max_value is not None:
+            value = _to_int(row.get("value", ""))
+            if value is None:
+                return False
+            if self.min_value is not None and value < self.min_value:
+                return False
+            if self.max_value is not None and value > self.max_value:
+                return False
+        if self.counterparties:
+            parties = {str(row.get("from", "")).lower(), str(row.get("to", "")).lower()}
+            if not parties & self.counterparties:
+                return False
+        if self.method_id:
+            method = str(row.get("methodId") or str(row.get("input", ""))[:10]).lower()
+            if method != self.method_id:
+                return False
+        if self.is_error is not None and str(row.get("isError", "0")) != self.is_error:
+            return False
+        return True
+
+    def project(self, row: Any, keep: Sequence[str] = ()) -> Any:
+        """Keep only the configured fields of ``row``, and any of ``keep`` it has."""
+        if not self.fields or not isinstance(row, dict):
+            return row
+        projected = {field: row[field] for field in self.fields if field in row}
+        for field in keep:
+            if field in row and field not in projected:
+                projected[field] = row[field]
+        return projected
+
+    def select(self, result: Any) -> Any:
+        """Drop the rows of a list result that fail a predicate, without projecting."""
+        if not self.active or not isinstance(result, list):
+            return result
+        return [row for row in result if self.matches(row)]
+
+    def apply(self, result: Any) -> Any:
+        """Filter and project a list result; other results are returned as is."""
+        if not self.active or not isinstance(result, list):
+            return result
+        return [self.project(row) for row in result if self.matches(row)]
@@ -1,5 +1,6 @@
 """Gas-related tools for Etherscan API."""
 
+from typing import Optional
 from mcp.server.fastmcp import FastMCP
 from .utils import api_call
 
@@ -8,7 +9,7 @@ def register_gas_tools(server: FastMCP) -> None:
     """Register all gas-related tools with the server."""
     
     @server.tool()
-    def gas_gasestimate(gasprice: str, chainid: str = "1") -> str:
+    async def gas_gasestimate(gasprice: str, chainid: str = "1") -> str:
         """Returns the estimated time, in seconds, for a transaction to be confirmed on the blockchain.
         
         Args:
@@ -21,10 +22,10 @@ def register_gas_tools(server: FastMCP) -> None:
             "gasprice": gasprice,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def gas_gasoracle(chainid: str = "1") -> str:
+    async def gas_gasoracle(chainid: str = "1") -> str:
         """Returns the current Safe, Proposed and Fast gas prices.
         
         Args:
@@ -35,10 +36,10 @@ def register_gas_tools(server: FastMCP) -> None:
             "action": "gasoracle",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def stats_dailyavggaslimit(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailyavggaslimit(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the historical daily average gas limit of the Ethereum network.
         
         Args:
@@ -46,6 +47,7 @@ def register_gas_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -55,4 +57,4 @@ def register_gas_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params, output_format)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Hedged requests for idempotent reads, cutting the slow latency tail."""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .keypool import get_key_pool
+
+
+# Read-only actions whose duplicate requests are harmless; all proxy reads qualify
+HEDGEABLE_MODULES = {"proxy"}
+HEDGEABLE_ACTIONS = {
+    ("contract", "getabi"),
+    ("contract", "getsourcecode"),
+    ("contract", "getcontractcreation"),
+    ("transaction", "getstatus"),
+    ("transaction", "gettxreceiptstatus"),
+}
+# Proxy actions that change state must never be sent twice
+UNHEDGEABLE_ACTIONS = {("proxy", "eth_sendRawTransaction")}
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+# Used until enough latencies have been observed
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 5.0
+LATENCY_WINDOW = 256
+MIN_SAMPLES = 20
+
+
+def is_hedgeable(params: Dict[str, Any]) -> bool:
+    """Return True if duplicate requests for ``params`` are safe."""
+    action = (params.get("module"), params.get("action"))
+    if action in UNHEDGEABLE_ACTIONS:
+        return False
+    return action[0] in HEDGEABLE_MODULES or action in HEDGEABLE_ACTIONS
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies for one kind of request."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return the ``percent``-th percentile, or None with too few samples."""
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(percent / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class Hedger:
+    """
+    Sends a second copy of a slow idempotent request and keeps the first answer.
+
+    The hedge fires once the first attempt has been running longer than the
+    configured latency percentile for that action (so roughly one request in
+    twenty is hedged at p95). Hedges go through the same key pool and rate
+    limiter as any request, and are skipped when no key has spare budget, so
+    they never queue behind real work. The slower attempt is cancelled.
+    """
+
+    def __init__(self, percentile: float = DEFAULT_HEDGE_PERCENTILE):
+        self.percentile = percentile
+        self._latency: Dict[Tuple[Any, Any], LatencyTracker] = {}
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_env(cls) -> "Hedger":
+        """Build a hedger from ``ETHERSCAN_HEDGE_PERCENTILE``; 0 disables hedging."""
+        return cls(float(os.getenv("ETHERSCAN_HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE)))
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0
+
+    def _tracker(self, params: Dict[str, Any]) -> LatencyTracker:
+        action = (params.get("module"), params.get("action"))
+        tracker = self._latency.get(action)
+        if tracker is None:
+            tracker = self._latency[action] = LatencyTracker()
+        return tracker
+
+    def delay(self, params: Dict[str, Any]) -> float:
+        """Return how long to wait for the first attempt before hedging."""
+        threshold = self._tracker(params).percentile(self.percentile)
+        if threshold is None:
+            return DEFAULT_HEDGE_DELAY
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, threshold))
+
+    async def _timed(self, params: Dict[str, Any], attempt: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        result = await attempt()
+        self._tracker(params).add(time.monotonic() - started)
+        return result
+
+    async def run(self, params: Dict[str, Any], attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``attempt()``, hedging it with a second call if it is slow."""
+        if not self.enabled or not is_hedgeable(params):
+            return await attempt()
+
+        first = asyncio.ensure_future(self._timed(params, attempt))
+        second: Optional["asyncio.Future[Any]"] = None
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.delay(params))
+            if done or not get_key_pool().has_spare_capacity():
+                return await first
+
+            self.hedges += 1
+            second = asyncio.ensure_future(self._timed(params, attempt))
+            done, pending = await asyncio.wait({first, second}, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in done if task.exception() is None), None)
+            if winner is None and pending:
+                # The first answer was an error; the other attempt may still succeed
+                winner = (await asyncio.wait(pending))[0].pop()
+            if winner is None:
+                winner = done.pop()
+            if winner is second and winner.exception() is None:
+                self.hedge_wins += 1
+            return winner.result()
+        finally:
+            for task in (first, second):
+                if task is not None and not task.done():
+                    task.cancel()
+
+
+_hedger: Optional[Hedger] = None
+
+
+def get_hedger() -> Hedger:
+    """Return the process-wide hedger, configured from the environment."""
+    global _hedger
+    if _hedger is None:
+        _hedger = Hedger.from_env()
+    return _hedger
@@ -0,0 +1,307 @@
+"""Incremental local index of per-address transaction history."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from .filters import RowFilter
+from .pagination import VOLATILE_FIELDS, ResultTruncatedError, fetch_all_records, resolve_block
+from .utils import EtherscanAPIError, format_response
+
+
+# account actions that can be indexed per address
+INDEX_KINDS = ("txlist", "txlistinternal", "tokentx", "tokennfttx", "token1155tx")
+DEFAULT_SYNC_KINDS = "txlist,txlistinternal,tokentx"
+
+DEFAULT_INDEX_DB = "~/.cache/etherscan-mcp/index.sqlite3"
+
+# Blocks below the last synced block that are re-fetched to absorb reorgs
+DEFAULT_CONFIRMATIONS = 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    chainid TEXT NOT NULL,
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    last_block INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (chainid, address, kind)
+);
+CREATE TABLE IF NOT EXISTS records (
+    chainid TEXT NOT NULL,
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_block ON records (chainid, address, kind, block);
+"""
+
+
+class AddressIndexer:
+    """
+    Local store of each watched address's history with its last synced block.
+
+    A sync only asks Etherscan for ``startblock = last_synced + 1`` onwards,
+    minus a short confirmation window that is dropped and re-fetched so that
+    reorgs near the head are corrected. Queries are answered from SQLite.
+    """
+
+    def __init__(self, path: str, confirmations: int = DEFAULT_CONFIRMATIONS):
+        self.path = os.path.expanduser(path)
+        self.confirmations = confirmations
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="etherscan-indexer")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+
+    @classmethod
+    def from_env(cls) -> "AddressIndexer":
+        """Build an indexer from ``ETHERSCAN_INDEX_DB``/``ETHERSCAN_INDEX_CONFIRMATIONS``."""
+        path = os.getenv("ETHERSCAN_INDEX_DB") or DEFAULT_INDEX_DB
+        confirmations = int(os.getenv("ETHERSCAN_INDEX_CONFIRMATIONS", DEFAULT_CONFIRMATIONS))
+        return cls(path, confirmations)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _last_block(self, chainid: str, address: str, kind: str) -> Optional[int]:
+        row = self._connect().execute(
+            "SELECT last_block FROM sync_state WHERE chainid = ? AND address = ? AND kind = ?",
+            (chainid, address, kind),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _replace_from(
+        self, chainid: str, address: str, kind: str, start: int, last_block: int, rows: List[Dict[str, Any]]
+    ) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "DELETE FROM records WHERE chainid = ? AND address = ? AND kind = ? AND block >= ?",
+                (chainid, address, kind, start),
+            )
+            conn.executemany(
+                "INSERT INTO records (chainid, address, kind, block, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        chainid,
+                        address,
+                        kind,
+                        int(row.get("blockNumber", 0)),
+                        json.dumps({k: v for k, v in row.items() if k not in VOLATILE_FIELDS}, separators=(",", ":")),
+                    )
+                    for row in rows
+                ],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (chainid, address, kind, last_block, updated) VALUES (?, ?, ?, ?, ?)",
+                (chainid, address, kind, last_block, time.time()),
+            )
+
+    def _query(
+        self, chainid: str, address: str, kind: str, start: int, end: int, descending: bool
+    ) -> List[Dict[str, Any]]:
+        order = "DESC" if descending else "ASC"
+        cursor = self._connect().execute(
+            "SELECT data FROM records WHERE chainid = ? AND address = ? AND kind = ? AND block BETWEEN ? AND ? "
+            f"ORDER BY block {order}, rowid {order}",
+            (chainid, address, kind, start, end),
+        )
+        return [json.loads(data) for (data,) in cursor]
+
+    def _status(self, chainid: Optional[str]) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        query = (
+            "SELECT s.chainid, s.address, s.kind, s.last_block, s.updated, "
+            "(SELECT COUNT(*) FROM records r WHERE r.chainid = s.chainid AND r.address = s.address AND r.kind = s.kind) "
+            "FROM sync_state s"
+        )
+        args: Tuple[Any, ...] = ()
+        if chainid:
+            query += " WHERE s.chainid = ?"
+            args = (chainid,)
+        return [
+            {
+                "chainid": row[0],
+                "address": row[1],
+                "kind": row[2],
+                "last_synced_block": row[3],
+                "updated": int(row[4]),
+                "records": row[5],
+            }
+            for row in conn.execute(query + " ORDER BY s.chainid, s.address, s.kind", args)
+        ]
+
+    async def sync(self, address: str, kind: str, chainid: str = "1") -> Dict[str, int]:
+        """
+        Bring the local history of ``address`` up to the current head.
+
+        Histories longer than one ``fetch_all_records`` call are fetched and
+        stored in chunks of whole blocks; the synced block only advances
+        past blocks whose records have all been stored.
+
+        Returns:
+            ``{"fetched": ..., "from_block": ..., "last_synced_block": ...}``
+        """
+        if kind not in INDEX_KINDS:
+            raise EtherscanAPIError(f"Unknown index kind {kind!r}, expected one of {', '.join(INDEX_KINDS)}")
+        address = address.lower()
+        lock = self._locks.setdefault((chainid, address, kind), asyncio.Lock())
+        async with lock:
+            last = await self._run(self._last_block, chainid, address, kind)
+            head = await resolve_block("latest", chainid)
+            start = 0 if last is None else max(0, last + 1 - self.confirmations)
+            if last is not None and start > head:
+                return {"fetched": 0, "from_block": start, "last_synced_block": last}
+            query = {
+                "module": "account",
+                "action": kind,
+                "address": address,
+                "endblock": str(head),
+                "sort": "asc",
+                "chainid": chainid,
+            }
+            from_block, fetched = start, 0
+            while True:
+                # A history too long for one fetch is stored block-complete chunk by chunk
+                try:
+                    rows = await fetch_all_records(dict(query, startblock=str(start)))
+                    end = head
+                except ResultTruncatedError as e:
+                    rows, end = e.records, e.next_startblock - 1
+                await self._run(self._replace_from, chainid, address, kind, start, end, rows)
+                fetched += len(rows)
+                if end >= head:
+                    break
+                start = end + 1
+            return {"fetched": fetched, "from_block": from_block, "last_synced_block": head}
+
+    async def query(
+        self,
+        address: str,
+        kind: str,
+        chainid: str = "1",
+        startblock: int = 0,
+        endblock: int = 99999999,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return indexed records for ``address`` within a block range."""
+        return await self._run(self._query, chainid, address.lower(), kind, startblock, endblock, descending)
+
+    async def status(self, chainid: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the watched addresses with their sync state."""
+        return await self._run(self._status, chainid)
+
+
+_indexer: Optional[AddressIndexer] = None
+
+
+def get_indexer() -> AddressIndexer:
+    """Return the process-wide address indexer, configured from the environment."""
+    global _indexer
+    if _indexer is None:
+        _indexer = AddressIndexer.from_env()
+    return _indexer
+
+
+def register_indexer_tools(server: FastMCP) -> None:
+    """Register all local indexer tools with the server."""
+
+    @server.tool()
+    async def index_sync(address: str, kinds: str = DEFAULT_SYNC_KINDS, chainid: str = "1") -> str:
+        """Adds an address to the local index, or fetches only what is new since its last sync.
+
+        Args:
+            address: The string representing the address to index
+            kinds: The histories to sync, separated by `,`, from `txlist`, `txlistinternal`, `tokentx`, `tokennfttx`, `token1155tx`
+            chainid: The chain id, default is 1
+        """
+        indexer = get_indexer()
+        names = [kind.strip() for kind in kinds.split(",") if kind.strip()]
+        results = await asyncio.gather(*(indexer.sync(address, kind, chainid) for kind in names))
+        return format_response(dict(zip(names, results)))
+
+    @server.tool()
+    async def index_query(
+        address: str,
+        kind: str = "txlist",
+        startblock: str = "0",
+        endblock: str = "99999999",
+        page: str = "1",
+        offset: str = "100",
+        sort: str = "asc",
+        chainid: str = "1",
+        sync: bool = True,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        min_value: Optional[str] = None,
+        max_value: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        method_id: Optional[str] = None,
+        is_error: Optional[str] = None
+    ) -> str:
+        """Returns an address's history from the local index, syncing only new blocks first.
+
+        Args:
+            address: The string representing the address to query
+            kind: The history to query, one of `txlist`, `txlistinternal`, `tokentx`, `tokennfttx`, `token1155tx`
+            startblock: The integer block number to start searching for transactions
+            endblock: The integer block number to stop searching for transactions
+            page: The integer page number of the filtered results
+            offset: The number of records displayed per page, `0` for all
+            sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
+            chainid: The chain id, default is 1
+            sync: When true, fetch blocks added since the last sync before answering
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each record, eg. `hash,from,to,value,blockNumber`
+            min_value: Only return records whose `value` is at least this amount (in wei, or token units for token transfers)
+            max_value: Only return records whose `value` is at most this amount (in wei, or token units for token transfers)
+            counterparty: Only return records sent from or to this address, separated by `,` for several
+            method_id: Only return transactions calling this 4-byte method id, eg. `0xa9059cbb`
+            is_error: Only return records with this `isError` flag, `0` for successful or `1` for failed
+        """
+        indexer = get_indexer()
+        if sync:
+            await indexer.sync(address, kind, chainid)
+        rows = await indexer.query(address, kind, chainid, int(startblock), int(endblock), sort.lower() == "desc")
+        row_filter = RowFilter(
+            fields=fields,
+            min_value=min_value,
+            max_value=max_value,
+            counterparty=counterparty,
+            method_id=method_id,
+            is_error=is_error,
+        )
+        rows = row_filter.apply(rows)
+        size = int(offset)
+        if size > 0:
+            first = (max(1, int(page)) - 1) * size
+            rows = rows[first:first + size]
+        return format_response(rows, output_format)
+
+    @server.tool()
+    async def index_status(chainid: Optional[str] = None) -> str:
+        """Returns the addresses in the local index with their last synced block and record count.
+
+        Args:
+            chainid: Only list addresses on this chain id, default all chains
+        """
+        return format_response(await get_indexer().status(chainid))
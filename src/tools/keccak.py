@@ -0,0 +1,77 @@
+"""Keccak-256 as used by Ethereum, with pycryptodome used when installed."""
+
+try:
+    from Crypto.Hash import keccak as _crypto_keccak
+except ImportError:
+    _crypto_keccak = None
+
+
+_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+
+_ROTATIONS = [
+    [0, 36, 3, 41, 18],
+    [1, 44, 10, 45, 2],
+    [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56],
+    [27, 20, 39, 8, 14],
+]
+
+_MASK = (1 << 64) - 1
+# Keccak-256 absorbs 136 bytes per permutation
+_RATE = 136
+
+
+def _rotl(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (64 - shift))) & _MASK if shift else value
+
+
+def _keccak_f(state: list) -> None:
+    for constant in _ROUND_CONSTANTS:
+        # theta
+        columns = [state[x][0] ^ state[x][1] ^ state[x][2] ^ state[x][3] ^ state[x][4] for x in range(5)]
+        for x in range(5):
+            d = columns[(x - 1) % 5] ^ _rotl(columns[(x + 1) % 5], 1)
+            for y in range(5):
+                state[x][y] ^= d
+        # rho and pi
+        moved = [[0] * 5 for _ in range(5)]
+        for x in range(5):
+            for y in range(5):
+                moved[y][(2 * x + 3 * y) % 5] = _rotl(state[x][y], _ROTATIONS[x][y])
+        # chi
+        for x in range(5):
+            for y in range(5):
+                state[x][y] = moved[x][y] ^ (~moved[(x + 1) % 5][y] & moved[(x + 2) % 5][y])
+        # iota
+        state[0][0] ^= constant
+
+
+def _keccak256_python(data: bytes) -> bytes:
+    # Original Keccak padding (0x01), not the SHA-3 domain byte (0x06)
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b"\x00" * (-len(padded) % _RATE))
+    padded[-1] |= 0x80
+
+    state = [[0] * 5 for _ in range(5)]
+    for start in range(0, len(padded), _RATE):
+        block = padded[start:start + _RATE]
+        for i in range(_RATE // 8):
+            state[i % 5][i // 5] ^= int.from_bytes(block[i * 8:i * 8 + 8], "little")
+        _keccak_f(state)
+
+    return b"".join(state[i % 5][i // 5].to_bytes(8, "little") for i in range(4))
+
+
+def keccak256(data: bytes) -> bytes:
+    """Return the Keccak-256 digest of ``data``."""
+    if _crypto_keccak is not None:
+        return _crypto_keccak.new(digest_bits=256, data=data).digest()
+    return _keccak256_python(data)
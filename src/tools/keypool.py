@@ -0,0 +1,156 @@
+"""Pool of Etherscan API keys with per-key quota accounting."""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from .ratelimit import QuotaExhaustedError, RateLimiter, get_rate_limiter
+
+
+# How long a key is taken out of rotation after an upstream complaint
+RATE_LIMIT_COOLDOWN = 1.0
+INVALID_KEY_COOLDOWN = 300.0
+
+# Longest we are willing to wait for a cooled-down key before giving up
+MAX_COOLDOWN_WAIT = 5.0
+
+
+class NoApiKeyAvailableError(Exception):
+    """Raised when no configured API key can currently serve a request."""
+    pass
+
+
+def classify_error_message(message: str) -> Optional[str]:
+    """
+    Classify an Etherscan error message as a key-related failure.
+
+    Returns:
+        ``"rate_limit"``, ``"invalid_key"`` or None for unrelated errors
+    """
+    lowered = message.lower()
+    if "rate limit" in lowered:
+        return "rate_limit"
+    if "invalid api key" in lowered or "missing/invalid api key" in lowered:
+        return "invalid_key"
+    return None
+
+
+def load_api_keys() -> List[str]:
+    """
+    Read API keys from ``ETHERSCAN_API_KEYS`` (comma separated) and ``ETHERSCAN_API_KEY``.
+
+    Duplicates are dropped while preserving order.
+    """
+    raw = [os.getenv("ETHERSCAN_API_KEYS", ""), os.getenv("ETHERSCAN_API_KEY", "")]
+    keys: List[str] = []
+    for entry in raw:
+        for key in entry.split(","):
+            key = key.strip()
+            if key and key not in keys:
+                keys.append(key)
+    return keys
+
+
+class ApiKeyPool:
+    """
+    Spread requests over several API keys, least-loaded first.
+
+    Each key has its own token bucket and daily quota in the shared
+    ``RateLimiter``. Keys that Etherscan rejects are put on a cooldown and
+    skipped until it expires.
+    """
+
+    def __init__(self, keys: List[str], limiter: Optional[RateLimiter] = None):
+        self.keys = list(keys)
+        self.limiter = limiter or get_rate_limiter()
+        self._cooldown_until: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "ApiKeyPool":
+        """Build a pool from the keys configured in the environment."""
+        return cls(load_api_keys())
+
+    def _active_keys(self) -> List[str]:
+        now = time.monotonic()
+        return [key for key in self.keys if self._cooldown_until.get(key, 0.0) <= now]
+
+    def _load_score(self, key: str):
+        limits = self.limiter.limits(key)
+        daily_remaining = limits.daily.remaining()
+        # Prefer keys with spare per-second tokens and nobody queued, then daily headroom
+        headroom = limits.bucket.available() - limits.waiting
+        return (daily_remaining > 0, headroom, daily_remaining)
+
+    def select(self) -> Optional[str]:
+        """Return the least-loaded key that is in rotation, or None."""
+        active = self._active_keys()
+        if not active:
+            return None
+        return max(active, key=self._load_score)
+
+    def has_spare_capacity(self) -> bool:
+        """True if some key in rotation could send a request right now without queueing."""
+        for key in self._active_keys():
+            limits = self.limiter.limits(key)
+            if limits.waiting == 0 and limits.bucket.available() >= 1.0 and limits.daily.remaining() > 0:
+                return True
+        return False
+
+    async def acquire(self) -> str:
+        """
+        Pick a key and wait for its rate budget.
+
+        Returns:
+            The API key to use for the next request
+
+        Raises:
+            NoApiKeyAvailableError: If no key is configured or all are exhausted
+        """
+        if not self.keys:
+            raise NoApiKeyAvailableError("ETHERSCAN_API_KEY environment variable is not set")
+
+        while True:
+            key = self.select()
+            if key is None:
+                wait = min(self._cooldown_until.values()) - time.monotonic()
+                if wait > MAX_COOLDOWN_WAIT:
+                    raise NoApiKeyAvailableError("All Etherscan API keys are rate limited or invalid")
+                await asyncio.sleep(max(0.0, wait))
+                continue
+            try:
+                await self.limiter.acquire(key)
+                return key
+            except QuotaExhaustedError:
+                limits = self.limiter.limits(key)
+                self._cooldown_until[key] = time.monotonic() + (limits.daily.resets_at - time.time())
+
+    def report_error(self, key: str, kind: str) -> None:
+        """Take ``key`` out of rotation after a ``rate_limit`` or ``invalid_key`` error."""
+        cooldown = INVALID_KEY_COOLDOWN if kind == "invalid_key" else RATE_LIMIT_COOLDOWN
+        self._cooldown_until[key] = max(self._cooldown_until.get(key, 0.0), time.monotonic() + cooldown)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-key budget and cooldown state, with keys anonymised."""
+        now = time.monotonic()
+        snapshot = {}
+        for index, key in enumerate(self.keys):
+            limits = self.limiter.limits(key)
+            snapshot[f"key{index}"] = {
+                "queued": limits.waiting,
+                "tokens": round(limits.bucket.available(), 3),
+                "daily_remaining": limits.daily.remaining(),
+                "cooldown": round(max(0.0, self._cooldown_until.get(key, 0.0) - now), 3),
+            }
+        return snapshot
+
+
+_key_pool: Optional[ApiKeyPool] = None
+
+
+def get_key_pool() -> ApiKeyPool:
+    """Return the process-wide API key pool, configured from the environment."""
+    global _key_pool
+    if _key_pool is None:
+        _key_pool = ApiKeyPool.from_env()
+    return _key_pool
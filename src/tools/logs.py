@@ -1,21 +1,29 @@
 """Logs-related tools for Etherscan API."""
 
+from functools import partial
 from typing import Optional
 from mcp.server.fastmcp import FastMCP
-from .utils import api_call
+from .abi import decode_logs
+from .filters import RowFilter
+from .pagination import scan_logs
+from .utils import api_call, render_result
 
 
 def register_logs_tools(server: FastMCP) -> None:
     """Register all logs-related tools with the server."""
     
     @server.tool()
-    def logs_getLogsByAddress(
+    async def logs_getLogsByAddress(
         address: str,
         fromBlock: Optional[str] = None,
         toBlock: Optional[str] = None,
         page: str = "1",
         offset: str = "1000",
-        chainid: str = "1"
+        chainid: str = "1",
+        scan: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        decode: bool = False
     ) -> str:
         """Returns the event logs from an address, with optional filtering by block range.
         
@@ -26,6 +34,10 @@ def register_logs_tools(server: FastMCP) -> None:
             page: The integer page number, if pagination is enabled
             offset: The number of transactions displayed per page limited to **1000 records** per query
             chainid: The chain id, default is 1
+            scan: When true, ignore `page`/`offset` and return every log in the block range, fetched in parallel shards that are split further wherever they hit the 1000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each log, eg. `blockNumber,transactionHash,topics,data`
+            decode: When true, add a `decoded` field with the event signature and named arguments, using the emitting contract's verified ABI
         """
         params = {
             "module": "logs",
@@ -39,10 +51,14 @@ def register_logs_tools(server: FastMCP) -> None:
             params["fromBlock"] = fromBlock
         if toBlock:
             params["toBlock"] = toBlock
-        return api_call(params)
+        row_filter = RowFilter(fields=fields)
+        decoder = partial(decode_logs, chainid=chainid) if decode else None
+        if scan:
+            return await render_result(await scan_logs(params), output_format, row_filter, decoder)
+        return await api_call(params, output_format, row_filter, decoder)
     
     @server.tool()
-    def logs_getLogsByTopics(
+    async def logs_getLogsByTopics(
         fromBlock: str,
         toBlock: str,
         topic0: Optional[str] = None,
@@ -57,7 +73,11 @@ def register_logs_tools(server: FastMCP) -> None:
         topic1_3_opr: Optional[str] = None,
         page: Optional[str] = None,
         offset: Optional[str] = None,
-        chainid: str = "1"
+        chainid: str = "1",
+        scan: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        decode: bool = False
     ) -> str:
         """Returns the events log in a block range, filtered by topics.
         
@@ -77,6 +97,10 @@ def register_logs_tools(server: FastMCP) -> None:
             page: The integer page number, if pagination is enabled
             offset: The number of transactions displayed per page limited to **1000 records** per query
             chainid: The chain id, default is 1
+            scan: When true, ignore `page`/`offset` and return every log in the block range, fetched in parallel shards that are split further wherever they hit the 1000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each log, eg. `blockNumber,transactionHash,topics,data`
+            decode: When true, add a `decoded` field with the event signature and named arguments, using the emitting contract's verified ABI
         """
         params = {
             "module": "logs",
@@ -106,10 +130,14 @@ def register_logs_tools(server: FastMCP) -> None:
             if value is not None:
                 params[key] = value
                 
-        return api_call(params)
+        row_filter = RowFilter(fields=fields)
+        decoder = partial(decode_logs, chainid=chainid) if decode else None
+        if scan:
+            return await render_result(await scan_logs(params), output_format, row_filter, decoder)
+        return await api_call(params, output_format, row_filter, decoder)
     
     @server.tool()
-    def logs_getLogsByAddressAndTopics(
+    async def logs_getLogsByAddressAndTopics(
         fromBlock: str,
         toBlock: str,
         address: str,
@@ -125,7 +153,11 @@ def register_logs_tools(server: FastMCP) -> None:
         topic1_3_opr: Optional[str] = None,
         page: Optional[str] = None,
         offset: Optional[str] = None,
-        chainid: str = "1"
+        chainid: str = "1",
+        scan: bool = False,
+        output_format: Optional[str] = None,
+        fields: Optional[str] = None,
+        decode: bool = False
     ) -> str:
         """Returns the event logs from an address, filtered by topics and block range.
         
@@ -146,6 +178,10 @@ def register_logs_tools(server: FastMCP) -> None:
             page: The integer page number, if pagination is enabled
             offset: The number of transactions displayed per page limited to **1000 records** per query
             chainid: The chain id, default is 1
+            scan: When true, ignore `page`/`offset` and return every log in the block range, fetched in parallel shards that are split further wherever they hit the 1000 record limit
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+            fields: Comma-separated fields to keep in each log, eg. `blockNumber,transactionHash,topics,data`
+            decode: When true, add a `decoded` field with the event signature and named arguments, using the emitting contract's verified ABI
         """
         params = {
             "module": "logs",
@@ -176,4 +212,8 @@ def register_logs_tools(server: FastMCP) -> None:
             if value is not None:
                 params[key] = value
                 
-        return api_call(params)
\ No newline at end of file
+        row_filter = RowFilter(fields=fields)
+        decoder = partial(decode_logs, chainid=chainid) if decode else None
+        if scan:
+            return await render_result(await scan_logs(params), output_format, row_filter, decoder)
+        return await api_call(params, output_format, row_filter, decoder)
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""In-process metrics: counters and latency histograms with JSON and Prometheus output."""
+
+import asyncio
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from .cache import get_response_cache
+from .hedging import get_hedger
+from .ratelimit import get_rate_limiter
+from .resilience import OPEN, get_circuit_breakers
+from .singleflight import get_single_flight
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DEFAULT_DUMP_INTERVAL = 15.0
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return ``(upper_bound, count <= bound)`` pairs ending with +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != math.inf else self.bounds[-1]
+        return self.bounds[-1]
+
+
+class Metrics:
+    """
+    Registry of labelled counters, gauges and histograms.
+
+    Everything is updated from the event loop thread, so no locking is needed.
+    Gauges that describe other components (cache size, queue depth, circuit
+    state) are sampled when a snapshot is taken rather than kept up to date.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.help: Dict[str, str] = {}
+        self.started = time.time()
+
+    def describe(self, name: str, text: str) -> None:
+        self.help[name] = text
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Add ``value`` to the counter ``name`` with ``labels``."""
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record ``value`` in the histogram ``name`` with ``labels``."""
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def gauges(self) -> Dict[str, Dict[Labels, float]]:
+        """Sample gauges from the cache, limiter, key pool, hedger and breakers."""
+        cache = get_response_cache()
+        limiter = get_rate_limiter()
+        hedger = get_hedger()
+        cache_stats = cache.stats()
+        gauges: Dict[str, Dict[Labels, float]] = {
+            "etherscan_cache_entries": {(): float(cache_stats["entries"])},
+            "etherscan_cache_bytes": {(): float(cache_stats["bytes"])},
+            "etherscan_rate_limit_queue_depth": {(): float(limiter.queue_depth)},
+            "etherscan_singleflight_in_flight": {(): float(get_single_flight().in_flight)},
+            "etherscan_singleflight_shared": {(): float(get_single_flight().shared)},
+            "etherscan_hedges": {(): float(hedger.hedges)},
+            "etherscan_hedge_wins": {(): float(hedger.hedge_wins)},
+            "etherscan_key_daily_remaining": {},
+            "etherscan_circuit_open": {},
+        }
+        for key, stats in limiter.stats().items():
+            gauges["etherscan_key_daily_remaining"][_labels({"key": key})] = float(stats["daily_remaining"])
+        for partition, state in get_circuit_breakers().stats().items():
+            chainid, module = partition.split("/", 1)
+            labels = _labels({"chainid": chainid, "module": module})
+            gauges["etherscan_circuit_open"][labels] = 1.0 if state["state"] == OPEN else 0.0
+        return gauges
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every metric as plain JSON-serializable data."""
+        def label_dict(labels: Labels) -> Dict[str, str]:
+            return dict(labels)
+
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "counters": {
+                name: [{"labels": label_dict(labels), "value": value} for labels, value in series.items()]
+                for name, series in self.counters.items()
+            },
+            "histograms": {
+                name: [
+                    {
+                        "labels": label_dict(labels),
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 6),
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                    }
+                    for labels, histogram in series.items()
+                ]
+                for name, series in self.histograms.items()
+            },
+            "gauges": {
+                name: [{"labels": label_dict(labels), "value": value} for labels, value in series.items()]
+                for name, series in self.gauges().items()
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> None:
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for name, series in sorted(self.counters.items()):
+            header(name, "counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in sorted(self.histograms.items()):
+            header(name, "histogram")
+            for labels, histogram in series.items():
+                for bound, total in histogram.cumulative():
+                    bucket_labels = _format_labels(labels, ("le", _format_value(bound)))
+                    lines.append(f"{name}_bucket{bucket_labels} {total}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, series in sorted(self.gauges().items()):
+            header(name, "gauge")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    async def dump_periodically(self, path: str, interval: float = DEFAULT_DUMP_INTERVAL) -> None:
+        """Write the Prometheus text to ``path`` every ``interval`` seconds, atomically."""
+        path = os.path.expanduser(path)
+        while True:
+            temporary = f"{path}.tmp"
+            with open(temporary, "w") as handle:
+                handle.write(self.render_prometheus())
+            os.replace(temporary, path)
+            await asyncio.sleep(interval)
+
+
+def _describe_defaults(metrics: Metrics) -> None:
+    metrics.describe("etherscan_tool_calls_total", "MCP tool calls by tool and outcome")
+    metrics.describe("etherscan_tool_duration_seconds", "End-to-end MCP tool call latency")
+    metrics.describe("etherscan_request_duration_seconds", "Latency of make_api_request, cache hits included")
+    metrics.describe("etherscan_cache_lookups_total", "Response cache lookups by result (hit, miss, stale)")
+    metrics.describe("etherscan_upstream_requests_total", "HTTP requests sent to Etherscan by status code")
+    metrics.describe("etherscan_upstream_duration_seconds", "Latency of HTTP requests to Etherscan")
+    metrics.describe("etherscan_upstream_bytes_total", "Response bytes received from Etherscan")
+    metrics.describe("etherscan_rate_limit_wait_seconds", "Time spent waiting for an API key and rate budget")
+    metrics.describe("etherscan_retries_total", "Retried upstream attempts")
+    metrics.describe("etherscan_format_duration_seconds", "Time spent serializing tool results")
+    metrics.describe("etherscan_response_bytes_total", "Serialized tool result bytes by output format")
+
+
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+        _describe_defaults(_metrics)
+    return _metrics
+
+
+class InstrumentedFastMCP(FastMCP):
+    """``FastMCP`` that records the latency and outcome of every tool call."""
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        metrics = get_metrics()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await super().call_tool(name, arguments)
+            outcome = "ok"
+            return result
+        finally:
+            metrics.observe("etherscan_tool_duration_seconds", time.perf_counter() - started, tool=name)
+            metrics.inc("etherscan_tool_calls_total", tool=name, outcome=outcome)
+
+
+def register_metrics_resources(server: FastMCP) -> None:
+    """Expose the metrics registry as MCP resources."""
+
+    @server.resource("etherscan://metrics", mime_type="application/json")
+    def metrics_json() -> str:
+        """Counters, latency histograms (with p50/p99) and gauges of this server, as JSON."""
+        return json.dumps(get_metrics().snapshot(), separators=(",", ":"))
+
+    @server.resource("etherscan://metrics/prometheus", mime_type="text/plain")
+    def metrics_prometheus() -> str:
+        """Metrics of this server in the Prometheus text exposition format."""
+        return get_metrics().render_prometheus()
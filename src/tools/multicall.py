@@ -0,0 +1,202 @@
+"""Batched contract reads through Multicall3 ``aggregate3`` over the eth_call proxy."""
+
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .abi import decode_parameters
+from .utils import CircuitOpenError, EtherscanAPIError, TransientAPIError, gather_or_cancel, make_api_request
+
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# aggregate3((address,bool,bytes)[])
+AGGREGATE3_SELECTOR = "82ad56cb"
+
+# eth_call goes out as a GET query string, which keeps each request's calldata small
+DEFAULT_MAX_CALLDATA_BYTES = 3072
+DEFAULT_MAX_CALLS = 50
+
+# Failures of a whole aggregate call that a smaller batch can avoid (gas cap,
+# request or response size, a revert outside allowFailure's reach)
+SPLITTABLE_ERROR = re.compile(r"gas|revert|too (?:large|long|big)|size", re.IGNORECASE)
+
+_AGGREGATE3_RESULT = [{
+    "type": "tuple[]",
+    "components": [
+        {"name": "success", "type": "bool"},
+        {"name": "returnData", "type": "bytes"},
+    ],
+}]
+
+
+def _word(value: int) -> str:
+    return format(value, "064x")
+
+
+def _strip_hex(value: str) -> str:
+    value = value[2:] if value.lower().startswith("0x") else value
+    if len(value) % 2:
+        raise ValueError(f"Odd-length hex data: 0x{value}")
+    bytes.fromhex(value)
+    return value.lower()
+
+
+def encoded_size(data: str) -> int:
+    """Bytes one call with ``data`` adds to an ``aggregate3`` payload."""
+    length = len(data) // 2
+    # array offset + (target, allowFailure, bytes offset) + bytes length + padded bytes
+    return 32 + 96 + 32 + (length + 31) // 32 * 32
+
+
+def encode_aggregate3(calls: List[Tuple[str, str]]) -> str:
+    """ABI-encode ``aggregate3`` for ``(to, data)`` pairs, allowing each call to fail."""
+    heads = []
+    tails = []
+    offset = 32 * len(calls)
+    for to, data in calls:
+        heads.append(_word(offset))
+        length = len(data) // 2
+        padded = data + "0" * (-len(data) % 64)
+        tail = _word(int(to, 16)) + _word(1) + _word(96) + _word(length) + padded
+        tails.append(tail)
+        offset += len(tail) // 2
+    return "0x" + AGGREGATE3_SELECTOR + _word(32) + _word(len(calls)) + "".join(heads) + "".join(tails)
+
+
+def parse_calls(calls: str) -> List[Tuple[str, str]]:
+    """Parse ``to:data`` pairs separated by ``,`` into normalized ``(to, data)`` tuples."""
+    parsed = []
+    for item in calls.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        to, separator, data = item.partition(":")
+        if not separator:
+            raise EtherscanAPIError(f"Expected `to:data`, got {item!r}")
+        try:
+            to_hex = _strip_hex(to.strip())
+            data_hex = _strip_hex(data.strip())
+        except ValueError as e:
+            raise EtherscanAPIError(str(e))
+        if len(to_hex) != 40:
+            raise EtherscanAPIError(f"Invalid address {to.strip()!r}")
+        parsed.append(("0x" + to_hex, data_hex))
+    return parsed
+
+
+def plan_chunks(calls: List[Tuple[str, str]], max_bytes: int, max_calls: int) -> List[List[int]]:
+    """Group call indexes so each ``aggregate3`` payload stays within the limits."""
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    size = 0
+    for index, (_, data) in enumerate(calls):
+        cost = encoded_size(data)
+        if current and (size + cost > max_bytes or len(current) >= max_calls):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(index)
+        size += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class Multicaller:
+    """
+    Packs many ``(to, data)`` reads into concurrent ``aggregate3`` calls.
+
+    Each call is sent with ``allowFailure`` so one revert does not sink its
+    chunk. A chunk whose aggregate call fails as a whole for a reason a
+    smaller batch can avoid (gas cap, size limits, reverts) is split in half
+    and retried, down to single calls. Any other failure (a bad key, an open
+    circuit, rate limits, no Multicall3 on the chain) is raised at once.
+    """
+
+    def __init__(
+        self,
+        address: str = MULTICALL3_ADDRESS,
+        max_bytes: int = DEFAULT_MAX_CALLDATA_BYTES,
+        max_calls: int = DEFAULT_MAX_CALLS,
+    ):
+        self.address = address
+        self.max_bytes = max_bytes
+        self.max_calls = max_calls
+
+    @classmethod
+    def from_env(cls) -> "Multicaller":
+        """Build a multicaller from ``ETHERSCAN_MULTICALL_*`` environment variables."""
+        return cls(
+            os.getenv("ETHERSCAN_MULTICALL_ADDRESS") or MULTICALL3_ADDRESS,
+            int(os.getenv("ETHERSCAN_MULTICALL_MAX_BYTES", DEFAULT_MAX_CALLDATA_BYTES)),
+            int(os.getenv("ETHERSCAN_MULTICALL_MAX_CALLS", DEFAULT_MAX_CALLS)),
+        )
+
+    async def _aggregate(self, calls: List[Tuple[str, str]], tag: str, chainid: str) -> List[Dict[str, Any]]:
+        data = await make_api_request({
+            "module": "proxy",
+            "action": "eth_call",
+            "to": self.address,
+            "data": encode_aggregate3(calls),
+            "tag": tag,
+            "chainid": chainid,
+        })
+        result = data.get("result")
+        if result == "0x":
+            raise EtherscanAPIError(f"No Multicall3 contract at {self.address} on chain {chainid}")
+        if not isinstance(result, str) or not result.startswith("0x"):
+            error = data.get("error")
+            message = error.get("message") if isinstance(error, dict) else result
+            raise EtherscanAPIError(f"aggregate3 failed: {message}")
+        try:
+            (rows,) = decode_parameters(_AGGREGATE3_RESULT, bytes.fromhex(result[2:]))
+        except (ValueError, OverflowError) as e:
+            raise EtherscanAPIError(f"Malformed aggregate3 result: {e}")
+        if len(rows) != len(calls):
+            raise EtherscanAPIError("aggregate3 returned a different number of results")
+        return [{"success": row["success"], "returnData": row["returnData"]} for row in rows]
+
+    async def _run_chunk(self, calls: List[Tuple[str, str]], tag: str, chainid: str) -> List[Dict[str, Any]]:
+        try:
+            return await self._aggregate(calls, tag, chainid)
+        except (TransientAPIError, CircuitOpenError):
+            raise
+        except EtherscanAPIError as e:
+            if not SPLITTABLE_ERROR.search(str(e)):
+                raise
+            if len(calls) == 1:
+                return [{"success": False, "returnData": "0x", "error": str(e)}]
+        middle = len(calls) // 2
+        halves = await gather_or_cancel(
+            self._run_chunk(calls[:middle], tag, chainid),
+            self._run_chunk(calls[middle:], tag, chainid),
+        )
+        return halves[0] + halves[1]
+
+    async def call(self, calls: List[Tuple[str, str]], tag: str = "latest", chainid: str = "1") -> List[Dict[str, Any]]:
+        """
+        Execute ``(to, data)`` reads and return one result per call, in input order.
+
+        Returns:
+            ``[{"to": ..., "success": ..., "returnData": ...}, ...]``
+        """
+        chunks = plan_chunks(calls, self.max_bytes, self.max_calls)
+        outcomes = await gather_or_cancel(*(
+            self._run_chunk([calls[index] for index in chunk], tag, chainid) for chunk in chunks
+        ))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        for chunk, outcome in zip(chunks, outcomes):
+            for index, item in zip(chunk, outcome):
+                results[index] = {"to": calls[index][0], **item}
+        return results
+
+
+_multicaller: Optional[Multicaller] = None
+
+
+def get_multicaller() -> Multicaller:
+    """Return the process-wide multicaller, configured from the environment."""
+    global _multicaller
+    if _multicaller is None:
+        _multicaller = Multicaller.from_env()
+    return _multicaller
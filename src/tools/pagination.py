@@ -0,0 +1,241 @@
+"""Automatic pagination and block-range scanning for list-returning endpoints."""
+
+import os
+from typing import Any, Dict, List, Set, Tuple
+
+from .utils import EtherscanAPIError, gather_or_cancel, make_api_request
+
+
+# Etherscan rejects queries where page * offset exceeds this window
+MAX_RESULT_WINDOW = 10000
+
+DEFAULT_MAX_RECORDS = 200000
+
+
+# Row fields that change between fetches of the same record
+VOLATILE_FIELDS = {"confirmations"}
+
+
+def record_identity(record: Any) -> Any:
+    """Return a hashable identity for a result row, used to drop boundary duplicates."""
+    if isinstance(record, dict):
+        return tuple(sorted((key, str(value)) for key, value in record.items() if key not in VOLATILE_FIELDS))
+    return str(record)
+
+
+def _block_of(record: Dict[str, Any]) -> int:
+    return int(record.get("blockNumber", 0))
+
+
+class ResultTruncatedError(EtherscanAPIError):
+    """
+    Raised when more records match than may be collected at once.
+
+    ``records`` holds every record of the blocks before ``next_startblock``,
+    in ascending block order, so a caller can store them and resume there.
+    """
+
+    def __init__(self, message: str, records: List[Any], next_startblock: int):
+        super().__init__(message)
+        self.records = records
+        self.next_startblock = next_startblock
+
+
+def _boundary_identities(records: List[Any], block: int) -> Set[Tuple[int, Any]]:
+    """Identify the rows of ``block`` at the end of ``records`` by their position in the block and content."""
+    rows = []
+    for record in reversed(records):
+        if _block_of(record) != block:
+            break
+        rows.append(record)
+    rows.reverse()
+    return {(position, record_identity(record)) for position, record in enumerate(rows)}
+
+
+def _new_rows(batch: List[Any], block: int, seen: Set[Tuple[int, Any]]) -> List[Any]:
+    """Return the rows of ``batch`` not already collected from its first block, ``block``."""
+    if not seen:
+        return batch
+    rows = []
+    for position, record in enumerate(batch):
+        if _block_of(record) != block or (position, record_identity(record)) not in seen:
+            rows.append(record)
+    return rows
+
+
+async def fetch_all_records(params: Dict[str, Any], max_records: int = 0) -> List[Any]:
+    """
+    Fetch every record matching ``params``, walking past the 10,000-record window.
+
+    Each request asks for a full window in ascending block order. When a
+    window comes back full, the next one starts at the last block seen, and
+    rows from that boundary block that were already collected are dropped.
+    Those rows are matched by their position within the block as well as
+    their content, so identical rows (e.g. two transfers without a log
+    index) are both kept.
+
+    Args:
+        params: Request parameters for an account list action; ``page`` and
+            ``offset`` are managed here
+        max_records: Most records to collect (defaults to
+            ``ETHERSCAN_FETCH_ALL_MAX_RECORDS``)
+
+    Returns:
+        All records, in the order requested by ``params["sort"]``
+
+    Raises:
+        ResultTruncatedError: If more than ``max_records`` records match; it
+            carries the complete blocks collected and the block to resume from
+        EtherscanAPIError: If a single block holds more records than one window
+    """
+    if max_records <= 0:
+        max_records = int(os.getenv("ETHERSCAN_FETCH_ALL_MAX_RECORDS", DEFAULT_MAX_RECORDS))
+
+    descending = str(params.get("sort", "asc")).lower() == "desc"
+    window = dict(params, page="1", offset=str(MAX_RESULT_WINDOW), sort="asc")
+    startblock = int(params.get("startblock") or 0)
+
+    records: List[Any] = []
+    while True:
+        window["startblock"] = str(startblock)
+        data = await make_api_request(window)
+        batch = data.get("result") or []
+        if not isinstance(batch, list):
+            raise EtherscanAPIError(f"Unexpected result for paginated request: {batch}")
+
+        # Rows in the boundary block may already have been collected
+        records.extend(_new_rows(batch, startblock, _boundary_identities(records, startblock)))
+
+        if len(batch) < MAX_RESULT_WINDOW:
+            break
+        last_block = _block_of(batch[-1])
+        if last_block <= startblock:
+            raise EtherscanAPIError(
+                f"Block {startblock} holds more than {MAX_RESULT_WINDOW} records; "
+                "narrow the query to fetch it completely"
+            )
+        startblock = last_block
+        if len(records) > max_records:
+            break
+
+    if len(records) > max_records:
+        # Only whole blocks are returned: the block at the cut may be incomplete
+        cut_block = _block_of(records[max_records])
+        records = [record for record in records[:max_records] if _block_of(record) < cut_block]
+        if not records:
+            raise EtherscanAPIError(
+                f"Block {cut_block} holds more than {max_records} records; "
+                "raise ETHERSCAN_FETCH_ALL_MAX_RECORDS to fetch it completely"
+            )
+        raise ResultTruncatedError(
+            f"More than {max_records} records match; narrow the block range or resume from block {cut_block}",
+            records,
+            cut_block,
+        )
+    if descending:
+        records.reverse()
+    return records
+
+
+# getLogs returns at most this many records per request
+LOGS_PAGE_LIMIT = 1000
+
+DEFAULT_LOG_SHARDS = 8
+
+
+def _hex_int(value: Any) -> int:
+    """Parse a hex quantity as returned by getLogs ("0x" means zero)."""
+    value = str(value or "0x0")
+    if value in ("0x", ""):
+        return 0
+    return int(value, 16) if value.startswith("0x") else int(value)
+
+
+def log_sort_key(log: Dict[str, Any]):
+    """Order logs by (blockNumber, logIndex)."""
+    return (_hex_int(log.get("blockNumber")), _hex_int(log.get("logIndex")))
+
+
+async def resolve_block(value: Any, chainid: Any) -> int:
+    """Turn a block bound into an integer, looking up the head for ``latest``."""
+    block = str(value).strip().lower() if value is not None else "latest"
+    if block not in ("latest", "pending", ""):
+        return _hex_int(block) if block.startswith("0x") else int(block)
+    data = await make_api_request({"module": "proxy", "action": "eth_blockNumber", "chainid": chainid})
+    return _hex_int(data.get("result"))
+
+
+async def _fetch_log_range(params: Dict[str, Any], from_block: int, to_block: int) -> List[Dict[str, Any]]:
+    """Fetch one block range, splitting it in half whenever a response comes back full."""
+    query = dict(params, fromBlock=str(from_block), toBlock=str(to_block), page="1", offset=str(LOGS_PAGE_LIMIT))
+    logs = (await make_api_request(query)).get("result") or []
+    if len(logs) < LOGS_PAGE_LIMIT:
+        return logs
+
+    if from_block < to_block:
+        middle = (from_block + to_block) // 2
+        halves = await gather_or_cancel(
+            _fetch_log_range(params, from_block, middle),
+            _fetch_log_range(params, middle + 1, to_block),
+        )
+        return halves[0] + halves[1]
+
+    # A single block with more logs than one response: page within it
+    logs = list(logs)
+    page = 1
+    while len(logs) == page * LOGS_PAGE_LIMIT and (page + 1) * LOGS_PAGE_LIMIT <= MAX_RESULT_WINDOW:
+        page += 1
+        more = (await make_api_request(dict(query, page=str(page)))).get("result") or []
+        logs.extend(more)
+        if len(more) < LOGS_PAGE_LIMIT:
+            break
+    if len(logs) == page * LOGS_PAGE_LIMIT and (page + 1) * LOGS_PAGE_LIMIT > MAX_RESULT_WINDOW:
+        # The last page the window allows came back full
+        raise EtherscanAPIError(
+            f"Block {from_block} holds more than {len(logs)} matching logs; "
+            "add topic filters to fetch it completely"
+        )
+    return logs
+
+
+async def scan_logs(params: Dict[str, Any], shards: int = 0) -> List[Dict[str, Any]]:
+    """
+    Scan a getLogs block range in parallel shards.
+
+    The ``fromBlock``–``toBlock`` range is split into ``shards`` slices that
+    are fetched concurrently (the rate limiter bounds the actual request
+    rate). Any slice that returns a full page is split again, so dense
+    ranges are refined adaptively instead of being truncated.
+
+    Args:
+        params: getLogs request parameters; ``page``/``offset`` are managed here
+        shards: Number of initial slices (defaults to ``ETHERSCAN_LOG_SHARDS``)
+
+    Returns:
+        De-duplicated logs ordered by (blockNumber, logIndex)
+
+    Raises:
+        EtherscanAPIError: If a single block holds more matching logs than
+            one result window
+    """
+    if shards <= 0:
+        shards = int(os.getenv("ETHERSCAN_LOG_SHARDS", DEFAULT_LOG_SHARDS))
+    base = {key: value for key, value in params.items() if key not in ("page", "offset")}
+    chainid = params.get("chainid", "1")
+    from_block = await resolve_block(params.get("fromBlock") or "0", chainid)
+    to_block = await resolve_block(params.get("toBlock"), chainid)
+    if to_block < from_block:
+        return []
+
+    span = to_block - from_block + 1
+    shards = max(1, min(shards, span))
+    step = -(-span // shards)
+    ranges = [(start, min(start + step - 1, to_block)) for start in range(from_block, to_block + 1, step)]
+    chunks = await gather_or_cancel(*(_fetch_log_range(base, lo, hi) for lo, hi in ranges))
+
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for chunk in chunks:
+        for log in chunk:
+            identity = (log.get("transactionHash"), _hex_int(log.get("blockNumber")), _hex_int(log.get("logIndex")))
+            merged.setdefault(identity, log)
+    return sorted(merged.values(), key=log_sort_key)
@@ -0,0 +1,189 @@
+"""Client-side rate limiting for Etherscan API keys."""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+
+# Etherscan free tier defaults; override via environment for paid plans
+DEFAULT_CALLS_PER_SECOND = 5.0
+DEFAULT_CALLS_PER_DAY = 100000
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when an API key has used up its daily call allowance."""
+    pass
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment, falling back to a default."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self.tokens
+
+    def delay(self, amount: float = 1.0) -> float:
+        """Return how many seconds to wait before ``amount`` tokens are available."""
+        self._refill()
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float = 1.0) -> None:
+        """Take ``amount`` tokens from the bucket (may go negative when forced)."""
+        self._refill()
+        self.tokens -= amount
+
+
+class DailyQuota:
+    """Fixed-window call counter that resets at midnight UTC, like Etherscan's."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.resets_at = self._next_reset()
+
+    @staticmethod
+    def _next_reset() -> float:
+        now = datetime.now(timezone.utc)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return time.time() + (midnight - now).total_seconds()
+
+    def _roll(self) -> None:
+        if time.time() >= self.resets_at:
+            self.used = 0
+            self.resets_at = self._next_reset()
+
+    def remaining(self) -> int:
+        """Return the number of calls left in the current window."""
+        self._roll()
+        return max(0, self.limit - self.used)
+
+    def consume(self) -> None:
+        """Record one call against the quota."""
+        self._roll()
+        self.used += 1
+
+
+class KeyLimits:
+    """Per-second bucket and daily quota tracked for a single API key."""
+
+    def __init__(self, calls_per_second: float, burst: float, calls_per_day: int):
+        self.bucket = TokenBucket(calls_per_second, burst)
+        self.daily = DailyQuota(calls_per_day)
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+
+
+class RateLimiter:
+    """
+    Central scheduler that keeps one token bucket per API key.
+
+    Calls beyond the per-second budget are queued in FIFO order rather than
+    being sent upstream and rejected by Etherscan.
+    """
+
+    def __init__(
+        self,
+        calls_per_second: float = DEFAULT_CALLS_PER_SECOND,
+        burst: Optional[float] = None,
+        calls_per_day: int = DEFAULT_CALLS_PER_DAY,
+    ):
+        self.calls_per_second = calls_per_second
+        self.burst = burst if burst is not None else max(1.0, calls_per_second)
+        self.calls_per_day = calls_per_day
+        self._keys: Dict[str, KeyLimits] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Build a limiter from ``ETHERSCAN_RATE_LIMIT``/``_BURST``/``ETHERSCAN_DAILY_LIMIT``."""
+        calls_per_second = _env_float("ETHERSCAN_RATE_LIMIT", DEFAULT_CALLS_PER_SECOND)
+        burst = _env_float("ETHERSCAN_RATE_BURST", max(1.0, calls_per_second))
+        calls_per_day = int(_env_float("ETHERSCAN_DAILY_LIMIT", DEFAULT_CALLS_PER_DAY))
+        return cls(calls_per_second, burst, calls_per_day)
+
+    def limits(self, key: str) -> KeyLimits:
+        """Return (creating if needed) the limits tracked for ``key``."""
+        limits = self._keys.get(key)
+        if limits is None:
+            limits = KeyLimits(self.calls_per_second, self.burst, self.calls_per_day)
+            self._keys[key] = limits
+        return limits
+
+    async def acquire(self, key: str) -> float:
+        """
+        Wait until ``key`` may make one call and consume its budget.
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            QuotaExhaustedError: If the key's daily quota is used up
+        """
+        limits = self.limits(key)
+        started = time.monotonic()
+        limits.waiting += 1
+        try:
+            async with limits.lock:
+                if limits.daily.remaining() <= 0:
+                    raise QuotaExhaustedError("Daily API call quota exhausted for this key")
+                delay = limits.bucket.delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                limits.bucket.consume()
+                limits.daily.consume()
+        finally:
+            limits.waiting -= 1
+        return time.monotonic() - started
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for budget across all keys."""
+        return sum(limits.waiting for limits in self._keys.values())
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return a snapshot of queue depth and remaining budget per key."""
+        snapshot = {}
+        for index, limits in enumerate(self._keys.values()):
+            snapshot[f"key{index}"] = {
+                "queued": limits.waiting,
+                "tokens": round(limits.bucket.available(), 3),
+                "daily_remaining": limits.daily.remaining(),
+            }
+        return snapshot
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter, configured from the environment."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter.from_env()
+    return _rate_limiter
@@ -0,0 +1,102 @@
+"""Upstream list results kept as the JSON text Etherscan sent, for passthrough."""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+
+# Etherscan envelopes put ``status`` and ``message`` before ``result``
+ENVELOPE_PATTERN = r'\A\s*\{\s*"status"\s*:\s*"(\d+)"\s*,\s*"message"\s*:\s*("(?:[^"\\]|\\.)*")\s*,\s*"result"\s*:\s*\['
+_ENVELOPE = re.compile(ENVELOPE_PATTERN.encode())
+_WHITESPACE = b" \t\r\n"
+# Everything but quotes and brackets, deleted to get the structure of a JSON text
+_NOT_STRUCTURE = bytes(range(256)).translate(None, b'"[]{}')
+
+
+class RawJSON:
+    """A list result held as JSON text; parsed only if something needs its rows."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __bool__(self) -> bool:
+        return self.text[1:-1].strip() != ""
+
+    def __str__(self) -> str:
+        return self.text
+
+    def parse(self) -> Any:
+        return json.loads(self.text)
+
+
+def _skip_back(content: bytes, end: int) -> int:
+    while end > 0 and content[end - 1] in _WHITESPACE:
+        end -= 1
+    return end
+
+
+def _is_one_array(text: bytes) -> bool:
+    """
+    Return True if ``text`` is a single array: its first ``[`` closes at its last ``]``.
+
+    Only the brackets outside strings are compared, using bytes operations
+    that run at memory speed rather than a parse.
+    """
+    if b"\\" in text:
+        # Escaped backslashes first, so that what is left of ``\"`` is an escaped quote
+        text = text.replace(b"\\\\", b"").replace(b'\\"', b"")
+    # Adjacent quotes have nothing structural between them, whichever string they belong to
+    structure = text.translate(None, _NOT_STRUCTURE).replace(b'""', b"")
+    parts = structure.split(b'"')
+    if len(parts) % 2 == 0:
+        return False
+    structure = b"".join(parts[0::2])
+    if structure[:1] != b"[" or structure[-1:] != b"]":
+        return False
+    inner = structure[1:-1]
+    while inner:
+        reduced = inner.replace(b"[]", b"").replace(b"{}", b"")
+        if reduced == inner:
+            return False
+        inner = reduced
+    return True
+
+
+def split_envelope(content: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Split an Etherscan response into its status, message and raw list result.
+
+    Only the envelope and the bracket structure of the result are examined;
+    the result is sliced out of ``content`` as text without being parsed.
+    Returns None for anything else (JSON-RPC answers, string or object
+    results, a result followed by more keys, unbalanced brackets), in which
+    case the caller parses the response as usual.
+    """
+    match = _ENVELOPE.match(content)
+    if match is None:
+        return None
+    end = _skip_back(content, len(content))
+    if not end or content[end - 1] != ord("}"):
+        return None
+    end = _skip_back(content, end - 1)
+    if content[end - 1] != ord("]"):
+        return None
+    result = content[match.end() - 1:end]
+    if not _is_one_array(result):
+        return None
+    try:
+        message = json.loads(match.group(2))
+        text = str(result, "utf-8")
+    except ValueError:
+        return None
+    return {"status": match.group(1).decode(), "message": message, "result": RawJSON(text)}
+
+
+def materialize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``data`` with a raw result parsed into Python objects."""
+    result = data.get("result")
+    if isinstance(result, RawJSON):
+        return dict(data, result=result.parse())
+    return data
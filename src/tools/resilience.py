@@ -0,0 +1,178 @@
+"""Bulkheads and circuit breakers isolating each chain and API module."""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+
+DEFAULT_CHAIN_CONCURRENCY = 32
+DEFAULT_MODULE_CONCURRENCY = 16
+
+# Consecutive upstream failures that open a circuit
+DEFAULT_FAILURE_THRESHOLD = 5
+# Seconds an open circuit waits before letting a probe request through
+DEFAULT_OPEN_SECONDS = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def partition_of(params: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the ``(chainid, module)`` partition a request belongs to."""
+    return str(params.get("chainid", "1")), str(params.get("module", ""))
+
+
+class Bulkheads:
+    """
+    Concurrency limits per chain and per (chain, module).
+
+    A request holds one slot of its chain and one slot of its module on that
+    chain while it is in flight, so a slow chain or a slow module (eg. large
+    log scans) can only tie up its own slots, never those of other chains.
+    """
+
+    def __init__(
+        self,
+        chain_limit: int = DEFAULT_CHAIN_CONCURRENCY,
+        module_limit: int = DEFAULT_MODULE_CONCURRENCY,
+    ):
+        self.chain_limit = chain_limit
+        self.module_limit = module_limit
+        self._chains: Dict[str, asyncio.Semaphore] = {}
+        self._modules: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_env(cls) -> "Bulkheads":
+        """Build bulkheads from ``ETHERSCAN_CHAIN_CONCURRENCY``/``ETHERSCAN_MODULE_CONCURRENCY``."""
+        return cls(
+            int(os.getenv("ETHERSCAN_CHAIN_CONCURRENCY", DEFAULT_CHAIN_CONCURRENCY)),
+            int(os.getenv("ETHERSCAN_MODULE_CONCURRENCY", DEFAULT_MODULE_CONCURRENCY)),
+        )
+
+    @asynccontextmanager
+    async def slot(self, params: Dict[str, Any]) -> AsyncIterator[None]:
+        """Hold a chain slot and a module slot for the duration of the block."""
+        chainid, module = partition_of(params)
+        chain = self._chains.get(chainid)
+        if chain is None:
+            chain = self._chains[chainid] = asyncio.Semaphore(self.chain_limit)
+        partition = self._modules.get((chainid, module))
+        if partition is None:
+            partition = self._modules[(chainid, module)] = asyncio.Semaphore(self.module_limit)
+        async with partition:
+            async with chain:
+                yield
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one upstream partition.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast for ``open_seconds``. Then one probe is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a request may go upstream now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.retry_in > 0:
+            return False
+        if self._probing:
+            return False
+        self.state = HALF_OPEN
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def abandon(self) -> None:
+        """Forget a request that ended without a verdict (eg. a cancelled hedge)."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """One ``CircuitBreaker`` per (chainid, module) partition."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreakers":
+        """Build breakers from ``ETHERSCAN_BREAKER_THRESHOLD``/``ETHERSCAN_BREAKER_OPEN_SECONDS``."""
+        return cls(
+            int(os.getenv("ETHERSCAN_BREAKER_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)),
+            float(os.getenv("ETHERSCAN_BREAKER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS)),
+        )
+
+    def get(self, params: Dict[str, Any]) -> CircuitBreaker:
+        """Return the breaker guarding the partition of ``params``."""
+        partition = partition_of(params)
+        breaker = self._breakers.get(partition)
+        if breaker is None:
+            breaker = self._breakers[partition] = CircuitBreaker(self.failure_threshold, self.open_seconds)
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every partition seen so far."""
+        return {
+            f"{chainid}/{module}": {"state": breaker.state, "failures": breaker.failures}
+            for (chainid, module), breaker in self._breakers.items()
+        }
+
+
+_bulkheads: Optional[Bulkheads] = None
+_circuit_breakers: Optional[CircuitBreakers] = None
+
+
+def get_bulkheads() -> Bulkheads:
+    """Return the process-wide bulkheads, configured from the environment."""
+    global _bulkheads
+    if _bulkheads is None:
+        _bulkheads = Bulkheads.from_env()
+    return _bulkheads
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    """Return the process-wide circuit breakers, configured from the environment."""
+    global _circuit_breakers
+    if _circuit_breakers is None:
+        _circuit_breakers = CircuitBreakers.from_env()
+    return _circuit_breakers
@@ -0,0 +1,143 @@
+"""Retry policy with exponential backoff, full jitter and a per-call deadline."""
+
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .metrics import get_metrics
+
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 8.0
+# Upper bound on the total time one request may take across all of its attempts
+DEFAULT_REQUEST_DEADLINE = 60.0
+
+T = TypeVar("T")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a ``Retry-After`` header, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Deadline:
+    """
+    The time budget shared by all attempts of one request.
+
+    The clock starts when the first attempt is about to reach Etherscan, so
+    time spent queueing for the rate limiter, an API key or a bulkhead slot
+    is not charged to the request.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._expires: Optional[float] = None
+
+    def remaining(self) -> float:
+        """Return the seconds left, or the whole budget if the clock has not started."""
+        if self._expires is None:
+            return self.seconds
+        return max(0.0, self._expires - asyncio.get_running_loop().time())
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await ``awaitable`` within the time left, starting the clock if needed.
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes first
+        """
+        if self._expires is None:
+            self._expires = asyncio.get_running_loop().time() + self.seconds
+        return await asyncio.wait_for(awaitable, self.remaining())
+
+
+class RetryPolicy:
+    """
+    Retries retryable failures with capped exponential backoff and full jitter.
+
+    The n-th retry waits a random time in ``[0, min(max_delay, base_delay * 2**n)]``,
+    or at least the server's ``retry_after`` hint when one is given. A retry
+    that could not start before the deadline is not attempted; the last error
+    is raised instead. Attempts bound their upstream calls with the
+    ``Deadline`` they are given.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        deadline: float = DEFAULT_REQUEST_DEADLINE,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retries = 0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from ``ETHERSCAN_MAX_RETRIES``/``ETHERSCAN_REQUEST_DEADLINE``."""
+        return cls(
+            max_retries=int(os.getenv("ETHERSCAN_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+            deadline=float(os.getenv("ETHERSCAN_REQUEST_DEADLINE", DEFAULT_REQUEST_DEADLINE)),
+        )
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the delay before retry number ``attempt`` (0-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        func: Callable[[Deadline], Awaitable[T]],
+        is_retryable: Callable[[BaseException], bool],
+    ) -> T:
+        """
+        Await ``func(deadline)`` until it succeeds, fails fatally or runs out of retries.
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes while an attempt is running
+        """
+        deadline = Deadline(self.deadline)
+        attempt = 0
+        while True:
+            try:
+                return await func(deadline)
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff(attempt, getattr(e, "retry_after", None))
+                if delay >= deadline.remaining():
+                    raise
+            attempt += 1
+            self.retries += 1
+            get_metrics().inc("etherscan_retries_total")
+            await asyncio.sleep(delay)
+
+
+_retry_policy: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy, configured from the environment."""
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy.from_env()
+    return _retry_policy
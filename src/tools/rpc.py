@@ -2,14 +2,15 @@
 
 from typing import Optional
 from mcp.server.fastmcp import FastMCP
-from .utils import api_call
+from .multicall import get_multicaller, parse_calls
+from .utils import api_call, format_response
 
 
 def register_rpc_tools(server: FastMCP) -> None:
     """Register all RPC proxy tools with the server."""
     
     @server.tool()
-    def proxy_eth_blockNumber(chainid: str = "1") -> str:
+    async def proxy_eth_blockNumber(chainid: str = "1") -> str:
         """Returns the number of most recent block.
         
         Args:
@@ -20,10 +21,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "action": "eth_blockNumber",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getBlockByNumber(tag: str, boolean: bool, chainid: str = "1") -> str:
+    async def proxy_eth_getBlockByNumber(tag: str, boolean: bool, chainid: str = "1") -> str:
         """Returns information about a block by block number.
         
         Args:
@@ -38,10 +39,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "boolean": str(boolean).lower(),
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getUncleByBlockNumberAndIndex(tag: str, index: str, chainid: str = "1") -> str:
+    async def proxy_eth_getUncleByBlockNumberAndIndex(tag: str, index: str, chainid: str = "1") -> str:
         """Returns information about a uncle by block number.
         
         Args:
@@ -56,10 +57,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "index": index,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getBlockTransactionCountByNumber(tag: str, chainid: str = "1") -> str:
+    async def proxy_eth_getBlockTransactionCountByNumber(tag: str, chainid: str = "1") -> str:
         """Returns the number of transactions in a block.
         
         Args:
@@ -72,10 +73,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "tag": tag,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getTransactionByHash(txhash: str, chainid: str = "1") -> str:
+    async def proxy_eth_getTransactionByHash(txhash: str, chainid: str = "1") -> str:
         """Returns information about a transaction requested by transaction hash.
         
         Args:
@@ -88,10 +89,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "txhash": txhash,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getTransactionByBlockNumberAndIndex(tag: str, index: str, chainid: str = "1") -> str:
+    async def proxy_eth_getTransactionByBlockNumberAndIndex(tag: str, index: str, chainid: str = "1") -> str:
         """Returns information about a transaction requested by block number and transaction index position.
         
         Args:
@@ -106,10 +107,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "index": index,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getTransactionCount(address: str, tag: str, chainid: str = "1") -> str:
+    async def proxy_eth_getTransactionCount(address: str, tag: str, chainid: str = "1") -> str:
         """Returns the number of transactions performed by an address.
         
         Args:
@@ -124,10 +125,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "tag": tag,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getTransactionReceipt(txhash: str, chainid: str = "1") -> str:
+    async def proxy_eth_getTransactionReceipt(txhash: str, chainid: str = "1") -> str:
         """Returns the receipt of a transaction that has been validated.
         
         Args:
@@ -140,10 +141,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "txhash": txhash,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_call(to: str, data: str, tag: str, chainid: str = "1") -> str:
+    async def proxy_eth_call(to: str, data: str, tag: str, chainid: str = "1") -> str:
         """Executes a new message call immediately without creating a transaction on the block chain.
         
         Args:
@@ -160,10 +161,28 @@ def register_rpc_tools(server: FastMCP) -> None:
             "tag": tag,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getCode(address: str, tag: str, chainid: str = "1") -> str:
+    async def proxy_eth_call_batch(
+        calls: str,
+        tag: str = "latest",
+        chainid: str = "1",
+        output_format: Optional[str] = None
+    ) -> str:
+        """Executes many read-only calls at once, packed into Multicall3 `aggregate3` requests.
+        
+        Args:
+            calls: The calls as `to:data` pairs separated by `,`, eg. `0xA0b8...eB48:0x70a08231000000000000000000000000...`
+            tag: The string pre-defined block parameter, either `earliest`, `pending` or `latest`, or a hex block number
+            chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+        """
+        results = await get_multicaller().call(parse_calls(calls), tag, chainid)
+        return format_response(results, output_format)
+    
+    @server.tool()
+    async def proxy_eth_getCode(address: str, tag: str, chainid: str = "1") -> str:
         """Returns code at a given address.
         
         Args:
@@ -178,10 +197,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "tag": tag,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_getStorageAt(address: str, position: str, tag: str, chainid: str = "1") -> str:
+    async def proxy_eth_getStorageAt(address: str, position: str, tag: str, chainid: str = "1") -> str:
         """Returns the value from a storage position at a given address.
         
         Args:
@@ -198,10 +217,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "tag": tag,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_gasPrice(chainid: str = "1") -> str:
+    async def proxy_eth_gasPrice(chainid: str = "1") -> str:
         """Returns the current price per gas in wei.
         
         Args:
@@ -212,10 +231,10 @@ def register_rpc_tools(server: FastMCP) -> None:
             "action": "eth_gasPrice",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def proxy_eth_estimateGas(
+    async def proxy_eth_estimateGas(
         data: str,
         to: str,
         value: Optional[str] = None,
@@ -249,4 +268,4 @@ def register_rpc_tools(server: FastMCP) -> None:
         if gasPrice is not None:
             params["gasPrice"] = gasPrice
             
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params)
\ No newline at end of file
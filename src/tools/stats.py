@@ -1,5 +1,6 @@
 """Statistics-related tools for Etherscan API."""
 
+from typing import Optional
 from mcp.server.fastmcp import FastMCP
 from .utils import api_call
 
@@ -8,7 +9,7 @@ def register_stats_tools(server: FastMCP) -> None:
     """Register all statistics-related tools with the server."""
     
     @server.tool()
-    def stats_ethsupply(chainid: str = "1") -> str:
+    async def stats_ethsupply(chainid: str = "1") -> str:
         """Returns the current amount of Ether in circulation excluding ETH2 Staking rewards and EIP1559 burnt fees.
         
         Args:
@@ -19,10 +20,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "action": "ethsupply",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def stats_ethsupply2(chainid: str = "1") -> str:
+    async def stats_ethsupply2(chainid: str = "1") -> str:
         """Returns the current amount of Ether in circulation, ETH2 Staking rewards, EIP1559 burnt fees, and total withdrawn ETH from the beacon chain.
         
         Args:
@@ -33,10 +34,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "action": "ethsupply2",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def stats_ethprice(chainid: str = "1") -> str:
+    async def stats_ethprice(chainid: str = "1") -> str:
         """Returns the latest price of 1 ETH.
         
         Args:
@@ -47,16 +48,17 @@ def register_stats_tools(server: FastMCP) -> None:
             "action": "ethprice",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def stats_chainsize(
+    async def stats_chainsize(
         startdate: str, 
         enddate: str, 
         clienttype: str, 
         syncmode: str, 
         sort: str, 
-        chainid: str = "1"
+        chainid: str = "1",
+        output_format: Optional[str] = None
     ) -> str:
         """Returns the size of the Ethereum blockchain, in bytes, over a date range.
         
@@ -67,6 +69,7 @@ def register_stats_tools(server: FastMCP) -> None:
             syncmode: The type of node to run, either `default` or `archive`
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -78,10 +81,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_nodecount(chainid: str = "1") -> str:
+    async def stats_nodecount(chainid: str = "1") -> str:
         """Returns the total number of discoverable Ethereum nodes.
         
         Args:
@@ -92,10 +95,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "action": "nodecount",
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def stats_dailytxnfee(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailytxnfee(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the amount of transaction fees paid to miners per day.
         
         Args:
@@ -103,6 +106,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -112,10 +116,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_dailynewaddress(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailynewaddress(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the number of new Ethereum addresses created per day.
         
         Args:
@@ -123,6 +127,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -132,10 +137,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_dailynetutilization(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailynetutilization(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the daily average gas used over gas limit, in percentage.
         
         Args:
@@ -143,6 +148,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -152,10 +158,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_dailyavghashrate(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailyavghashrate(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the historical measure of processing power of the Ethereum network.
         
         Args:
@@ -163,6 +169,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -172,10 +179,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_dailytx(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailytx(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the number of transactions performed on the Ethereum blockchain per day.
         
         Args:
@@ -183,6 +190,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -192,10 +200,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_dailyavgnetdifficulty(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_dailyavgnetdifficulty(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the historical mining difficulty of the Ethereum network.
         
         Args:
@@ -203,6 +211,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -212,10 +221,10 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params, output_format)
     
     @server.tool()
-    def stats_ethdailyprice(startdate: str, enddate: str, sort: str, chainid: str = "1") -> str:
+    async def stats_ethdailyprice(startdate: str, enddate: str, sort: str, chainid: str = "1", output_format: Optional[str] = None) -> str:
         """Returns the historical price of 1 ETH.
         
         Args:
@@ -223,6 +232,7 @@ def register_stats_tools(server: FastMCP) -> None:
             enddate: The ending date in yyyy-MM-dd format, eg. 2019-02-28
             sort: The sorting preference, use `asc` to sort by ascending and `desc` to sort by descending
             chainid: Chain id, default 1 (Ethereum)
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
         """
         params = {
             "module": "stats",
@@ -232,4 +242,4 @@ def register_stats_tools(server: FastMCP) -> None:
             "sort": sort,
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params, output_format)
\ No newline at end of file
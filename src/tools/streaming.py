@@ -0,0 +1,199 @@
+"""Incremental decoding of large list results, one record at a time as the body arrives."""
+
+import codecs
+import json
+import json.scanner
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .rawjson import ENVELOPE_PATTERN
+
+
+# Bulk history endpoints whose results are long lists of records
+STREAMABLE_ACTIONS = {
+    ("account", "txlist"),
+    ("account", "txlistinternal"),
+    ("account", "tokentx"),
+    ("account", "tokennfttx"),
+    ("account", "token1155tx"),
+    ("logs", "getLogs"),
+}
+
+# A body whose first this many characters are not a list envelope is parsed whole
+MAX_ENVELOPE_CHARS = 4096
+
+_ENVELOPE = re.compile(ENVELOPE_PATTERN)
+# Separators between records; commas are skipped like whitespace
+_SEPARATORS = re.compile(r"[\s,]*")
+# Characters that may follow a complete scalar record
+_SCALAR_ENDS = frozenset(" \t\r\n,]")
+
+
+def is_streamable(params: Dict[str, Any]) -> bool:
+    """Return True if responses to ``params`` are list results worth streaming."""
+    return (params.get("module"), params.get("action")) in STREAMABLE_ACTIONS
+
+
+class ListResultParser:
+    """
+    Incremental parser for an Etherscan response whose result is a list.
+
+    ``feed`` takes chunks of the (decompressed) body and returns the records
+    completed by that chunk, so only the record being received is buffered.
+    ``status`` and ``message`` are set once the envelope has been read. Any
+    other body (an error string, a JSON-RPC answer, an HTML page) is
+    buffered whole instead, ``fallback`` is set and ``close`` returns it
+    parsed; such bodies are small.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        # The scanner behind ``JSONDecoder.raw_decode``, without its per-call whitespace skipping
+        self._scan = json.scanner.make_scanner(json.JSONDecoder())
+        self._buffer = ""
+        self._chunks: List[str] = []
+        self.status: Optional[str] = None
+        self.message: Optional[str] = None
+        self.fallback = False
+        self.finished = False
+
+    @property
+    def in_list(self) -> bool:
+        return self.status is not None
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Consume ``chunk`` and return the records it completed."""
+        text = self._text.decode(chunk, final)
+        if self.fallback:
+            self._chunks.append(text)
+            return []
+        if self.finished:
+            # Only the end of the envelope is left
+            return []
+        self._buffer += text
+        if not self.in_list and not self._read_envelope(final):
+            return []
+        return self._read_records(final)
+
+    def _read_envelope(self, final: bool) -> bool:
+        match = _ENVELOPE.match(self._buffer)
+        if match is None:
+            if final or len(self._buffer) > MAX_ENVELOPE_CHARS:
+                self.fallback = True
+                self._chunks.append(self._buffer)
+                self._buffer = ""
+            return False
+        self.status = match.group(1)
+        self.message = json.loads(match.group(2))
+        self._buffer = self._buffer[match.end():]
+        return True
+
+    def _read_records(self, final: bool) -> List[Any]:
+        records = []
+        buffer = self._buffer
+        length = len(buffer)
+        position = 0
+        while position < length:
+            char = buffer[position]
+            if char == "]":
+                self.finished = True
+                position += 1
+                break
+            if char not in "{[":
+                skipped = _SEPARATORS.match(buffer, position).end()
+                if skipped > position:
+                    position = skipped
+                    continue
+            try:
+                record, end = self._scan(buffer, position)
+            except (StopIteration, ValueError):
+                if final:
+                    raise ValueError("Malformed list result")
+                break
+            if not final and not isinstance(record, (dict, list)) and (
+                end == length or buffer[end] not in _SCALAR_ENDS
+            ):
+                # A number cut at the end of the buffer ("15000000000." + "0") may
+                # look complete; keep it until the character after it has arrived
+                break
+            records.append(record)
+            position = end
+        self._buffer = buffer[position:]
+        if final and not self.finished:
+            raise ValueError("Response ended inside the result list")
+        return records
+
+    def close(self) -> Any:
+        """Return the whole body parsed, for a response that was not a list envelope."""
+        return json.loads("".join(self._chunks))
+
+
+class RowEncoder:
+    """
+    Encodes records into the text of a ``json``, ``pretty`` or ``table`` result as they arrive.
+
+    ``json`` and ``table`` rows are serialized immediately, so only the
+    encoded output is kept. Table columns are the union of the keys seen, in
+    order of first appearance; rows encoded before a column appeared are
+    padded with nulls at the end, as ``to_table`` would. A ``table`` result
+    that is not all objects is encoded as a plain list, as ``to_table`` leaves
+    it; rows already encoded as table rows are re-encoded when the first
+    other row arrives.
+    """
+
+    def __init__(self, output_format: str, dumps: Callable[..., str]):
+        self.output_format = output_format
+        self.dumps = dumps
+        self.columns: List[str] = []
+        self._column_index: Dict[str, int] = {}
+        self._parts: List[str] = []
+        self._widths: List[int] = []
+        # Key order of each table row, shared between rows with the same keys
+        self._shapes: List[Tuple[str, ...]] = []
+        self._known_shapes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._rows: List[Any] = []
+        self._as_table = output_format == "table"
+
+    def add(self, row: Any) -> None:
+        if self.output_format == "pretty":
+            self._rows.append(row)
+            return
+        if self._as_table and not isinstance(row, dict):
+            self._untable()
+        if self._as_table:
+            for key in row:
+                if key not in self._column_index:
+                    self._column_index[key] = len(self.columns)
+                    self.columns.append(key)
+            self._parts.append(self.dumps([row.get(column) for column in self.columns]))
+            self._widths.append(len(self.columns))
+            shape = tuple(row)
+            self._shapes.append(self._known_shapes.setdefault(shape, shape))
+        else:
+            self._parts.append(self.dumps(row))
+
+    def _untable(self) -> None:
+        """Re-encode the table rows so far as the objects they came from."""
+        self._as_table = False
+        self._parts = [
+            self.dumps({key: values[self._column_index[key]] for key in shape})
+            for values, shape in zip(map(json.loads, self._parts), self._shapes)
+        ]
+        self._widths = []
+        self._shapes = []
+        self._known_shapes = {}
+
+    def finish(self) -> str:
+        """Return the encoded result."""
+        if self.output_format == "pretty":
+            return self.dumps(self._rows, pretty=True)
+        if not self._as_table or not self._parts:
+            return "[" + ",".join(self._parts) + "]"
+        width = len(self.columns)
+        rows = []
+        for part, part_width in zip(self._parts, self._widths):
+            if part_width < width:
+                padding = ",".join(["null"] * (width - part_width))
+                part = f"[{padding}]" if part_width == 0 else f"{part[:-1]},{padding}]"
+            rows.append(part)
+        return '{"columns":' + self.dumps(self.columns) + ',"rows":[' + ",".join(rows) + "]}"
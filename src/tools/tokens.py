@@ -1,14 +1,16 @@
 """Token-related tools for Etherscan API."""
 
+from typing import Optional
 from mcp.server.fastmcp import FastMCP
-from .utils import api_call
+from .batching import fetch_token_balances, split_addresses
+from .utils import api_call, format_response
 
 
 def register_token_tools(server: FastMCP) -> None:
     """Register all token-related tools with the server."""
     
     @server.tool()
-    def stats_tokensupply(contractaddress: str, chainid: str = "1") -> str:
+    async def stats_tokensupply(contractaddress: str, chainid: str = "1") -> str:
         """Returns the current amount of an ERC-20 token in circulation.
         
         Args:
@@ -21,10 +23,10 @@ def register_token_tools(server: FastMCP) -> None:
             "contractaddress": contractaddress,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def account_tokenbalance(contractaddress: str, address: str, chainid: str = "1") -> str:
+    async def account_tokenbalance(contractaddress: str, address: str, chainid: str = "1") -> str:
         """Returns the current balance of an ERC-20 token of an address.
         
         Args:
@@ -40,4 +42,29 @@ def register_token_tools(server: FastMCP) -> None:
             "tag": "latest",
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params)
+    
+    @server.tool()
+    async def account_tokenbalance_matrix(
+        address: str,
+        contractaddress: str,
+        chainid: str = "1",
+        method: str = "auto",
+        output_format: Optional[str] = None
+    ) -> str:
+        """Returns the current ERC-20 balance of every address for every token, as one table.
+        
+        Args:
+            address: The addresses to check for token balances, separated by `,`
+            contractaddress: The contract addresses of the ERC-20 tokens, separated by `,`
+            chainid: Chain id, default 1 (Ethereum)
+            method: `multicall` (Multicall3 `balanceOf` reads), `tokenbalance` (one call per pair) or `auto` to pick whichever needs fewer requests
+            output_format: Response encoding, `json` (minified), `pretty` (indented) or `table` (column names listed once, then rows); defaults to `ETHERSCAN_OUTPUT_FORMAT`
+        """
+        matrix = await fetch_token_balances(
+            split_addresses(address),
+            split_addresses(contractaddress),
+            chainid,
+            method,
+        )
+        return format_response(matrix, output_format)
@@ -8,7 +8,7 @@ def register_transaction_tools(server: FastMCP) -> None:
     """Register all transaction-related tools with the server."""
     
     @server.tool()
-    def transaction_getstatus(txhash: str, chainid: str = "1") -> str:
+    async def transaction_getstatus(txhash: str, chainid: str = "1") -> str:
         """Returns the status code of a contract execution.
         
         Args:
@@ -21,10 +21,10 @@ def register_transaction_tools(server: FastMCP) -> None:
             "txhash": txhash,
             "chainid": chainid
         }
-        return api_call(params)
+        return await api_call(params)
     
     @server.tool()
-    def transaction_gettxreceiptstatus(txhash: str, chainid: str = "1") -> str:
+    async def transaction_gettxreceiptstatus(txhash: str, chainid: str = "1") -> str:
         """Returns the status code of a transaction execution.
         
         Args:
@@ -37,4 +37,4 @@ def register_transaction_tools(server: FastMCP) -> None:
             "txhash": txhash,
             "chainid": chainid
         }
-        return api_call(params)
\ No newline at end of file
+        return await api_call(params)
\ No newline at end of file
@@ -1,9 +1,56 @@
 """Utility functions for Etherscan API interactions."""
 
+import asyncio
+import json
 import os
+import time
 import httpx
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
 from mcp.server.fastmcp import FastMCP
+from .cache import get_response_cache, normalize_params
+from .cassette import REPLAY, CassetteTransport, cassette_key, get_cassette
+from .filters import RowFilter
+from .hedging import get_hedger
+from .keypool import NoApiKeyAvailableError, classify_error_message, get_key_pool
+from .metrics import get_metrics
+from .rawjson import RawJSON, materialize, split_envelope
+from .resilience import get_bulkheads, get_circuit_breakers, partition_of
+from .retry import Deadline, get_retry_policy, parse_retry_after
+from .singleflight import get_single_flight
+from .streaming import ListResultParser, RowEncoder, is_streamable
+
+try:
+    import orjson
+except ImportError:  # optional fast serializer
+    orjson = None
+
+
+DEFAULT_API_URL = "https://api.etherscan.io/v2/api"
+# Overridable to use a local stand-in, a caching proxy or a regional mirror
+ETHERSCAN_API_URL = os.getenv("ETHERSCAN_API_URL") or DEFAULT_API_URL
+
+# Connection pool settings for the shared HTTP client
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
+# Response encodings selectable globally (ETHERSCAN_OUTPUT_FORMAT) or per tool call
+OUTPUT_FORMATS = ("json", "pretty", "table")
+DEFAULT_OUTPUT_FORMAT = "json"
+
+# status "0" responses that simply mean an empty result set
+EMPTY_RESULT_MESSAGES = {"No transactions found", "No records found", "No data found"}
+
+T = TypeVar("T")
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Callbacks that see every successful upstream response as (params, data)
+_response_observers: List[Callable[[Dict[str, Any], Dict[str, Any]], None]] = []
 
 
 class EtherscanAPIError(Exception):
@@ -11,12 +58,81 @@ class EtherscanAPIError(Exception):
     pass
 
 
-async def make_api_request(params: Dict[str, Any]) -> Dict[str, Any]:
+class TransientAPIError(EtherscanAPIError):
+    """
+    A failure expected to clear up on retry (rate limits, 5xx, timeouts).
+
+    ``upstream`` is False when the failure says nothing about the health of
+    Etherscan itself (our own rate limits or keys), so it does not count
+    towards opening a circuit.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, upstream: bool = True):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.upstream = upstream
+
+
+class CircuitOpenError(EtherscanAPIError):
+    """Raised without contacting Etherscan while a chain/module upstream is unhealthy."""
+    pass
+
+
+def _http2_available() -> bool:
+    """Return True if the optional ``h2`` package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared, connection-pooled HTTP client.
+    
+    The client is created lazily on first use so that tools also work when
+    they are driven outside of the server lifespan (e.g. from scripts).
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        transport = None
+        cassette = get_cassette()
+        if cassette is not None:
+            transport = CassetteTransport(
+                cassette,
+                httpx.AsyncHTTPTransport(http2=_http2_available(), limits=HTTP_LIMITS),
+            )
+        _http_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS,
+            transport=transport,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def add_response_observer(observer: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> None:
+    """Register a callback invoked with ``(params, data)`` for each successful upstream response."""
+    if observer not in _response_observers:
+        _response_observers.append(observer)
+
+
+async def make_api_request(params: Dict[str, Any], raw: bool = False) -> Dict[str, Any]:
     """
     Make an API request to Etherscan.
     
     Args:
         params: Dictionary of API parameters
+        raw: Allow a list result to be returned unparsed, as a ``RawJSON``
         
     Returns:
         JSON response from Etherscan API
@@ -24,106 +140,403 @@ async def make_api_request(params: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         EtherscanAPIError: If API request fails or returns error
     """
-    api_key = os.getenv("ETHERSCAN_API_KEY")
-    if not api_key:
-        raise EtherscanAPIError("ETHERSCAN_API_KEY environment variable is not set")
-    
-    # Build query parameters
-    query_params = {}
-    for key, value in params.items():
-        if value is not None:
-            query_params[key] = str(value)
-    
-    query_params["apikey"] = api_key
-    
-    url = "https://api.etherscan.io/v2/api"
+    cache = get_response_cache()
+    metrics = get_metrics()
+    labels = _metric_labels(params)
+    started = time.perf_counter()
+    try:
+        cache_key = normalize_params(params)
+        cached = await cache.lookup(cache_key, params)
+        if cached is not None:
+            metrics.inc("etherscan_cache_lookups_total", result="hit", **labels)
+            return cached if raw else materialize(cached)
+        metrics.inc("etherscan_cache_lookups_total", result="miss", **labels)
+        
+        # Identical concurrent calls share a single upstream request
+        try:
+            data = await get_single_flight().do(cache_key, lambda: _fetch_with_retries(params, raw))
+        except (CircuitOpenError, TransientAPIError):
+            # While the upstream is unhealthy, an expired answer beats no answer
+            data = cache.get_stale(cache_key)
+            if data is None:
+                raise
+            metrics.inc("etherscan_cache_lookups_total", result="stale", **labels)
+        return data if raw else materialize(data)
+    finally:
+        metrics.observe("etherscan_request_duration_seconds", time.perf_counter() - started, **labels)
+
+
+async def gather_or_cancel(*awaitables: Awaitable[T]) -> List[T]:
+    """
+    Await ``awaitables`` concurrently like ``asyncio.gather``, cancelling the rest on the first failure.
+
+    A fan-out whose result is lost once one part fails stops spending rate
+    limit budget on the parts still queued.
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def _metric_labels(params: Dict[str, Any]) -> Dict[str, str]:
+    return {"module": str(params.get("module", "")), "action": str(params.get("action", ""))}
+
+
+async def _with_retries(attempt: Callable[[Deadline], Awaitable[T]]) -> T:
+    """Run ``attempt`` under the retry policy; only ``TransientAPIError`` is retried."""
+    policy = get_retry_policy()
+    try:
+        return await policy.run(attempt, lambda error: isinstance(error, TransientAPIError))
+    except asyncio.TimeoutError:
+        raise EtherscanAPIError(f"Request deadline of {policy.deadline:g}s exceeded")
+
+
+async def _fetch_with_retries(params: Dict[str, Any], raw: bool = False) -> Dict[str, Any]:
+    """Run ``_fetch`` guarded, hedged when idempotent, under the retry policy."""
+    return await _with_retries(
+        lambda deadline: get_hedger().run(
+            params, lambda: _guarded_fetch(params, lambda api_key: _fetch(params, api_key, raw), deadline)
+        )
+    )
+
+
+async def _guarded_fetch(
+    params: Dict[str, Any],
+    fetch: Callable[[Optional[str]], Awaitable[T]],
+    deadline: Deadline,
+) -> T:
+    """
+    Run ``fetch(api_key)`` inside the chain/module bulkhead of ``params``, reporting the outcome to its circuit breaker.
+
+    The API key (and with it the rate limit token) is acquired before a
+    bulkhead slot is taken, so slots are only held by requests ready to go.
+    Only ``fetch`` itself runs against ``deadline``; waiting for the key and
+    the slot does not.
+    """
+    breaker = get_circuit_breakers().get(params)
+    if not breaker.allow():
+        chainid, module = partition_of(params)
+        raise CircuitOpenError(
+            f"Etherscan {module} API on chain {chainid} is failing, retry in {breaker.retry_in:.0f}s"
+        )
+    try:
+        api_key = await _acquire_api_key(params)
+    except BaseException:
+        # Nothing reached Etherscan, so there is no verdict for the breaker
+        breaker.abandon()
+        raise
+    try:
+        async with get_bulkheads().slot(params):
+            data = await deadline.run(fetch(api_key))
+    except TransientAPIError as e:
+        if e.upstream:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except EtherscanAPIError:
+        # Etherscan answered; the request itself was rejected
+        breaker.record_success()
+        raise
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        breaker.abandon()
+        raise
+    breaker.record_success()
+    return data
+
+
+async def _acquire_api_key(params: Dict[str, Any]) -> Optional[str]:
+    """Wait for an API key with rate budget; None when the cassette will answer instead (or fail, on a replay miss)."""
+    cassette = get_cassette()
+    if cassette is not None:
+        # Recorded answers cost no quota, so they skip the key pool and rate limiter
+        if cassette.can_replay(params):
+            return None
+        if cassette.mode == REPLAY:
+            raise EtherscanAPIError(f"No recorded response for {cassette_key(params)}")
+    waited_from = time.perf_counter()
+    try:
+        return await get_key_pool().acquire()
+    except NoApiKeyAvailableError as e:
+        raise EtherscanAPIError(str(e))
+    finally:
+        get_metrics().observe("etherscan_rate_limit_wait_seconds", time.perf_counter() - waited_from)
+
+
+def _query_params(params: Dict[str, Any], api_key: Optional[str]) -> Dict[str, str]:
+    query_params = {key: str(value) for key, value in params.items() if value is not None}
+    if api_key is not None:
+        query_params["apikey"] = api_key
+    return query_params
+
+
+def _check_http_status(response: httpx.Response) -> None:
+    if response.status_code == 429 or response.status_code >= 500:
+        raise TransientAPIError(
+            f"HTTP {response.status_code} from Etherscan",
+            parse_retry_after(response.headers.get("Retry-After")),
+        )
+    response.raise_for_status()
+
+
+def _check_envelope(data: Dict[str, Any], api_key: Optional[str]) -> None:
+    """Raise the error reported by a status "0" response, unless it just means no results."""
+    if data.get("status") != "0" or data.get("message") in EMPTY_RESULT_MESSAGES:
+        return
+    key_pool = get_key_pool()
+    error_msg = data.get("result", data.get("message", "Unknown API error"))
+    error_kind = classify_error_message(str(error_msg))
+    if error_kind and api_key is not None:
+        key_pool.report_error(api_key, error_kind)
+    # Rate limits pass; a bad key is worth retrying only when another key can take over
+    if error_kind == "rate_limit" or (error_kind == "invalid_key" and len(key_pool.keys) > 1):
+        raise TransientAPIError(f"Etherscan API error: {error_msg}", upstream=False)
+    raise EtherscanAPIError(f"Etherscan API error: {error_msg}")
+
+
+@contextmanager
+def _upstream_errors(labels: Dict[str, str]) -> Iterator[None]:
+    """Translate errors raised while talking to Etherscan into ``EtherscanAPIError``."""
+    try:
+        yield
+    except EtherscanAPIError:
+        raise
+    except httpx.TransportError as e:
+        get_metrics().inc("etherscan_upstream_requests_total", status="error", **labels)
+        raise TransientAPIError(f"HTTP request failed: {str(e)}")
+    except httpx.HTTPError as e:
+        raise EtherscanAPIError(f"HTTP request failed: {str(e)}")
+    except Exception as e:
+        raise EtherscanAPIError(f"Unexpected error: {str(e)}")
+
+
+async def _fetch(params: Dict[str, Any], api_key: Optional[str], raw: bool = False) -> Dict[str, Any]:
+    """Send one request upstream, validate it and cache the result (unparsed if ``raw`` allows)."""
+    cache = get_response_cache()
+    metrics = get_metrics()
+    labels = _metric_labels(params)
     
-    async with httpx.AsyncClient() as client:
+    client = get_http_client()
+    with _upstream_errors(labels):
+        started = time.perf_counter()
+        try:
+            response = await client.get(ETHERSCAN_API_URL, params=_query_params(params, api_key))
+        finally:
+            metrics.observe("etherscan_upstream_duration_seconds", time.perf_counter() - started, **labels)
+        metrics.inc("etherscan_upstream_requests_total", status=response.status_code, **labels)
+        metrics.inc("etherscan_upstream_bytes_total", len(response.content), **labels)
+        _check_http_status(response)
+        
+        # Only the envelope is checked when the list result can be passed through
+        data = split_envelope(response.content) if raw else None
+        if data is None:
+            try:
+                data = response.json()
+            except ValueError:
+                # Gateways answer with HTML error pages under load
+                raise TransientAPIError("Malformed response from Etherscan")
+        
+        # Check if API returned an error
+        _check_envelope(data, api_key)
+        
+        await cache.remember(params, data, len(response.content))
+        for observer in _response_observers:
+            observer(params, data)
+        return data
+
+
+async def _fetch_stream(
+    params: Dict[str, Any], api_key: Optional[str], output_format: str, row_filter: Optional[RowFilter]
+) -> str:
+    """Send one request upstream and filter, project and encode its list result row by row as it arrives."""
+    metrics = get_metrics()
+    labels = _metric_labels(params)
+    parser = ListResultParser()
+    encoder = RowEncoder(output_format, dumps)
+
+    def consume(records: List[Any]) -> None:
+        for record in records:
+            if row_filter is None:
+                encoder.add(record)
+            elif row_filter.matches(record):
+                encoder.add(row_filter.project(record))
+
+    client = get_http_client()
+    with _upstream_errors(labels):
+        received = 0
+        checked = False
+        started = time.perf_counter()
         try:
-            response = await client.get(url, params=query_params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Check if API returned an error
-            if data.get("status") == "0" and data.get("message") != "No transactions found":
-                error_msg = data.get("result", data.get("message", "Unknown API error"))
-                raise EtherscanAPIError(f"Etherscan API error: {error_msg}")
-            
-            return data
-            
-        except httpx.HTTPError as e:
-            raise EtherscanAPIError(f"HTTP request failed: {str(e)}")
-        except Exception as e:
-            raise EtherscanAPIError(f"Unexpected error: {str(e)}")
-
-
-def api_call(params: Dict[str, Any]) -> str:
+            async with client.stream("GET", ETHERSCAN_API_URL, params=_query_params(params, api_key)) as response:
+                metrics.inc("etherscan_upstream_requests_total", status=response.status_code, **labels)
+                _check_http_status(response)
+                try:
+                    # aiter_bytes decompresses incrementally, so the body is never held whole
+                    async for chunk in response.aiter_bytes():
+                        received += len(chunk)
+                        consume(parser.feed(chunk))
+                        if parser.in_list and not checked:
+                            # Fail before reading the rows when the envelope reports an error
+                            _check_envelope({"status": parser.status, "message": parser.message}, api_key)
+                            checked = True
+                    consume(parser.feed(b"", final=True))
+                    data = parser.close() if parser.fallback else None
+                except ValueError:
+                    raise TransientAPIError("Malformed response from Etherscan")
+        finally:
+            metrics.observe("etherscan_upstream_duration_seconds", time.perf_counter() - started, **labels)
+            metrics.inc("etherscan_upstream_bytes_total", received, **labels)
+
+        if data is not None:
+            # Not a list envelope (an error, or an unexpected result): handle it as ``_fetch`` would
+            _check_envelope(data, api_key)
+            result = data.get("result", data)
+            return format_response(row_filter.apply(result) if row_filter is not None else result, output_format)
+        text = encoder.finish()
+        metrics.inc("etherscan_response_bytes_total", len(text), format=output_format)
+        return text
+
+
+async def _stream_call(params: Dict[str, Any], output_format: str, row_filter: Optional[RowFilter]) -> str:
+    """
+    Return a bulk list result filtered, projected and encoded as its records arrive.
+    
+    Only the record being received and the encoded output are held, so memory
+    does not grow with the size of the upstream response. A fresh cached
+    answer is used when there is one, but streamed answers are not cached
+    (that would mean keeping them whole), nor hedged or shared between
+    callers, since the output depends on the filter.
+    """
+    cached = get_response_cache().get(normalize_params(params))
+    labels = _metric_labels(params)
+    if cached is not None:
+        get_metrics().inc("etherscan_cache_lookups_total", result="hit", **labels)
+        data = materialize(cached)
+        return await render_result(data.get("result", data), output_format, row_filter)
+    get_metrics().inc("etherscan_cache_lookups_total", result="miss", **labels)
+    return await _with_retries(
+        lambda deadline: _guarded_fetch(
+            params, lambda api_key: _fetch_stream(params, api_key, output_format, row_filter), deadline
+        )
+    )
+
+
+async def api_call(
+    params: Dict[str, Any],
+    output_format: Optional[str] = None,
+    row_filter: Optional[RowFilter] = None,
+    decoder: Optional[Callable[[List[Any]], Awaitable[List[Any]]]] = None,
+) -> str:
     """
     Make an API call and return formatted result as string.
     
     Args:
         params: Dictionary of API parameters
+        output_format: One of ``OUTPUT_FORMATS``; defaults to ``ETHERSCAN_OUTPUT_FORMAT``
+        row_filter: Predicates and field projection applied to list results
+        decoder: Coroutine that annotates list results, run after filtering and before projection;
+            the ``decoded`` field it adds survives any projection
         
     Returns:
         JSON string of the API result
     """
-    import asyncio
-    import json
+    output_format = resolve_output_format(output_format)
+    # Unfiltered, undecoded list results are returned as the JSON text Etherscan sent
+    passthrough = output_format == "json" and decoder is None and (row_filter is None or not row_filter.active)
+    if not passthrough and decoder is None and is_streamable(params):
+        return await _stream_call(params, output_format, row_filter)
+    data = await make_api_request(params, raw=passthrough)
+    result = data.get("result", data)
+    if isinstance(result, RawJSON):
+        return format_raw(result)
+    return await render_result(result, output_format, row_filter, decoder)
+
+
+async def render_result(
+    result: Any,
+    output_format: Optional[str] = None,
+    row_filter: Optional[RowFilter] = None,
+    decoder: Optional[Callable[[List[Any]], Awaitable[List[Any]]]] = None,
+) -> str:
+    """Filter, decode and project a result, then format it as in ``api_call``."""
+    if decoder is None or not isinstance(result, list):
+        return format_response(row_filter.apply(result) if row_filter is not None else result, output_format)
+    if row_filter is not None:
+        result = row_filter.select(result)
+    result = await decoder(result)
+    if row_filter is not None and row_filter.fields:
+        # What the decoder added is kept even when ``fields`` does not name it
+        result = [row_filter.project(row, keep=("decoded",)) for row in result]
+    return format_response(result, output_format)
+
+
+def resolve_output_format(output_format: Optional[str] = None) -> str:
+    """Return the requested output format, falling back to the configured default."""
+    output_format = (output_format or os.getenv("ETHERSCAN_OUTPUT_FORMAT") or DEFAULT_OUTPUT_FORMAT).lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}, expected one of {', '.join(OUTPUT_FORMATS)}")
+    return output_format
+
+
+def to_table(data: Any) -> Any:
+    """
+    Convert a list of records into a columnar ``{"columns": [...], "rows": [[...]]}`` table.
     
-    # Run the async function in the current event loop or create one
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If we're in an async context, we need to handle this differently
-            # For now, let's use a synchronous approach with httpx
-            import httpx
-            
-            api_key = os.getenv("ETHERSCAN_API_KEY")
-            if not api_key:
-                raise EtherscanAPIError("ETHERSCAN_API_KEY environment variable is not set")
-            
-            # Build query parameters
-            query_params = {}
-            for key, value in params.items():
-                if value is not None:
-                    query_params[key] = str(value)
-            
-            query_params["apikey"] = api_key
-            
-            url = "https://api.etherscan.io/v2/api"
-            
-            with httpx.Client() as client:
-                try:
-                    response = client.get(url, params=query_params)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    # Check if API returned an error
-                    if data.get("status") == "0" and data.get("message") != "No transactions found":
-                        error_msg = data.get("result", data.get("message", "Unknown API error"))
-                        raise EtherscanAPIError(f"Etherscan API error: {error_msg}")
-                    
-                    return json.dumps(data.get("result", data), indent=2)
-                    
-                except httpx.HTTPError as e:
-                    raise EtherscanAPIError(f"HTTP request failed: {str(e)}")
-                except Exception as e:
-                    raise EtherscanAPIError(f"Unexpected error: {str(e)}")
-        else:
-            data = loop.run_until_complete(make_api_request(params))
-            return json.dumps(data.get("result", data), indent=2)
-    except RuntimeError:
-        # No event loop, create one
-        data = asyncio.run(make_api_request(params))
-        return json.dumps(data.get("result", data), indent=2)
+    Each key is listed once instead of once per record. Anything that is not
+    a non-empty list of objects is returned unchanged.
+    """
+    if not isinstance(data, list) or not data or not all(isinstance(row, dict) for row in data):
+        return data
+    columns = list(data[0])
+    first = tuple(columns)
+    if all(tuple(row) == first for row in data):
+        # Uniform rows (the common case): pull values straight off each dict
+        return {"columns": columns, "rows": [list(row.values()) for row in data]}
+    seen = dict.fromkeys(columns)
+    for row in data:
+        for key in row:
+            seen.setdefault(key, None)
+    columns = list(seen)
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in data],
+    }
+
+
+def dumps(data: Any, pretty: bool = False) -> str:
+    """Serialize to JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+        except TypeError:
+            pass
+    if pretty:
+        return json.dumps(data, indent=2)
+    return json.dumps(data, separators=(",", ":"))
+
+
+def format_response(data: Any, output_format: Optional[str] = None) -> str:
+    """Format API response data as JSON string in the requested output format."""
+    output_format = resolve_output_format(output_format)
+    started = time.perf_counter()
+    if output_format == "table":
+        text = dumps(to_table(data))
+    else:
+        text = dumps(data, pretty=output_format == "pretty")
+    metrics = get_metrics()
+    metrics.observe("etherscan_format_duration_seconds", time.perf_counter() - started, format=output_format)
+    metrics.inc("etherscan_response_bytes_total", len(text), format=output_format)
+    return text
 
 
-def format_response(data: Any) -> str:
-    """Format API response data as JSON string."""
-    import json
-    return json.dumps(data, indent=2)
+def format_raw(result: RawJSON) -> str:
+    """Return a passed-through result unchanged, accounted like ``format_response``."""
+    get_metrics().inc("etherscan_response_bytes_total", len(result.text), format="json")
+    return result.text
 
 
 def create_tool_decorator(server: FastMCP):
@@ -135,4 +548,4 @@ def create_tool_decorator(server: FastMCP):
             func._tool_description = description
             return func
         return decorator
-    return tool
\ No newline at end of file
+    return tool
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from src.tools import batching
+from src.tools.batching import BalanceBatcher, fetch_token_balances
+from src.tools.utils import CircuitOpenError, EtherscanAPIError
+
+
+HOLDER = "0x" + "ab" * 20
+TOKEN = "0x" + "cd" * 20
+OTHER_TOKEN = "0x" + "ef" * 20
+
+
+def install(monkeypatch, answer) -> List[Dict[str, Any]]:
+    requests: List[Dict[str, Any]] = []
+
+    async def make_api_request(params):
+        requests.append(params)
+        return answer(params)
+
+    monkeypatch.setattr(batching, "make_api_request", make_api_request)
+    return requests
+
+
+def test_checksummed_duplicates_are_fetched_once(monkeypatch):
+    requests = install(monkeypatch, lambda params: {"status": "1", "message": "OK", "result": "7"})
+    matrix = asyncio.run(fetch_token_balances(
+        [HOLDER, HOLDER.upper().replace("0X", "0x")], [TOKEN, TOKEN.upper().replace("0X", "0x")],
+        method="tokenbalance",
+    ))
+    assert matrix == {"columns": ["holder", TOKEN], "rows": [[HOLDER, "7"]]}
+    assert len(requests) == 1
+
+
+def test_tokens_without_a_balance_are_left_blank(monkeypatch):
+    def answer(params):
+        if params["contractaddress"] == OTHER_TOKEN:
+            raise EtherscanAPIError("Etherscan API error: Error! Invalid contract address format")
+        return {"status": "1", "message": "OK", "result": "5"}
+
+    install(monkeypatch, answer)
+    matrix = asyncio.run(fetch_token_balances([HOLDER], [TOKEN, OTHER_TOKEN], method="tokenbalance"))
+    assert matrix["rows"] == [[HOLDER, "5", None]]
+
+
+@pytest.mark.parametrize("error", [
+    EtherscanAPIError("Etherscan API error: Invalid API Key"),
+    CircuitOpenError("Circuit open for chain 1 (account)"),
+])
+def test_other_failures_are_raised(monkeypatch, error):
+    def answer(params):
+        raise error
+
+    install(monkeypatch, answer)
+    with pytest.raises(type(error)):
+        asyncio.run(fetch_token_balances([HOLDER], [TOKEN], method="tokenbalance"))
+
+
+def test_a_bad_address_fails_only_its_own_balance_call(monkeypatch):
+    def answer(params):
+        if "," in params["address"] or params["address"] != HOLDER:
+            raise EtherscanAPIError("Etherscan API error: Error! Invalid address format")
+        return {"status": "1", "message": "OK", "result": "9"}
+
+    requests = install(monkeypatch, answer)
+
+    async def lookups():
+        batcher = BalanceBatcher(window=0.01)
+        return await asyncio.gather(
+            batcher.balance("0xbad"), batcher.balance(HOLDER), return_exceptions=True,
+        )
+
+    bad, good = asyncio.run(lookups())
+    assert isinstance(bad, EtherscanAPIError) and "0xbad" in str(bad)
+    assert good == "9"
+    assert [params["address"] for params in requests] == [HOLDER]
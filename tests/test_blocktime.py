@@ -0,0 +1,30 @@
+import asyncio
+
+from src.tools import blocktime
+from src.tools.blocktime import BlockTimeIndex
+
+
+def test_local_answer_between_adjacent_blocks():
+    index = BlockTimeIndex()
+    index._warmed = True
+    index.add("1", 100, 1000)
+    index.add("1", 101, 1012)
+    assert asyncio.run(index.resolve(1005, "before")) == 100
+    assert asyncio.run(index.resolve(1005, "after")) == 101
+    assert index.upstream == 0
+
+
+def test_remembered_answers_are_bounded(monkeypatch):
+    requested = []
+
+    async def make_api_request(params):
+        requested.append(int(params["timestamp"]))
+        return {"status": "1", "message": "OK", "result": str(int(params["timestamp"]) // 12)}
+
+    monkeypatch.setattr(blocktime, "make_api_request", make_api_request)
+    index = BlockTimeIndex(max_answers=2)
+    index._warmed = True
+    for timestamp in (1200, 2400, 1200, 3600, 2400):
+        asyncio.run(index.resolve(timestamp))
+    assert requested == [1200, 2400, 3600, 2400]
+    assert len(index._answers) == 2
@@ -0,0 +1,129 @@
+import time
+
+from src.tools.cache import (
+    DEFAULT_TTL,
+    PINNED,
+    UNFINALIZED_TTL,
+    UNVERIFIED_SOURCE_TTL,
+    VOLATILE_TTL,
+    ResponseCache,
+    normalize_params,
+)
+from src.tools.rawjson import RawJSON
+
+
+def ok(result):
+    return {"status": "1", "message": "OK", "result": result}
+
+
+def cache_at_head(head: int, chainid: str = "1") -> ResponseCache:
+    cache = ResponseCache(finality_depth=64)
+    cache.observe({"module": "proxy", "action": "eth_blockNumber", "chainid": chainid}, ok(hex(head)))
+    return cache
+
+
+def test_normalize_params_ignores_api_key_and_hex_case():
+    checksummed = {"module": "account", "address": "0xAbCd", "apikey": "secret", "page": None}
+    lowercase = {"address": "0xabcd", "module": "account"}
+    assert normalize_params(checksummed) == normalize_params(lowercase)
+
+
+def test_volatile_actions_expire_quickly():
+    cache = ResponseCache()
+    params = {"module": "gastracker", "action": "gasoracle"}
+    assert cache.ttl_for(params, ok({})) == VOLATILE_TTL[("gastracker", "gasoracle")]
+
+
+def test_immutable_actions_are_pinned_unless_empty():
+    cache = ResponseCache()
+    params = {"module": "contract", "action": "getabi"}
+    assert cache.ttl_for(params, ok("[]")) == PINNED
+    assert cache.ttl_for(params, ok("")) == DEFAULT_TTL
+
+
+def test_source_is_pinned_only_once_verified():
+    cache = ResponseCache()
+    params = {"module": "contract", "action": "getsourcecode"}
+    assert cache.ttl_for(params, ok([{"SourceCode": "contract A {}"}])) == PINNED
+    assert cache.ttl_for(params, ok([{"SourceCode": ""}])) == UNVERIFIED_SOURCE_TTL
+    assert cache.ttl_for(params, ok(RawJSON('[{"SourceCode":"contract A {}"}]'))) == PINNED
+    assert cache.ttl_for(params, ok(RawJSON('[{"SourceCode":""}]'))) == UNVERIFIED_SOURCE_TTL
+
+
+def test_block_scoped_results_are_pinned_below_finality_depth():
+    cache = cache_at_head(1000)
+    params = {"module": "proxy", "action": "eth_getBlockByNumber", "chainid": "1"}
+    recent = {"number": hex(990), "timestamp": hex(int(time.time()))}
+    final = {"number": hex(900), "timestamp": hex(int(time.time()))}
+    assert cache.ttl_for(dict(params, tag=hex(990)), ok(recent)) == UNFINALIZED_TTL
+    assert cache.ttl_for(dict(params, tag=hex(900)), ok(final)) == PINNED
+
+
+def test_finality_is_tracked_per_chain():
+    cache = cache_at_head(1000, chainid="1")
+    params = {"module": "proxy", "action": "eth_getBlockByNumber", "chainid": "137", "tag": hex(900)}
+    assert cache.ttl_for(params, ok({"number": hex(900)})) == UNFINALIZED_TTL
+
+
+def test_old_blocks_are_final_by_timestamp():
+    cache = ResponseCache()
+    params = {"module": "proxy", "action": "eth_getTransactionReceipt", "txhash": "0x1"}
+    old = {"blockNumber": hex(5), "timestamp": hex(int(time.time()) - 7200)}
+    assert cache.ttl_for(params, ok(old)) == PINNED
+
+
+def test_moving_tags_are_never_pinned():
+    cache = cache_at_head(1000)
+    for tag in ("latest", "pending", "safe", "finalized", "FINALIZED"):
+        params = {"module": "proxy", "action": "eth_getBlockByNumber", "chainid": "1", "tag": tag}
+        assert cache.ttl_for(params, ok({"number": hex(900)})) == UNFINALIZED_TTL, tag
+
+
+def test_pending_results_are_not_cached():
+    cache = ResponseCache()
+    params = {"module": "proxy", "action": "eth_getTransactionByHash", "txhash": "0x1"}
+    assert cache.ttl_for(params, ok(None)) == 0.0
+
+
+def test_other_actions_use_the_default_ttl():
+    cache = ResponseCache()
+    assert cache.ttl_for({"module": "account", "action": "balance"}, ok("1")) == DEFAULT_TTL
+
+
+def test_entries_expire_after_their_ttl():
+    cache = ResponseCache()
+    key = normalize_params({"module": "account", "action": "balance"})
+    cache.set(key, ok("1"), 0.05)
+    assert cache.get(key) == ok("1")
+    time.sleep(0.06)
+    assert cache.get(key) is None
+    assert cache.get_stale(key) == ok("1")
+
+
+def test_byte_budget_evicts_least_recently_used_entries():
+    cache = ResponseCache(max_bytes=1000)
+    first, second, third = (normalize_params({"page": str(page)}) for page in range(3))
+    cache.set(first, ok("a"), PINNED, size=120)
+    cache.set(second, ok("b"), PINNED, size=120)
+    cache.get(first)
+    cache.max_bytes = 250
+    cache.set(third, ok("c"), PINNED, size=30)
+    assert cache.get(second) is None
+    assert cache.get(first) == ok("a")
+    assert cache.stats()["bytes"] == 150
+
+
+def test_results_above_the_entry_share_are_not_kept():
+    cache = ResponseCache(max_bytes=8000)
+    key = normalize_params({"module": "account", "action": "txlist"})
+    cache.set(key, ok(RawJSON("[" + "1," * 600 + "1]")), DEFAULT_TTL)
+    assert cache.get(key) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_replacing_an_entry_releases_its_bytes():
+    cache = ResponseCache()
+    key = normalize_params({"module": "account", "action": "balance"})
+    cache.set(key, ok("1"), DEFAULT_TTL, size=100)
+    cache.set(key, ok("2"), DEFAULT_TTL, size=30)
+    assert cache.stats()["bytes"] == 30
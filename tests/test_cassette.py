@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.tools import utils
+from src.tools.cassette import AUTO, RECORD, REPLAY, Cassette, cassette_key
+
+
+def response(body: str) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "application/json"}, content=body.encode())
+
+
+async def record(cassette: Cassette, count: int) -> None:
+    for index in range(count):
+        params = {"module": "account", "action": "balance", "address": f"0x{index:040x}"}
+        await cassette.record(cassette_key(params), response(f'{{"result":"{index}"}}'), f'{{"result":"{index}"}}'.encode())
+
+
+def test_a_session_is_written_as_one_gzip_stream(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+
+    async def session():
+        cassette = Cassette(path, RECORD)
+        await record(cassette, 20)
+        await cassette.aclose()
+
+    asyncio.run(session())
+    with open(path, "rb") as handle:
+        assert handle.read().count(b"\x1f\x8b\x08") == 1
+    replay = Cassette(path, REPLAY)
+    assert replay.stats()["requests"] == 20
+
+
+def test_lines_survive_a_session_that_was_not_closed(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    asyncio.run(record(Cassette(path, RECORD), 3))
+    assert Cassette(path, AUTO).stats()["requests"] == 3
+
+
+def test_replay_miss_fails_before_waiting_for_a_key(monkeypatch, tmp_path):
+    cassette = Cassette(str(tmp_path / "empty.jsonl"), REPLAY)
+
+    def no_key_pool():
+        raise AssertionError("the key pool must not be consulted")
+
+    monkeypatch.setattr(utils, "get_cassette", lambda: cassette)
+    monkeypatch.setattr(utils, "get_key_pool", no_key_pool)
+    with pytest.raises(utils.EtherscanAPIError, match="No recorded response"):
+        asyncio.run(utils._acquire_api_key({"module": "account", "action": "balance"}))
@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+import pytest
+
+from src.tools.filters import RowFilter
+from src.tools.utils import render_result
+
+
+ROWS = [
+    {"hash": "0x1", "from": "0xAA", "to": "0xbb", "value": "100", "input": "0xa9059cbb0000", "isError": "0"},
+    {"hash": "0x2", "from": "0xcc", "to": "0xdd", "value": "5", "input": "0x", "isError": "1"},
+]
+
+
+def test_value_bounds_accept_decimal_and_hex():
+    assert RowFilter(min_value="50").apply(ROWS) == ROWS[:1]
+    assert RowFilter(max_value="0x10").apply(ROWS) == ROWS[1:]
+
+
+def test_blank_bounds_are_ignored():
+    assert not RowFilter(min_value="", max_value=" ").active
+
+
+@pytest.mark.parametrize("bound", ["min_value", "max_value"])
+@pytest.mark.parametrize("value", ["1.5e18", "ten", "0xzz"])
+def test_non_integer_bounds_are_rejected(bound, value):
+    with pytest.raises(ValueError, match=bound):
+        RowFilter(**{bound: value})
+
+
+def test_predicates_and_projection():
+    row_filter = RowFilter(fields="hash,value", counterparty="0xaa", method_id="0xA9059CBB", is_error="0")
+    assert row_filter.apply(ROWS) == [{"hash": "0x1", "value": "100"}]
+
+
+def test_projection_keeps_decoder_output():
+    async def decoder(rows):
+        return [dict(row, decoded={"name": "transfer"}) for row in rows]
+
+    rendered = asyncio.run(render_result(ROWS, "json", RowFilter(fields="hash", is_error="0"), decoder))
+    assert json.loads(rendered) == [{"hash": "0x1", "decoded": {"name": "transfer"}}]
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Dict, List
+
+from src.tools import indexer
+from src.tools.indexer import AddressIndexer
+from src.tools.pagination import ResultTruncatedError
+
+
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+
+def transfer(block: int) -> Dict[str, Any]:
+    return {"blockNumber": str(block), "hash": f"0x{block:x}", "value": "1"}
+
+
+def install(monkeypatch, rows: List[Dict[str, Any]], head: int, max_records: int) -> List[int]:
+    """Serve ``rows`` with at most ``max_records`` per call, truncating at block boundaries."""
+    starts: List[int] = []
+
+    async def resolve_block(value, chainid):
+        return head
+
+    async def fetch_all_records(params):
+        start, end = int(params["startblock"]), int(params["endblock"])
+        starts.append(start)
+        matching = [row for row in rows if start <= int(row["blockNumber"]) <= end]
+        if len(matching) <= max_records:
+            return matching
+        cut = int(matching[max_records]["blockNumber"])
+        kept = [row for row in matching if int(row["blockNumber"]) < cut]
+        raise ResultTruncatedError("truncated", kept, cut)
+
+    monkeypatch.setattr(indexer, "resolve_block", resolve_block)
+    monkeypatch.setattr(indexer, "fetch_all_records", fetch_all_records)
+    return starts
+
+
+def test_sync_stores_truncated_histories_chunk_by_chunk(monkeypatch, tmp_path):
+    rows = [transfer(block // 3) for block in range(30)]
+    starts = install(monkeypatch, rows, head=20, max_records=7)
+    index = AddressIndexer(str(tmp_path / "index.sqlite3"), confirmations=0)
+
+    result = asyncio.run(index.sync(ADDRESS, "tokentx"))
+
+    assert result == {"fetched": 30, "from_block": 0, "last_synced_block": 20}
+    assert starts == [0, 2, 4, 6, 8]
+    assert asyncio.run(index.query(ADDRESS, "tokentx")) == rows
+
+
+def test_sync_resumes_after_the_last_synced_block(monkeypatch, tmp_path):
+    rows = [transfer(block) for block in range(10)]
+    install(monkeypatch, rows, head=9, max_records=100)
+    index = AddressIndexer(str(tmp_path / "index.sqlite3"), confirmations=2)
+    asyncio.run(index.sync(ADDRESS, "tokentx"))
+
+    rows.append(transfer(10))
+    starts = install(monkeypatch, rows, head=10, max_records=100)
+    result = asyncio.run(index.sync(ADDRESS, "tokentx"))
+
+    assert starts == [8]
+    assert result == {"fetched": 3, "from_block": 8, "last_synced_block": 10}
+    assert asyncio.run(index.query(ADDRESS, "tokentx")) == rows
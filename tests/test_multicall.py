@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from src.tools import multicall
+from src.tools.abi import decode_parameters
+from src.tools.multicall import (
+    AGGREGATE3_SELECTOR,
+    Multicaller,
+    encode_aggregate3,
+    encoded_size,
+    parse_calls,
+    plan_chunks,
+)
+from src.tools.utils import CircuitOpenError, EtherscanAPIError, TransientAPIError
+
+
+TOKEN = "0x" + "11" * 20
+OTHER = "0x" + "22" * 20
+
+_AGGREGATE3_ARGUMENT = [{
+    "type": "tuple[]",
+    "components": [
+        {"name": "target", "type": "address"},
+        {"name": "allowFailure", "type": "bool"},
+        {"name": "callData", "type": "bytes"},
+    ],
+}]
+
+
+def test_encode_aggregate3_layout():
+    encoded = encode_aggregate3([(TOKEN, "18160ddd")])
+    words = [encoded[10 + index:10 + index + 64] for index in range(0, len(encoded) - 10, 64)]
+    assert encoded[2:10] == AGGREGATE3_SELECTOR
+    assert [int(word, 16) for word in words[:3]] == [32, 1, 32]
+    assert words[3] == "0" * 24 + "11" * 20
+    assert [int(word, 16) for word in words[4:6]] == [1, 96]
+    assert int(words[6], 16) == 4
+    assert words[7] == "18160ddd" + "0" * 56
+    assert len(words) == 8
+
+
+def test_encode_aggregate3_round_trips_through_the_decoder():
+    calls = [(TOKEN, "70a08231" + "00" * 12 + "22" * 20), (OTHER, ""), (TOKEN, "ab" * 70)]
+    encoded = bytes.fromhex(encode_aggregate3(calls)[10:])
+    (decoded,) = decode_parameters(_AGGREGATE3_ARGUMENT, encoded)
+    assert [(row["target"].lower(), row["allowFailure"], row["callData"]) for row in decoded] == [
+        (to, True, "0x" + data) for to, data in calls
+    ]
+
+
+def test_encoded_size_matches_the_encoding():
+    calls = [(TOKEN, "ab" * length) for length in (0, 4, 32, 33)]
+    encoded = encode_aggregate3(calls)
+    assert (len(encoded) - 10) // 2 == 64 + sum(encoded_size(data) for _, data in calls)
+
+
+def test_plan_chunks_respects_both_limits():
+    calls = [(TOKEN, "ab" * 4)] * 7
+    assert plan_chunks(calls, max_bytes=10000, max_calls=3) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert plan_chunks(calls, max_bytes=2 * encoded_size("ab" * 4), max_calls=50) == [[0, 1], [2, 3], [4, 5], [6]]
+
+
+def test_parse_calls_validates_input():
+    assert parse_calls(f"{TOKEN.upper()[2:]}:0x18160DDD") == [(TOKEN, "18160ddd")]
+    with pytest.raises(EtherscanAPIError):
+        parse_calls("0x1234:0x00")
+    with pytest.raises(EtherscanAPIError):
+        parse_calls(f"{TOKEN}:0x123")
+
+
+def aggregate_result(count: int) -> str:
+    """ABI-encode ``count`` successful ``(bool, bytes)`` results, each returning the word 1."""
+    word = "{:064x}".format
+    rows = [word(1) + word(64) + word(32) + word(1)] * count
+    heads = [word(32 * count + index * 128) for index in range(count)]
+    return "0x" + word(32) + word(count) + "".join(heads) + "".join(rows)
+
+
+class FakeNode:
+    """Answers aggregate3 eth_calls, failing those with more than ``limit`` calls."""
+
+    def __init__(self, limit: int, error: Exception):
+        self.limit = limit
+        self.error = error
+        self.sizes: List[int] = []
+
+    async def __call__(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        count = int(params["data"][10 + 64:10 + 128], 16)
+        self.sizes.append(count)
+        if count > self.limit:
+            raise self.error
+        return {"jsonrpc": "2.0", "id": 1, "result": aggregate_result(count)}
+
+
+def run(node: FakeNode, monkeypatch, calls: int = 4) -> List[Dict[str, Any]]:
+    monkeypatch.setattr(multicall, "make_api_request", node)
+    caller = Multicaller(max_calls=calls)
+    return asyncio.run(caller.call([(TOKEN, "18160ddd")] * calls))
+
+
+@pytest.mark.parametrize("message", ["aggregate3 failed: out of gas", "aggregate3 failed: execution reverted"])
+def test_chunks_are_split_on_errors_a_smaller_batch_avoids(monkeypatch, message):
+    node = FakeNode(limit=1, error=EtherscanAPIError(message))
+    results = run(node, monkeypatch)
+    assert all(result["success"] for result in results)
+    assert node.sizes == [4, 2, 2, 1, 1, 1, 1]
+
+
+@pytest.mark.parametrize("error", [
+    EtherscanAPIError("Etherscan API error: Invalid API Key"),
+    EtherscanAPIError("Etherscan API error: NOTOK"),
+    TransientAPIError("HTTP 503 from Etherscan"),
+    CircuitOpenError("Circuit open for chain 1 (proxy)"),
+])
+def test_other_errors_fail_at_once(monkeypatch, error):
+    node = FakeNode(limit=0, error=error)
+    with pytest.raises(type(error)):
+        run(node, monkeypatch)
+    assert node.sizes == [4]
+
+
+def test_missing_multicall_contract_is_reported(monkeypatch):
+    async def make_api_request(params):
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x"}
+
+    monkeypatch.setattr(multicall, "make_api_request", make_api_request)
+    with pytest.raises(EtherscanAPIError, match="No Multicall3 contract"):
+        asyncio.run(Multicaller().call([(TOKEN, "18160ddd")], chainid="7"))
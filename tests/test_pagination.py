@@ -0,0 +1,142 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from src.tools import pagination
+from src.tools.pagination import ResultTruncatedError, fetch_all_records
+from src.tools.utils import EtherscanAPIError
+
+
+WINDOW = 10
+
+
+class FakeEtherscan:
+    """Answers account list requests from ``rows`` the way Etherscan pages them."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.requests: List[Dict[str, Any]] = []
+
+    async def __call__(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append(dict(params))
+        start = int(params.get("startblock") or 0)
+        end = int(params.get("endblock") or 99999999)
+        offset = int(params["offset"])
+        page = int(params["page"])
+        assert page * offset <= WINDOW
+        matching = [row for row in self.rows if start <= int(row["blockNumber"]) <= end]
+        return {"status": "1", "message": "OK", "result": matching[(page - 1) * offset:page * offset]}
+
+
+def transfer(block: int, value: str = "1") -> Dict[str, Any]:
+    # Token transfers carry no log index, so identical ones are indistinguishable
+    return {"blockNumber": str(block), "hash": f"0x{block:x}", "value": value, "confirmations": "5"}
+
+
+@pytest.fixture
+def etherscan(monkeypatch):
+    def install(rows):
+        fake = FakeEtherscan(rows)
+        monkeypatch.setattr(pagination, "MAX_RESULT_WINDOW", WINDOW)
+        monkeypatch.setattr(pagination, "make_api_request", fake)
+        return fake
+
+    return install
+
+
+def test_single_window_needs_one_request(etherscan):
+    fake = etherscan([transfer(block) for block in range(5)])
+    assert asyncio.run(fetch_all_records({"action": "tokentx"})) == fake.rows
+    assert len(fake.requests) == 1
+
+
+def test_windows_advance_past_the_result_window(etherscan):
+    fake = etherscan([transfer(block) for block in range(35)])
+    records = asyncio.run(fetch_all_records({"action": "tokentx", "startblock": "0"}))
+    assert records == fake.rows
+    assert [request["startblock"] for request in fake.requests] == ["0", "9", "18", "27"]
+
+
+def test_identical_rows_in_the_boundary_block_are_kept(etherscan):
+    rows = [transfer(block) for block in range(8)] + [transfer(8)] * 4 + [transfer(9)]
+    etherscan(rows)
+    assert asyncio.run(fetch_all_records({"action": "tokentx"})) == rows
+
+
+def test_boundary_rows_already_collected_are_dropped(etherscan):
+    rows = [transfer(block) for block in range(9)] + [transfer(9, value=str(n)) for n in range(3)]
+    etherscan(rows)
+    records = asyncio.run(fetch_all_records({"action": "tokentx"}))
+    assert records == rows
+
+
+def test_descending_order_is_applied_at_the_end(etherscan):
+    fake = etherscan([transfer(block) for block in range(25)])
+    records = asyncio.run(fetch_all_records({"action": "tokentx", "sort": "desc"}))
+    assert records == fake.rows[::-1]
+    assert all(request["sort"] == "asc" for request in fake.requests)
+
+
+def test_truncation_returns_whole_blocks_and_where_to_resume(etherscan):
+    rows = [transfer(block // 2) for block in range(60)]
+    etherscan(rows)
+    with pytest.raises(ResultTruncatedError) as raised:
+        asyncio.run(fetch_all_records({"action": "tokentx"}, max_records=25))
+    error = raised.value
+    assert error.next_startblock == 12
+    assert error.records == rows[:24]
+    assert "resume from block 12" in str(error)
+
+
+def test_exactly_max_records_is_not_truncated(etherscan):
+    rows = [transfer(block) for block in range(25)]
+    etherscan(rows)
+    assert asyncio.run(fetch_all_records({"action": "tokentx"}, max_records=25)) == rows
+
+
+def test_block_larger_than_the_window_is_an_error(etherscan):
+    etherscan([transfer(3, value=str(n)) for n in range(WINDOW + 1)])
+    with pytest.raises(EtherscanAPIError, match="Block 3 holds more than"):
+        asyncio.run(fetch_all_records({"action": "tokentx"}))
+
+
+class FakeLogs:
+    """Answers getLogs requests from ``logs`` with Etherscan's page size and window."""
+
+    def __init__(self, logs: List[Dict[str, Any]]):
+        self.logs = logs
+
+    async def __call__(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        low, high = int(params["fromBlock"]), int(params["toBlock"])
+        offset, page = int(params["offset"]), int(params["page"])
+        assert page * offset <= WINDOW
+        matching = [log for log in self.logs if low <= int(log["blockNumber"], 16) <= high]
+        return {"status": "1", "message": "OK", "result": matching[(page - 1) * offset:page * offset]}
+
+
+def log(block: int, index: int) -> Dict[str, Any]:
+    return {"blockNumber": hex(block), "logIndex": hex(index), "transactionHash": f"0x{block:x}{index:x}"}
+
+
+@pytest.fixture
+def getlogs(monkeypatch):
+    def install(logs):
+        monkeypatch.setattr(pagination, "MAX_RESULT_WINDOW", WINDOW)
+        monkeypatch.setattr(pagination, "LOGS_PAGE_LIMIT", 4)
+        monkeypatch.setattr(pagination, "make_api_request", FakeLogs(logs))
+
+    return install
+
+
+def test_scan_logs_splits_dense_ranges_and_pages_within_a_block(getlogs):
+    logs = [log(block, 0) for block in range(0, 40, 3)] + [log(20, index) for index in range(1, 7)]
+    getlogs(logs)
+    result = asyncio.run(pagination.scan_logs({"fromBlock": "0", "toBlock": "39"}, shards=2))
+    assert result == sorted(logs, key=pagination.log_sort_key)
+
+
+def test_scan_logs_rejects_a_block_beyond_the_result_window(getlogs):
+    getlogs([log(7, index) for index in range(WINDOW + 2)])
+    with pytest.raises(EtherscanAPIError, match="Block 7 holds more than"):
+        asyncio.run(pagination.scan_logs({"fromBlock": "0", "toBlock": "9"}, shards=1))
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from src.tools.rawjson import RawJSON, materialize, split_envelope
+
+
+def envelope(result: str, status: str = "1", message: str = "OK") -> bytes:
+    return f'{{"status":"{status}","message":"{message}","result":{result}}}'.encode()
+
+
+@pytest.mark.parametrize("result", [
+    "[]",
+    "[1, 2, 3]",
+    '[{"hash":"0x1","topics":["0xa","0xb"],"data":"0x"}]',
+    '["brackets ] in [ strings", "{", "}"]',
+    '["escaped \\"] quote", "backslash \\\\", "\\\\\\"]"]',
+    '[{"SourceCode":"contract A { string s = \\"[\\"; }\\r\\n"}]',
+])
+def test_list_results_are_sliced_unparsed(result):
+    data = split_envelope(envelope(result))
+    assert data["status"] == "1" and data["message"] == "OK"
+    assert isinstance(data["result"], RawJSON)
+    assert data["result"].text == result
+    assert data["result"].parse() == json.loads(result)
+
+
+def test_whitespace_around_the_envelope_is_allowed():
+    content = b' \n{ "status" : "0" , "message" : "No transactions found" , "result" : [ ] }\n'
+    data = split_envelope(content)
+    assert data["status"] == "0"
+    assert data["message"] == "No transactions found"
+    assert data["result"].text == "[ ]"
+    assert not data["result"]
+
+
+@pytest.mark.parametrize("content", [
+    b'{"status":"1","message":"OK","result":[1],"x":[2]}',
+    b'{"status":"1","message":"OK","result":[1,}]}',
+    b'{"status":"1","message":"OK","result":[[1]}',
+    b'{"status":"1","message":"OK","result":[1]]}',
+    b'{"status":"1","message":"OK","result":["unterminated]}',
+    b'{"status":"1","message":"OK","result":[{"a":[1}]]}',
+    b'{"status":"1","message":"OK","result":"0x10"}',
+    b'{"jsonrpc":"2.0","id":1,"result":[]}',
+    b'<html>502 Bad Gateway</html>',
+    b'{"status":"1","message":"OK","result":[1]',
+])
+def test_anything_else_falls_back_to_a_full_parse(content):
+    assert split_envelope(content) is None
+
+
+def test_materialize_parses_raw_results_only():
+    data = split_envelope(envelope('[{"a":1}]'))
+    assert materialize(data) == {"status": "1", "message": "OK", "result": [{"a": 1}]}
+    parsed = {"status": "1", "message": "OK", "result": "5"}
+    assert materialize(parsed) is parsed
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.tools import utils
+from src.tools.retry import Deadline, RetryPolicy
+from src.tools.utils import TransientAPIError, gather_or_cancel
+
+
+def test_the_deadline_starts_when_the_upstream_call_does():
+    async def attempt(deadline):
+        await asyncio.sleep(0.1)
+        return await deadline.run(asyncio.sleep(0.01, result="ok"))
+
+    assert asyncio.run(RetryPolicy(deadline=0.05).run(attempt, lambda error: False)) == "ok"
+
+
+def test_a_slow_upstream_call_exceeds_the_deadline():
+    async def attempt(deadline):
+        return await deadline.run(asyncio.sleep(1))
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(RetryPolicy(deadline=0.05).run(attempt, lambda error: False))
+
+
+def test_retries_share_one_deadline():
+    calls = []
+
+    async def attempt(deadline):
+        calls.append(deadline)
+        await deadline.run(asyncio.sleep(0.01))
+        raise TransientAPIError("HTTP 503 from Etherscan", 0.08)
+
+    with pytest.raises(TransientAPIError):
+        asyncio.run(RetryPolicy(max_retries=5, base_delay=0.001, deadline=0.25).run(attempt, lambda error: True))
+    assert len(calls) == 3 and all(deadline is calls[0] for deadline in calls)
+
+
+def test_deadline_before_the_first_call_is_the_whole_budget():
+    assert Deadline(5.0).remaining() == 5.0
+
+
+def test_waiting_for_an_api_key_does_not_count_against_the_deadline(monkeypatch):
+    async def slow_key(params):
+        await asyncio.sleep(0.1)
+        return "key"
+
+    async def fetch(api_key):
+        return {"status": "1", "message": "OK", "result": api_key}
+
+    monkeypatch.setattr(utils, "_acquire_api_key", slow_key)
+    monkeypatch.setattr(utils, "get_retry_policy", lambda: RetryPolicy(deadline=0.05))
+    params = {"module": "account", "action": "balance", "chainid": "1"}
+    result = asyncio.run(utils._with_retries(lambda deadline: utils._guarded_fetch(params, fetch, deadline)))
+    assert result["result"] == "key"
+
+
+def test_gather_or_cancel_stops_the_other_calls_on_failure():
+    finished = []
+
+    async def part(index):
+        if index == 0:
+            raise ValueError("bad chunk")
+        await asyncio.sleep(0.05)
+        finished.append(index)
+
+    async def fan_out():
+        with pytest.raises(ValueError):
+            await gather_or_cancel(*(part(index) for index in range(5)))
+        await asyncio.sleep(0.1)
+
+    asyncio.run(fan_out())
+    assert finished == []
+
+
+def test_gather_or_cancel_keeps_input_order():
+    async def part(index):
+        await asyncio.sleep(0.01 * (3 - index))
+        return index
+
+    assert asyncio.run(gather_or_cancel(*(part(index) for index in range(3)))) == [0, 1, 2]
@@ -0,0 +1,139 @@
+import json
+import random
+
+import pytest
+
+from src.tools.streaming import ListResultParser, RowEncoder, is_streamable
+from src.tools.utils import dumps, format_response, to_table
+
+
+RECORDS = [
+    {"blockNumber": "17000000", "hash": "0xabc", "value": "15000000000", "isError": "0"},
+    {"blockNumber": "17000001", "input": "transfer(\"x\") [ok] {1}", "note": "café ☃ \U0001f600"},
+    {"blockNumber": "17000002", "topics": ["0x1", "0x2"], "nested": {"a": [1, 2.5, None, True]}},
+    15000000000.0,
+    -2,
+    1e-7,
+    True,
+    None,
+    "plain \\ string",
+    [1, [2, [3]]],
+]
+
+
+def body(records=RECORDS, status="1", message="OK") -> bytes:
+    envelope = {"status": status, "message": message, "result": records}
+    return json.dumps(envelope, ensure_ascii=False, indent=1).encode()
+
+
+def parse(chunks):
+    parser = ListResultParser()
+    records = []
+    for index, chunk in enumerate(chunks):
+        records += parser.feed(chunk, final=index == len(chunks) - 1)
+    return parser, records
+
+
+def test_whole_body_in_one_chunk():
+    parser, records = parse([body()])
+    assert records == RECORDS
+    assert (parser.status, parser.message, parser.finished, parser.fallback) == ("1", "OK", True, False)
+
+
+def test_every_split_point_gives_the_same_records():
+    content = body()
+    for cut in range(1, len(content)):
+        _, records = parse([content[:cut], content[cut:], b""])
+        assert records == RECORDS, cut
+
+
+def test_numbers_cut_after_a_dot_or_exponent_are_held_back():
+    content = b'{"status":"1","message":"OK","result":[15000000000.0,2e10,-7]}'
+    for marker in (b".", b"e", b"-"):
+        cut = content.index(marker) + 1
+        _, records = parse([content[:cut], content[cut:]])
+        assert records == [15000000000.0, 2e10, -7], marker
+
+
+def test_random_chunking_with_compact_separators():
+    content = json.dumps({"status": "1", "message": "OK", "result": RECORDS}, separators=(",", ":")).encode()
+    rng = random.Random(7)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(content)), 6))
+        chunks = [content[start:end] for start, end in zip([0] + cuts, cuts + [len(content)])]
+        assert parse(chunks)[1] == RECORDS
+
+
+def test_records_are_returned_as_they_complete():
+    parser = ListResultParser()
+    content = body()
+    first_end = content.index(b"}") + 1
+    assert parser.feed(content[:first_end - 1]) == []
+    assert parser.feed(content[first_end - 1:first_end]) == RECORDS[:1]
+
+
+def test_empty_list():
+    parser, records = parse([b'{"status":"0","message":"No transactions found","result":[]}'])
+    assert records == [] and parser.status == "0" and parser.finished
+
+
+@pytest.mark.parametrize("content", [
+    b'{"status":"0","message":"NOTOK","result":"Max rate limit reached"}',
+    b'{"jsonrpc":"2.0","id":1,"result":"0x10"}',
+])
+def test_other_bodies_are_parsed_whole(content):
+    parser, records = parse([content[:10], content[10:]])
+    assert records == [] and parser.fallback
+    assert parser.close() == json.loads(content)
+
+
+def test_truncated_body_is_an_error():
+    parser = ListResultParser()
+    parser.feed(b'{"status":"1","message":"OK","result":[{"a":1},')
+    with pytest.raises(ValueError):
+        parser.feed(b"", final=True)
+
+
+def test_is_streamable():
+    assert is_streamable({"module": "account", "action": "txlist"})
+    assert not is_streamable({"module": "account", "action": "balance"})
+
+
+ROWS = [
+    {"hash": "0x1", "value": "10"},
+    {"hash": "0x2", "value": "20", "to": "0xb"},
+    {"value": "30", "extra": None},
+]
+
+
+@pytest.mark.parametrize("rows", [
+    ROWS,
+    ROWS[:1] * 3,
+    [],
+    [1, "two", None],
+    ROWS + [None, 4, {"late": True}],
+    [7, {"hash": "0x1"}],
+])
+@pytest.mark.parametrize("output_format", ["json", "pretty", "table"])
+def test_row_encoder_matches_format_response(rows, output_format):
+    encoder = RowEncoder(output_format, dumps)
+    for row in rows:
+        encoder.add(row)
+    assert json.loads(encoder.finish()) == json.loads(format_response(rows, output_format))
+
+
+def test_table_rows_are_padded_to_late_columns():
+    encoder = RowEncoder("table", dumps)
+    for row in ROWS:
+        encoder.add(row)
+    assert json.loads(encoder.finish()) == to_table(ROWS)
+    assert encoder.columns == ["hash", "value", "to", "extra"]
+
+
+def test_table_falls_back_to_a_list_when_a_row_is_not_an_object():
+    rows = [{"b": 1, "a": None}, {"a": 2}, "0x10", {"c": [3]}]
+    encoder = RowEncoder("table", dumps)
+    for row in rows:
+        encoder.add(row)
+    assert json.loads(encoder.finish()) == rows
+    assert list(json.loads(encoder.finish())[0]) == ["b", "a"]